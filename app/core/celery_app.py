@@ -0,0 +1,21 @@
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "todos_ai_assistant",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.calls"],
+)
+
+celery_app.conf.update(
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_ignore_result=settings.CELERY_RESULT_BACKEND is None,
+    # Re-deliver tasks interrupted by a worker crash; the tasks are
+    # idempotent upserts.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    broker_connection_retry_on_startup=True,
+)
@@ -1,18 +1,184 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import URL, make_url
 
 load_dotenv()
 
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
 
 class Settings(BaseSettings):
     """Application configuration settings."""
-    # Database
-    DB_USER: str = Field(..., description="Database username")
-    DB_PASSWORD: str = Field(..., description="Database password")
-    DB_HOST: str = Field(..., description="Database host")
-    DB_PORT: str = Field(..., description="Database port")
-    DB_NAME: str = Field(..., description="Database name")
+
+    # Database (falls back to the local SQLite file when DB_HOST is unset)
+    DB_USER: str | None = Field(None, description="Database username")
+    DB_PASSWORD: str | None = Field(None, description="Database password")
+    DB_HOST: str | None = Field(None, description="Database host")
+    DB_PORT: str | None = Field(None, description="Database port")
+    DB_NAME: str | None = Field(None, description="Database name")
+    SQLITE_FILE_NAME: str = Field(
+        "database.db", description="SQLite database file"
+    )
+    RUN_MIGRATIONS_ON_STARTUP: bool = Field(
+        True, description="Apply pending migrations when a worker starts"
+    )
+    DB_READ_REPLICA_URL: str | None = Field(
+        None, description="Read replica URL used by read-only endpoints"
+    )
+
+    # Connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = Field(5, ge=1, description="Pooled connections")
+    DB_MAX_OVERFLOW: int = Field(
+        10, ge=0, description="Connections allowed above the pool size"
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        30, description="Seconds to wait for a pooled connection"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        3600, description="Seconds after which connections are replaced"
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        True, description="Check connections before handing them out"
+    )
+    DB_CONNECT_TIMEOUT: float = Field(
+        5, description="Seconds to wait when opening a connection"
+    )
+    DB_POOL_PREWARM: int = Field(
+        0, ge=0, description="Connections opened per pool on startup"
+    )
+
+    # SQLite (ignored for server databases)
+    SQLITE_WAL_MODE: bool = Field(
+        True, description="WAL, tuned pragmas, one writer and read pool"
+    )
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL"] = Field(
+        "NORMAL", description="Fsync policy (NORMAL is durable in WAL)"
+    )
+    SQLITE_CACHE_SIZE_KB: int = Field(
+        65_536, ge=0, description="Page cache per connection in KiB"
+    )
+    SQLITE_MMAP_SIZE: int = Field(
+        268_435_456, ge=0, description="Bytes of the file memory-mapped"
+    )
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(
+        5000, ge=0, description="Wait for locks held by other processes"
+    )
+    SQLITE_READ_POOL_SIZE: int = Field(
+        4, ge=1, description="Read-only connections kept open"
+    )
+
+    # Caching
+    USER_CACHE_SIZE: int = Field(
+        10_000, description="Max phone numbers kept in the user id cache"
+    )
+    USER_CACHE_TTL: float = Field(
+        300, description="Seconds a cached user id stays valid"
+    )
+
+    # "memory" keeps versions per process, so it only stays consistent
+    # when a single process serves the API; "auto" picks it then and
+    # disables the cache otherwise. Use "redis" to share one cache.
+    TODO_CACHE_BACKEND: Literal["auto", "memory", "redis", "none"] = Field(
+        "auto", description="Where getTodos results are cached"
+    )
+    WEB_CONCURRENCY: int = Field(
+        1, ge=1, description="API worker processes (uvicorn --workers)"
+    )
+    TODO_CACHE_SIZE: int = Field(
+        10_000, description="Max getTodos results kept in memory"
+    )
+    TODO_CACHE_TTL: float = Field(
+        300, description="Seconds a cached getTodos result stays valid"
+    )
+    REDIS_URL: str = Field(
+        "redis://localhost:6379/0", description="Redis for shared caches"
+    )
+
+    # Idempotency
+    TOOL_CALL_RETENTION_SECONDS: int = Field(
+        3600, ge=0, description="How long write results are replayed"
+    )
+    TOOL_CALL_PURGE_INTERVAL: float = Field(
+        60, description="Seconds between purges of expired results"
+    )
+
+    # Admission control for tool call routes (0 disables a limit)
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = Field(
+        "memory", description="Where per-caller token buckets are kept"
+    )
+    CALLER_RATE_LIMIT: float = Field(
+        5, ge=0, description="Tool calls per second per phone number"
+    )
+    CALLER_RATE_BURST: int = Field(
+        20, ge=1, description="Tool calls a phone number may burst"
+    )
+    WORKER_RATE_LIMIT: float = Field(
+        0, ge=0, description="Tool calls per second per worker"
+    )
+    WORKER_RATE_BURST: int = Field(
+        200, ge=1, description="Tool calls a worker may burst"
+    )
+    MAX_CONCURRENT_TOOL_REQUESTS: int = Field(
+        64, ge=0, description="Tool call requests served at once"
+    )
+    ADMISSION_WAIT_TIMEOUT: float = Field(
+        0.25, ge=0, description="Seconds to wait for a free slot"
+    )
+
+    # Search
+    TODO_TITLE_MATCH_THRESHOLD: float = Field(
+        0.5,
+        ge=0,
+        le=1,
+        description="Minimum word similarity for completeTodo/deleteTodo",
+    )
+
+    # Listing
+    GET_TODOS_MAX_LIMIT: int = Field(
+        200, description="Upper bound for the getTodos limit argument"
+    )
+
+    EXPORT_BATCH_SIZE: int = Field(
+        1000, description="Rows fetched per round trip by the export"
+    )
+
+    IMPORT_CHUNK_SIZE: int = Field(
+        500, description="Rows inserted per bulk import transaction"
+    )
+
+    # Write coalescing (0 disables it)
+    CREATE_TODO_COALESCE_WINDOW_MS: float = Field(
+        0, ge=0, description="Window for grouping createTodo commits"
+    )
+    CREATE_TODO_COALESCE_MAX_BATCH: int = Field(
+        100, ge=1, description="createTodo calls flushed per commit"
+    )
+
+    # Observability
+    METRICS_ENABLED: bool = Field(
+        True, description="Record request metrics and serve /metrics"
+    )
+
+    # SQL profiling (debug only: slow statements are logged with params)
+    SQL_PROFILING_ENABLED: bool = Field(
+        False, description="Profile queries per request, serve /debug/sql/"
+    )
+    SQL_SLOW_QUERY_MS: float = Field(
+        100, description="Log statements running at least this long"
+    )
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = Field(
+        2, ge=2, description="Executions per request flagged as repeated"
+    )
+    SQL_PROFILE_HISTORY: int = Field(
+        100, description="Request profiles kept for /debug/sql/"
+    )
 
     # VAPI
     VAPI_API_PUBLIC_KEY: str = Field(..., description="VAPI public key")
@@ -22,11 +188,101 @@ class Settings(BaseSettings):
     )
     MODEL: str = Field(..., description="AI model name")
     PhoneNumberID: str = Field(..., description="Phone number ID")
+    VAPI_WEBHOOK_SECRET: str | None = Field(
+        None, description="Expected x-vapi-secret header on webhooks"
+    )
+    VAPI_BASE_URL: str = Field(
+        "https://api.vapi.ai", description="VAPI API base URL"
+    )
+    VAPI_TIMEOUT: float = Field(
+        10.0, description="Per-request VAPI timeout in seconds"
+    )
+    VAPI_MAX_CONNECTIONS: int = Field(
+        20, description="Pooled connections kept open to VAPI"
+    )
+
+    # Reminder calls (see app.services.reminders)
+    REMINDERS_ENABLED: bool = Field(
+        False, description="Place outbound calls for due reminders"
+    )
+    REMINDER_POLL_INTERVAL: float = Field(
+        5, gt=0, description="Seconds between due-time queries"
+    )
+    REMINDER_HORIZON: float = Field(
+        60, gt=0, description="Seconds ahead loaded by each query"
+    )
+    REMINDER_LOAD_LIMIT: int = Field(
+        10_000, ge=1, description="Upcoming reminders kept in memory"
+    )
+    REMINDER_BATCH_SIZE: int = Field(
+        100, ge=1, description="Due reminders claimed per transaction"
+    )
+    REMINDER_CONCURRENCY: int = Field(
+        10, ge=1, description="Reminder calls being placed at once"
+    )
+    REMINDER_MAX_ATTEMPTS: int = Field(
+        3, ge=1, description="Tries for a call Vapi refused to place"
+    )
+    REMINDER_RETRY_DELAY: float = Field(
+        60, description="Seconds before retrying a refused call"
+    )
+
+    # Background tasks
+    CELERY_BROKER_URL: str | None = Field(
+        None, description="Celery broker (defaults to REDIS_URL)"
+    )
+    CELERY_RESULT_BACKEND: str | None = Field(
+        None, description="Celery result backend; results dropped if unset"
+    )
+    CELERY_TASK_ALWAYS_EAGER: bool = Field(
+        False, description="Run tasks inline instead of on a worker"
+    )
+    CALL_PROCESSING_DELAY: int = Field(
+        30,
+        description=(
+            "Seconds to wait after an ended status-update for the "
+            "end-of-call report before fetching the call from Vapi"
+        ),
+    )
+    CALL_PROCESSING_MAX_RETRIES: int = Field(
+        8, description="Retries while a call has not ended"
+    )
+    CALL_PROCESSING_BACKOFF: int = Field(
+        5, description="First retry delay in seconds, doubled each time"
+    )
+    CALL_PROCESSING_BACKOFF_MAX: int = Field(
+        300, description="Upper bound for the retry delay in seconds"
+    )
+
+    def _database_url(self, sqlite_driver: str, postgres_driver: str):
+        if not self.DB_HOST:
+            return f"{sqlite_driver}:///{self.SQLITE_FILE_NAME}"
+        return URL.create(
+            postgres_driver,
+            username=self.DB_USER,
+            password=self.DB_PASSWORD,
+            host=self.DB_HOST,
+            port=int(self.DB_PORT) if self.DB_PORT else None,
+            database=self.DB_NAME,
+        ).render_as_string(hide_password=False)
 
     @property
     def DATABASE_URL(self) -> str:
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}\
-    @{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return self._database_url("sqlite", "postgresql")
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return self._database_url("sqlite+aiosqlite", "postgresql+asyncpg")
+
+    @property
+    def ASYNC_READ_REPLICA_URL(self) -> str | None:
+        if not self.DB_READ_REPLICA_URL:
+            return None
+        url = make_url(self.DB_READ_REPLICA_URL)
+        driver = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+        return url.set(drivername=driver).render_as_string(
+            hide_password=False
+        )
 
     class Config:
         env_file = ".env"
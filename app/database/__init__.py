@@ -1 +1,12 @@
-from .session import Base, SessionLocal, get_db
+from .session import (
+    Base,
+    get_async_db,
+    get_async_engine,
+    get_async_read_db,
+    get_async_read_engine,
+    get_async_read_sessionmaker,
+    get_async_sessionmaker,
+    get_db,
+    get_engine,
+    get_sessionmaker,
+)
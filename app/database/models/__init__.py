@@ -1 +1,4 @@
+from .calls import Call
+from .summaries import TodoSummary
+from .tool_calls import ToolCallResult
 from .users import User
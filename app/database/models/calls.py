@@ -0,0 +1,23 @@
+from sqlalchemy import JSON, Column, DateTime, String, Text
+
+from app.database import Base
+
+
+class Call(Base):
+    """Vapi call as reported by server webhooks or polling."""
+
+    __tablename__ = "calls"
+
+    id = Column(String(255), primary_key=True)
+    type = Column(String(64), nullable=True)
+    status = Column(String(64), nullable=True, index=True)
+    assistant_id = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    ended_at = Column(DateTime(timezone=True), nullable=True)
+    ended_reason = Column(String(255), nullable=True)
+    transcript = Column(Text, nullable=True)
+    analysis = Column(JSON, nullable=True)
+    # Set once the end-of-call report or polled details are stored.
+    details_at = Column(DateTime(timezone=True), nullable=True)
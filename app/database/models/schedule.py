@@ -1,4 +1,14 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+)
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -6,6 +16,12 @@ from app.database import Base
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_owner_id_completed", "owner_id", "completed"),
+        Index("ix_todos_owner_id_title", "owner_id", "title"),
+        Index("ix_todos_remind_at", "remind_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(String, nullable=True)
@@ -15,5 +31,33 @@ class Todo(Base):
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
+    due_at = Column(DateTime(timezone=True), nullable=True)
+    # Next reminder call; cleared once the reminder is claimed for
+    # dialling (see app.services.reminders) or the todo is completed.
+    remind_at = Column(DateTime(timezone=True), nullable=True)
+    reminded_at = Column(DateTime(timezone=True), nullable=True)
+    reminder_call_id = Column(String(255), nullable=True)
+    reminder_attempts = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     owner = relationship("User", back_populates="todos")
+
+
+# Title search index used by app.services.search on Postgres (SQLite
+# ranks a user's titles in Python, see ``TodoSearch``).
+TODO_TITLE_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_todos_title_trgm "
+        "ON todos USING gin (title gin_trgm_ops)",
+    ],
+}
+
+for _dialect, _statements in TODO_TITLE_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Todo.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
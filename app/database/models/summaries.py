@@ -0,0 +1,22 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from app.database import Base
+
+
+class TodoSummary(Base):
+    """Todo counters of one user (see ``app.services.summaries``)."""
+
+    __tablename__ = "todo_summaries"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    completed = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Most recently added todo.
+    latest_todo_id = Column(Integer, nullable=True)
+    latest_title = Column(String, nullable=True)
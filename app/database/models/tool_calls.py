@@ -0,0 +1,16 @@
+from sqlalchemy import JSON, Column, DateTime, String
+
+from app.database import Base
+
+
+class ToolCallResult(Base):
+    """Result of a write tool call, replayed when Vapi retries it."""
+
+    __tablename__ = "tool_call_results"
+
+    id = Column(String(255), primary_key=True)
+    name = Column(String(64), nullable=False)
+    result = Column(JSON, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
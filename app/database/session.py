@@ -1,31 +1,264 @@
-from typing import Generator
+import asyncio
+import time
+from functools import cache
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
-# from app.core.config import settings
+from app.core.config import settings
+from app.utils.metrics import POOL_CHECKOUT_WAIT
 
-# DATABASE_URL = settings.DATABASE_URL
 
-# engine = create_engine(
-#     DATABASE_URL,
-#     poolclass=QueuePool,
-#     pool_size=5,
-#     max_overflow=10,
-#     pool_timeout=30,
-#     pool_recycle=3600,
-#     pool_pre_ping=True,
-#     connect_args={"connect_timeout": 5},
-# )
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits."""
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
 
-connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, connect_args=connect_args)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def is_tuned_sqlite(url: str | URL) -> bool:
+    """Whether SQLITE_WAL_MODE applies to a URL (SQLite files only)."""
+    url = make_url(url)
+    return (
+        settings.SQLITE_WAL_MODE
+        and url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+    )
+
+
+def sqlite_pragmas(read_only: bool = False) -> list[str]:
+    """Pragmas run on every new connection to a tuned SQLite file."""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def tune_sqlite(engine: Engine, read_only: bool = False) -> None:
+    """Apply the SQLite pragmas and transaction handling to an engine.
+
+    The driver's own transaction handling is turned off so that every
+    transaction starts with an explicit BEGIN: write connections take
+    the write lock up front (BEGIN IMMEDIATE), which waits out
+    ``busy_timeout`` instead of failing with "database is locked" when a
+    read transaction later tries to write; read connections get a
+    consistent snapshot for all their statements.
+    """
+    pragmas = sqlite_pragmas(read_only)
+    begin = "BEGIN" if read_only else "BEGIN IMMEDIATE"
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql(begin)
+
+
+def engine_options(url: str, read_only: bool = False) -> dict:
+    """Pool and connect options for an engine URL, taken from settings.
+
+    SQLite keeps SQLAlchemy's defaults unless SQLITE_WAL_MODE is on:
+    then writes go through a single pooled connection (one writer, so
+    writers queue in the pool instead of contending for the file lock)
+    and reads through SQLITE_READ_POOL_SIZE read-only connections.
+    Server databases get a QueuePool sized and recycled according to
+    the DB_POOL_* settings. Async engines using a queue pool time their
+    checkouts.
+    """
+    url = make_url(url)
+    options = {}
+    pool_class = url.get_dialect().get_pool_class(url)
+    if pool_class is AsyncAdaptedQueuePool:
+        options["poolclass"] = TimedAsyncAdaptedQueuePool
+
+    if url.get_backend_name() == "sqlite":
+        if url.get_driver_name() == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}
+        if is_tuned_sqlite(url) and issubclass(pool_class, QueuePool):
+            options.update(
+                pool_size=(
+                    settings.SQLITE_READ_POOL_SIZE if read_only else 1
+                ),
+                max_overflow=0,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+        return options
+
+    timeout_arg = (
+        "timeout"
+        if url.get_driver_name() == "asyncpg"
+        else "connect_timeout"
+    )
+    return {
+        **options,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {timeout_arg: settings.DB_CONNECT_TIMEOUT},
+    }
+
+
+def build_async_engine(
+    url: str, read_only: bool = False, pooled: bool = True
+) -> AsyncEngine:
+    """Create an async engine configured by ``engine_options``.
+
+    With ``pooled=False`` every checkout opens a new connection
+    (NullPool), e.g. for code that runs each job in its own event loop;
+    connect options, SQLite pragmas and BEGIN IMMEDIATE still apply.
+    """
+    options = engine_options(url, read_only=read_only)
+    if not pooled:
+        options = {
+            "poolclass": NullPool,
+            "connect_args": options.get("connect_args", {}),
+        }
+    async_engine = create_async_engine(url, **options)
+    if is_tuned_sqlite(url):
+        tune_sqlite(async_engine.sync_engine, read_only=read_only)
+    return async_engine
+
+
+# Engines and session factories are created on first use rather than on
+# import, so that importing the app (or a tool that never touches the
+# database) does not pay for them.
+
+
+@cache
+def get_engine() -> Engine:
+    """Sync engine on the primary database."""
+    url = settings.DATABASE_URL
+    engine = create_engine(url, **engine_options(url))
+    if is_tuned_sqlite(url):
+        tune_sqlite(engine)
+    return engine
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """Async engine on the primary database."""
+    return build_async_engine(settings.ASYNC_DATABASE_URL)
+
+
+@cache
+def get_async_read_engine() -> AsyncEngine:
+    """Async engine for read-only traffic.
+
+    Read-only traffic goes to the replica when one is configured and to
+    the primary otherwise. Replicas lag behind the primary, so only
+    paths that tolerate slightly stale reads should use it. A tuned
+    SQLite file gets its own read pool, which sees every committed
+    write.
+    """
+    if settings.ASYNC_READ_REPLICA_URL:
+        return build_async_engine(settings.ASYNC_READ_REPLICA_URL)
+    if is_tuned_sqlite(settings.ASYNC_DATABASE_URL):
+        return build_async_engine(
+            settings.ASYNC_DATABASE_URL, read_only=True
+        )
+    return get_async_engine()
+
+
+@cache
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(
+        autocommit=False, autoflush=False, bind=get_engine()
+    )
+
+
+@cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Provide the session factory for work that outlives the request.
+
+    Streaming responses are iterated after request dependencies have
+    been torn down, so they open their own session from this factory.
+    """
+    return async_sessionmaker(
+        get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+@cache
+def get_async_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Provide the read-only session factory for long-lived reads."""
+    if get_async_read_engine() is get_async_engine():
+        return get_async_sessionmaker()
+    return async_sessionmaker(
+        get_async_read_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+        # Replica reads may lag behind the primary (see todo_cache).
+        info={"replica": bool(settings.ASYNC_READ_REPLICA_URL)},
+    )
+
+
+def created_async_engines() -> list[AsyncEngine]:
+    """The async engines created so far, without creating the others."""
+    engines = []
+    for getter in (get_async_engine, get_async_read_engine):
+        if getter.cache_info().currsize:
+            engine = getter()
+            if engine not in engines:
+                engines.append(engine)
+    return engines
+
+
+async def prewarm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open up to ``connections`` pooled connections ahead of traffic.
+
+    The connections are opened concurrently and returned to the pool,
+    so the first requests after startup skip the connect (and, for a
+    tuned SQLite file, the pragmas). Capped at the pool size; engines
+    that do not pool connections are left alone.
+
+    Returns:
+        int: Number of connections opened.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+    connections = [
+        engine.connect() for _ in range(min(connections, pool.size()))
+    ]
+    results = await asyncio.gather(
+        *(connection.start() for connection in connections),
+        return_exceptions=True,
+    )
+    for connection, result in zip(connections, results):
+        if not isinstance(result, BaseException):
+            await connection.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(connections)
+
 
 Base = declarative_base()
 
@@ -36,8 +269,29 @@ def get_db() -> Generator:
     Yields:
         Generator: Database session.
     """
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an async database session for dependency injection.
+
+    Yields:
+        AsyncSession: Database session bound to the async engine.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an async session for read-only endpoints.
+
+    Yields:
+        AsyncSession: Session bound to the read replica if configured,
+        otherwise to the primary.
+    """
+    async with get_async_read_sessionmaker()() as db:
+        yield db
@@ -1,23 +1,67 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.database import Base
-from app.database.session import engine
-from app.routes import schedule, users
+from app.core.config import settings
+from app.database.session import (
+    created_async_engines,
+    get_async_engine,
+    get_async_read_engine,
+    get_async_sessionmaker,
+    get_engine,
+    prewarm_pool,
+)
+from app.migrations import run_migrations
+from app.routes import debug, metrics, schedule, tools, users, vapi
+from app.services.admission import (
+    ToolCallsRejected,
+    tool_calls_rejected_handler,
+)
+from app.utils.metrics import MetricsMiddleware
+from app.utils.profiler import SQLProfilerMiddleware, sql_profiler
 
 
-def create_tables():
-    """Create database tables."""
-    Base.metadata.create_all(bind=engine)
+async def migrate_database():
+    """Apply pending schema migrations (a no-op once at head)."""
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(run_migrations)
+
+
+async def prewarm_pools(connections: int):
+    """Open pooled connections so the first requests skip connecting."""
+    engines = {get_async_engine(), get_async_read_engine()}
+    await asyncio.gather(
+        *(prewarm_pool(engine, connections) for engine in engines)
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
-    create_tables()
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        await migrate_database()
+    if settings.DB_POOL_PREWARM:
+        await prewarm_pools(settings.DB_POOL_PREWARM)
+    scheduler = None
+    if settings.REMINDERS_ENABLED:
+        # Imported here so that workers without reminders never load
+        # the Vapi client.
+        from app.services.reminders import make_scheduler
+        from app.utils.vapi import get_vapi_handler
+
+        scheduler = make_scheduler(
+            get_async_sessionmaker(), get_vapi_handler()
+        )
+        scheduler.start()
     yield
+    if scheduler is not None:
+        await scheduler.stop()
+        await scheduler.vapi.aclose()
+    for engine in created_async_engines():
+        await engine.dispose()
 
 
 def get_application():
@@ -28,6 +72,7 @@ def get_application():
         version="1.0.0",
         docs_url="/",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -37,9 +82,29 @@ def get_application():
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
+    if settings.SQL_PROFILING_ENABLED:
+        for instrumented in (
+            get_engine(),
+            get_async_engine(),
+            get_async_read_engine(),
+        ):
+            sql_profiler.instrument(
+                getattr(instrumented, "sync_engine", instrumented)
+            )
+        app.add_middleware(SQLProfilerMiddleware)
+        app.include_router(debug.router)
+
+    app.add_exception_handler(
+        ToolCallsRejected, tool_calls_rejected_handler
+    )
 
     app.include_router(users.router)
     app.include_router(schedule.router)
+    app.include_router(tools.router)
+    app.include_router(vapi.router)
 
     return app
 
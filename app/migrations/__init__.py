@@ -0,0 +1 @@
+from .runner import current_version, head_version, run_migrations
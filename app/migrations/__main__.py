@@ -0,0 +1,12 @@
+"""Apply pending migrations: ``python -m app.migrations``."""
+
+import logging
+
+from app.database.session import get_engine
+from app.migrations import run_migrations
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with get_engine().begin() as connection:
+        applied = run_migrations(connection)
+    print(f"Applied migrations: {applied or 'none'}")
@@ -0,0 +1,115 @@
+import importlib
+import logging
+import pkgutil
+from types import ModuleType
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from app.migrations import versions
+
+logger = logging.getLogger("migrations")
+
+# Arbitrary key for pg_advisory_xact_lock so that only one worker
+# migrates at a time.
+ADVISORY_LOCK_ID = 720_531_004
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column(
+        "applied_at", DateTime(timezone=True), server_default=func.now()
+    ),
+)
+
+
+def load_migrations() -> list[ModuleType]:
+    """Import every ``app.migrations.versions`` module, ordered by version.
+
+    Each module defines ``version`` (int), ``description`` (str) and
+    ``upgrade(connection)``.
+    """
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.version)
+    numbers = [module.version for module in modules]
+    if len(set(numbers)) != len(numbers):
+        raise RuntimeError(f"Duplicate migration versions: {numbers}")
+    return modules
+
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(connection: Connection) -> int:
+    """Return the latest applied version, 0 for an unmigrated database."""
+    if not inspect(connection).has_table(schema_migrations.name):
+        return 0
+    version = connection.scalar(
+        select(func.max(schema_migrations.c.version))
+    )
+    return version or 0
+
+
+def run_migrations(connection: Connection) -> list[int]:
+    """Apply pending migrations in order inside the caller's transaction.
+
+    Costs a single query when the database is already at head, so it
+    is cheap to call on every worker start.
+
+    Args:
+        connection: Connection with an open transaction.
+
+    Returns:
+        list[int]: Versions applied by this call.
+    """
+    migrations = load_migrations()
+    head = migrations[-1].version if migrations else 0
+    if current_version(connection) >= head:
+        return []
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"),
+            {"id": ADVISORY_LOCK_ID},
+        )
+    schema_migrations.create(connection, checkfirst=True)
+
+    # Re-read under the lock in case another worker got there first.
+    version = current_version(connection)
+    applied = []
+    for migration in migrations:
+        if migration.version <= version:
+            continue
+        logger.info(
+            "Applying migration %04d: %s",
+            migration.version,
+            migration.description,
+        )
+        migration.upgrade(connection)
+        connection.execute(
+            insert(schema_migrations).values(
+                version=migration.version,
+                description=migration.description,
+            )
+        )
+        applied.append(migration.version)
+    return applied
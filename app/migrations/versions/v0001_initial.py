@@ -0,0 +1,108 @@
+"""Baseline schema: users, todos, calls and the todo title index.
+
+Uses ``checkfirst`` and ``IF NOT EXISTS`` so databases created by the
+old ``create_all`` on startup are adopted as they are.
+"""
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+version = 1
+description = "initial schema"
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column(
+        "id", Integer, primary_key=True, index=True, autoincrement=True
+    ),
+    Column("name", String(255), nullable=False),
+    Column(
+        "phone_number",
+        String(255),
+        unique=True,
+        index=True,
+        nullable=False,
+    ),
+)
+
+Table(
+    "todos",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, index=True),
+    Column("description", String, nullable=True),
+    Column("completed", Boolean),
+    Column(
+        "owner_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+)
+
+Table(
+    "calls",
+    metadata,
+    Column("id", String(255), primary_key=True),
+    Column("type", String(64), nullable=True),
+    Column("status", String(64), nullable=True, index=True),
+    Column("assistant_id", String(255), nullable=True),
+    Column("created_at", DateTime(timezone=True), nullable=True),
+    Column("updated_at", DateTime(timezone=True), nullable=True),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    Column("ended_at", DateTime(timezone=True), nullable=True),
+    Column("ended_reason", String(255), nullable=True),
+    Column("transcript", Text, nullable=True),
+    Column("analysis", JSON, nullable=True),
+)
+
+# Title search index as first shipped; frozen here rather than imported
+# from the models, which have moved on (the SQLite table is dropped by
+# v0006).
+TITLE_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS todos_title_fts USING fts5("
+        "title, content='todos', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS todos_title_fts_ai "
+        "AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_title_fts(rowid, title) "
+        "VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS todos_title_fts_ad "
+        "AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_title_fts(todos_title_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER IF NOT EXISTS todos_title_fts_au "
+        "AFTER UPDATE OF title ON todos BEGIN "
+        "INSERT INTO todos_title_fts(todos_title_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); "
+        "INSERT INTO todos_title_fts(rowid, title) "
+        "VALUES (new.id, new.title); END",
+        "INSERT INTO todos_title_fts(todos_title_fts) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_todos_title_trgm "
+        "ON todos USING gin (title gin_trgm_ops)",
+    ],
+}
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+    for statement in TITLE_SEARCH_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
@@ -0,0 +1,23 @@
+"""Composite indexes for the per-user todo queries.
+
+``(owner_id, completed)`` serves getTodos filtered by status and
+``(owner_id, title)`` serves listing ordered by title; both also cover
+plain ``owner_id`` lookups, which had no index before.
+"""
+
+from sqlalchemy import Index, MetaData, Table
+from sqlalchemy.engine import Connection
+
+version = 2
+description = "todos (owner_id, completed) and (owner_id, title) indexes"
+
+
+def upgrade(connection: Connection) -> None:
+    todos = Table("todos", MetaData(), autoload_with=connection)
+    for name, columns in [
+        ("ix_todos_owner_id_completed", ("owner_id", "completed")),
+        ("ix_todos_owner_id_title", ("owner_id", "title")),
+    ]:
+        Index(name, *(todos.c[column] for column in columns)).create(
+            connection, checkfirst=True
+        )
@@ -0,0 +1,27 @@
+"""Results of write tool calls, keyed by Vapi ``toolCallId``.
+
+``created_at`` is indexed so expired rows can be purged cheaply.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+version = 3
+description = "tool_call_results table"
+
+metadata = MetaData()
+
+Table(
+    "tool_call_results",
+    metadata,
+    Column("id", String(255), primary_key=True),
+    Column("name", String(64), nullable=False),
+    Column("result", JSON, nullable=True),
+    Column(
+        "created_at", DateTime(timezone=True), nullable=False, index=True
+    ),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,49 @@
+"""Due dates and reminder calls for todos.
+
+``ix_todos_remind_at`` lets the reminder scheduler load upcoming
+reminders with a range scan instead of reading every todo.
+"""
+
+from sqlalchemy import (
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+version = 4
+description = "todo due_at, remind_at and reminder call columns"
+
+COLUMNS = [
+    ("due_at", DateTime(timezone=True), ""),
+    ("remind_at", DateTime(timezone=True), ""),
+    ("reminded_at", DateTime(timezone=True), ""),
+    ("reminder_call_id", String(255), ""),
+    ("reminder_attempts", Integer(), " NOT NULL DEFAULT 0"),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {
+        column["name"]
+        for column in inspect(connection).get_columns("todos")
+    }
+    for name, type_, constraints in COLUMNS:
+        if name not in existing:
+            connection.execute(
+                text(
+                    f"ALTER TABLE todos ADD COLUMN {name} "
+                    f"{type_.compile(dialect=connection.dialect)}"
+                    f"{constraints}"
+                )
+            )
+
+    todos = Table("todos", MetaData(), autoload_with=connection)
+    Index("ix_todos_remind_at", todos.c.remind_at).create(
+        connection, checkfirst=True
+    )
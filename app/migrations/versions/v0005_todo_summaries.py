@@ -0,0 +1,81 @@
+"""Per-user todo counters, backfilled from the existing todos.
+
+Users with no summary row yet get one counting their todos; rows left
+by an earlier partial run are kept.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+version = 5
+description = "todo_summaries table"
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+todos = Table(
+    "todos",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String),
+    Column("completed", Boolean),
+    Column("owner_id", Integer),
+)
+todo_summaries = Table(
+    "todo_summaries",
+    metadata,
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total", Integer, nullable=False, server_default="0"),
+    Column("completed", Integer, nullable=False, server_default="0"),
+    Column("latest_todo_id", Integer, nullable=True),
+    Column("latest_title", String, nullable=True),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    todo_summaries.create(connection, checkfirst=True)
+
+    users = metadata.tables["users"]
+    counts = (
+        select(
+            users.c.id,
+            func.count(todos.c.id),
+            func.count(case((todos.c.completed.is_(True), 1))),
+            func.max(todos.c.id),
+        )
+        .select_from(
+            users.outerjoin(todos, todos.c.owner_id == users.c.id)
+        )
+        .where(users.c.id.not_in(select(todo_summaries.c.user_id)))
+        .group_by(users.c.id)
+    )
+    connection.execute(
+        todo_summaries.insert().from_select(
+            ["user_id", "total", "completed", "latest_todo_id"], counts
+        )
+    )
+    connection.execute(
+        text(
+            "UPDATE todo_summaries SET latest_title = ("
+            "SELECT title FROM todos "
+            "WHERE todos.id = todo_summaries.latest_todo_id) "
+            "WHERE latest_todo_id IS NOT NULL AND latest_title IS NULL"
+        )
+    )
@@ -0,0 +1,26 @@
+"""Drop the SQLite FTS5 title index and its triggers.
+
+The index was not scoped by owner, so a lookup matched and ranked every
+user's todos; ``TodoSearch`` now ranks one user's titles read through
+``ix_todos_owner_id_title`` instead. Postgres keeps its pg_trgm index.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+version = 6
+description = "drop SQLite todo title FTS index"
+
+STATEMENTS = [
+    "DROP TRIGGER IF EXISTS todos_title_fts_ai",
+    "DROP TRIGGER IF EXISTS todos_title_fts_ad",
+    "DROP TRIGGER IF EXISTS todos_title_fts_au",
+    "DROP TABLE IF EXISTS todos_title_fts",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,32 @@
+"""When a call's end-of-call report or polled details were stored.
+
+A status update can mark a call ended before its transcript and
+analysis arrive; only calls with ``details_at`` are served from the
+store. Calls stored before this column existed count as complete if
+they have a transcript or an analysis.
+"""
+
+from sqlalchemy import DateTime, inspect, text
+from sqlalchemy.engine import Connection
+
+version = 7
+description = "calls.details_at column"
+
+
+def upgrade(connection: Connection) -> None:
+    existing = {
+        column["name"]
+        for column in inspect(connection).get_columns("calls")
+    }
+    if "details_at" in existing:
+        return
+    type_ = DateTime(timezone=True).compile(dialect=connection.dialect)
+    connection.execute(
+        text(f"ALTER TABLE calls ADD COLUMN details_at {type_}")
+    )
+    connection.execute(
+        text(
+            "UPDATE calls SET details_at = CURRENT_TIMESTAMP "
+            "WHERE transcript IS NOT NULL OR analysis IS NOT NULL"
+        )
+    )
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from app.utils.profiler import sql_profiler
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/sql/")
+async def get_sql_profiles():
+    """Query counts, DB time and repeated statements of recent requests."""
+    return {
+        "slow_query_ms": sql_profiler.slow_query_ms,
+        "repeat_threshold": sql_profiler.repeat_threshold,
+        "requests": list(sql_profiler.recent),
+    }
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+
+from app.utils.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request, tool call and connection pool metrics for Prometheus."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
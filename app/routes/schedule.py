@@ -1,38 +1,98 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.database import (
+    get_async_db,
+    get_async_read_db,
+    get_async_sessionmaker,
+)
 from app.schemas.vapi_schema import VapiRequest
+from app.services.admission import admission
+from app.services.imports import IMPORT_FORMATS, ImportService
 from app.services.schedule import ScheduleService
 
 router = APIRouter(prefix="/schedules", tags=["todos"])
 
 
 @router.post("/create_todo/")
-async def create_todo(request: VapiRequest, db: Session = Depends(get_db)):
-
-    todo = await ScheduleService.create_todo(db, request)
+async def create_todo(
+    request: VapiRequest,
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_sessionmaker
+    ),
+):
+    async with admission.admit(request):
+        todo = await ScheduleService.create_todo(
+            db, request, session_factory
+        )
 
-    return todo
+    return ORJSONResponse(todo)
 
 
 @router.post("/get_todos/")
-async def get_todos(request: VapiRequest, db: Session = Depends(get_db)):
+async def get_todos(
+    request: VapiRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    async with admission.admit(request):
+        todos = await ScheduleService.get_todos(db, request)
 
-    todos = await ScheduleService.get_todos(db, request)
+    # Tool results may hold pre-serialized JSON (orjson.Fragment), so
+    # they are rendered directly instead of through jsonable_encoder.
+    return ORJSONResponse(todos)
 
-    return todos
+
+@router.post("/get_todo_summary/")
+async def get_todo_summary(
+    request: VapiRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    async with admission.admit(request):
+        summary = await ScheduleService.get_todo_summary(db, request)
+    return ORJSONResponse(summary)
 
 
 @router.post("/complete_todo/")
 async def complete_todo(
-    request: VapiRequest, db: Session = Depends(get_db)
+    request: VapiRequest, db: AsyncSession = Depends(get_async_db)
 ):
-    result = await ScheduleService.complete_todo(db, request)
-    return result
+    async with admission.admit(request):
+        result = await ScheduleService.complete_todo(db, request)
+    return ORJSONResponse(result)
 
 
 @router.post("/delete_todo/")
-async def delete_todo(request: VapiRequest, db: Session = Depends(get_db)):
-    result = await ScheduleService.delete_todo(db, request)
-    return result
+async def delete_todo(
+    request: VapiRequest, db: AsyncSession = Depends(get_async_db)
+):
+    async with admission.admit(request):
+        result = await ScheduleService.delete_todo(db, request)
+    return ORJSONResponse(result)
+
+
+@router.post("/import/")
+async def import_todos(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """Bulk import todos from a CSV or NDJSON request body.
+
+    The format is picked from the Content-Type header (``text/csv`` or
+    ``application/x-ndjson``).
+    """
+    content_type = request.headers.get("content-type", "")
+    import_format = IMPORT_FORMATS.get(content_type.split(";")[0].strip())
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected text/csv or application/x-ndjson",
+        )
+
+    try:
+        body = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be UTF-8 encoded",
+        )
+
+    return await ImportService.import_todos(db, body, import_format)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.schemas.vapi_schema import VapiRequest
+from app.services.admission import admission
+from app.services.dispatcher import tool_dispatcher
+
+router = APIRouter(prefix="/tools", tags=["tools"])
+
+
+@router.post("/")
+async def dispatch_tool_calls(
+    request: VapiRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """Execute every tool call in the request in a single transaction."""
+    async with admission.admit(request):
+        results = await tool_dispatcher.dispatch(db, request)
+    return ORJSONResponse(results)
@@ -1,20 +1,51 @@
-import json
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import get_db
+from app.database import (
+    get_async_db,
+    get_async_read_db,
+    get_async_read_sessionmaker,
+)
+from app.schemas.schedule import TodoSummaryResponse
 from app.schemas.vapi_schema import VapiRequest
-from app.services.users import UserService
+from app.services.admission import admission
+from app.services.export import ExportService
+from app.services.idempotency import tool_call_results
+from app.services.summaries import TodoSummaryService
+from app.services.users import UserService, user_id_cache
 from app.utils.exceptions import UserAlreadyExistsError
+from app.utils.metrics import record_tool_call
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_users(db: Session = Depends(get_db)):
+async def get_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    after: int | None = Query(None, description="Last user id seen"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List users in id order.
+
+    When more users remain, the ``X-Next-Cursor`` header holds the
+    value to pass as ``after`` for the next page.
+    """
     try:
-        users = await UserService().get_users(db)
+        users = await UserService().get_users(
+            db, limit=limit + 1, after=after
+        )
+        if len(users) > limit:
+            users = users[:limit]
+            response.headers["X-Next-Cursor"] = str(users[-1].id)
         return users
     except Exception as e:
         raise HTTPException(
@@ -23,37 +54,66 @@ async def get_users(db: Session = Depends(get_db)):
         )
 
 
+@router.get("/export/", response_class=StreamingResponse)
+async def export_users(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_read_sessionmaker
+    ),
+):
+    """Stream every user and their todos as NDJSON."""
+    return StreamingResponse(
+        ExportService.stream_users_ndjson(session_factory),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/cache/", status_code=status.HTTP_200_OK)
+async def get_user_cache_stats():
+    """Hit/miss counters of the phone number to user id cache."""
+    return user_id_cache.stats()
+
+
+@router.get("/{user_id}/todo_summary/", response_model=TodoSummaryResponse)
+async def get_todo_summary(
+    user_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Todo counts of a user and their most recently added todo."""
+    summary = await TodoSummaryService.get(db, user_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return summary
+
+
 @router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
 )
-def add_user(request: VapiRequest, db: Session = Depends(get_db)):
+async def add_user(
+    request: VapiRequest, db: AsyncSession = Depends(get_async_db)
+):
     """Endpoint for user registration."""
-    try:
-        for tool_call in request.message.toolCalls:
-            if tool_call.function.name == "createUser":
-                args = tool_call.function.arguments
-                break
-        else:
-            raise HTTPException(status_code=400, detail="Invalid Request")
-
-        print(args, "--------args--add user-------")
-        if isinstance(args, str):
-            args = json.loads(args)
+    async with admission.admit(request):
+        try:
+            tool_call = request.find_tool_call("createUser")
+            if tool_call is None:
+                raise HTTPException(
+                    status_code=400, detail="Invalid Request"
+                )
+            record_tool_call("createUser")
 
-        user_data = {
-            "name": args.get("name", ""),
-            "phone_number": args.get("phone_number", ""),
-        }
+            result = await tool_call_results.run(
+                db, tool_call, UserService.handle_create_user
+            )
+            await db.commit()
 
-        _ = UserService.create_user(db, user_data)
+            return {
+                "results": [{"toolCallId": tool_call.id, "result": result}]
+            }
 
-        return {
-            "results": [{"toolCallId": tool_call.id, "result": "success"}]
-        }
-
-    except UserAlreadyExistsError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+        except UserAlreadyExistsError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
@@ -0,0 +1,100 @@
+import logging
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import get_async_db, get_async_read_db
+from app.schemas.vapi_schema import (
+    EndOfCallReport,
+    StatusUpdate,
+    VapiServerRequest,
+)
+from app.services.calls import CallService
+
+logger = logging.getLogger("routes.vapi")
+
+router = APIRouter(prefix="/vapi", tags=["vapi"])
+
+
+async def enqueue_call_processing(call_id: str, countdown: int = 0) -> str:
+    # Celery and the Vapi client are only needed once a call ends, so
+    # they are not imported when the app starts.
+    from app.tasks import calls
+
+    return await calls.enqueue_call_processing(call_id, countdown)
+
+
+def verify_webhook_secret(
+    x_vapi_secret: str | None = Header(default=None),
+) -> None:
+    expected = settings.VAPI_WEBHOOK_SECRET
+    if expected and not secrets.compare_digest(
+        x_vapi_secret or "", expected
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook secret",
+        )
+
+
+@router.post(
+    "/webhook/",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(verify_webhook_secret)],
+)
+async def webhook(
+    request: VapiServerRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """Receive Vapi server messages and store call reports."""
+    message = request.message
+    if isinstance(message, EndOfCallReport):
+        await CallService.record_end_of_call(db, message)
+    elif isinstance(message, StatusUpdate):
+        await CallService.record_status_update(db, message)
+        if message.status == "ended":
+            # The end-of-call report usually follows shortly but may
+            # never arrive; fetch the transcript and analysis in the
+            # background unless it has been stored by then. The update
+            # is stored either way, so a broker outage must not make
+            # Vapi retry the webhook.
+            try:
+                await enqueue_call_processing(
+                    message.call.id, settings.CALL_PROCESSING_DELAY
+                )
+            except Exception:
+                logger.exception(
+                    "Queueing processing of call %s failed",
+                    message.call.id,
+                )
+    return {}
+
+
+@router.post(
+    "/calls/{call_id}/process/",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(verify_webhook_secret)],
+)
+async def process_call(call_id: str):
+    """Queue fetching and storing the details of an ended call."""
+    return {
+        "call_id": call_id,
+        "task_id": await enqueue_call_processing(call_id),
+    }
+
+
+@router.get(
+    "/calls/{call_id}/", dependencies=[Depends(verify_webhook_secret)]
+)
+async def get_call(
+    call_id: str, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Stored details of an ended call."""
+    details = await CallService.get_call_details(db, call_id)
+    if details is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Call not processed yet",
+        )
+    return details
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from app.schemas.vapi_schema import UtcDateTime
 
 
 class TodoResponse(BaseModel):
@@ -6,5 +8,18 @@ class TodoResponse(BaseModel):
     title: str
     description: str | None
     completed: bool
+    due_at: UtcDateTime | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Validates a whole list of rows (anything with id/title/description/
+# completed attributes) and dumps it to JSON in one call.
+TODO_LIST_ADAPTER = TypeAdapter(list[TodoResponse])
+
+
+class TodoSummaryResponse(BaseModel):
+    total: int
+    completed: int
+    pending: int
+    most_recent: str | None
@@ -1,14 +1,189 @@
-from pydantic import BaseModel
+import json
+from datetime import datetime, timezone
+from typing import Annotated, Any, Literal, Union
 
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Discriminator,
+    Field,
+    StringConstraints,
+    Tag,
+)
+
+
+def _decode_arguments(value: Any) -> Any:
+    """Decode arguments sent as a JSON string (Vapi sends both forms)."""
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ValueError("arguments must be a JSON object")
+    return value
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _empty_if_none(value: str | None) -> str:
+    return "" if value is None else value
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Store times in UTC; times without an offset are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+PhoneNumber = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1)
+]
+Title = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1)
+]
+# The assistant often sends an explicit null for optional text.
+OptionalText = Annotated[str | None, AfterValidator(_empty_if_none)]
+UtcDateTime = Annotated[datetime, AfterValidator(_to_utc)]
+
+
+# Arguments of each tool the assistant can call. Unknown keys are
+# ignored so that new assistant prompts do not break older servers.
+class CreateUserArguments(BaseModel):
+    phone_number: PhoneNumber
+    name: OptionalText = ""
+
+
+class CreateTodoArguments(BaseModel):
+    phone_number: PhoneNumber
+    title: Title
+    description: OptionalText = ""
+    name: OptionalText = Field(
+        "", description="Used if the caller is unknown"
+    )
+    due_at: UtcDateTime | None = None
+    remind_at: UtcDateTime | None = Field(
+        None, description="When to call the caller; defaults to due_at"
+    )
+
+
+class GetTodosArguments(BaseModel):
+    phone_number: PhoneNumber
+    completed: bool | None = None
+    order_by: Literal["id", "title"] | None = None
+    order: Annotated[
+        Literal["asc", "desc"] | None, BeforeValidator(_lower)
+    ] = None
+    limit: int | None = Field(None, ge=1)
+
+
+class GetTodoSummaryArguments(BaseModel):
+    phone_number: PhoneNumber
+
+
+class CompleteTodoArguments(BaseModel):
+    phone_number: PhoneNumber
+    title: Title
+
+
+class DeleteTodoArguments(BaseModel):
+    phone_number: PhoneNumber
+    title: Title
+
+
+class _ToolFunction(BaseModel):
+    # Built from other function objects (e.g. ``ToolCallFunction``) too.
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CreateUserFunction(_ToolFunction):
+    name: Literal["createUser"]
+    arguments: Annotated[
+        CreateUserArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class CreateTodoFunction(_ToolFunction):
+    name: Literal["createTodo"]
+    arguments: Annotated[
+        CreateTodoArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class GetTodosFunction(_ToolFunction):
+    name: Literal["getTodos"]
+    arguments: Annotated[
+        GetTodosArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class GetTodoSummaryFunction(_ToolFunction):
+    name: Literal["getTodoSummary"]
+    arguments: Annotated[
+        GetTodoSummaryArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class CompleteTodoFunction(_ToolFunction):
+    name: Literal["completeTodo"]
+    arguments: Annotated[
+        CompleteTodoArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class DeleteTodoFunction(_ToolFunction):
+    name: Literal["deleteTodo"]
+    arguments: Annotated[
+        DeleteTodoArguments, BeforeValidator(_decode_arguments)
+    ]
+
+
+class ToolCallFunction(_ToolFunction):
+    """A call of a function without an argument model."""
 
-class ToolCallFunction(BaseModel):
     name: str
-    arguments: str | dict
+    arguments: str | dict = {}
+
+
+TOOL_FUNCTIONS = {
+    "createUser": CreateUserFunction,
+    "createTodo": CreateTodoFunction,
+    "getTodos": GetTodosFunction,
+    "getTodoSummary": GetTodoSummaryFunction,
+    "completeTodo": CompleteTodoFunction,
+    "deleteTodo": DeleteTodoFunction,
+}
+
+
+def _tool_function_tag(value: Any) -> str:
+    name = (
+        value.get("name")
+        if isinstance(value, dict)
+        else getattr(value, "name", None)
+    )
+    return name if name in TOOL_FUNCTIONS else "unknown"
+
+
+ToolFunction = Annotated[
+    Union[
+        Annotated[CreateUserFunction, Tag("createUser")],
+        Annotated[CreateTodoFunction, Tag("createTodo")],
+        Annotated[GetTodosFunction, Tag("getTodos")],
+        Annotated[GetTodoSummaryFunction, Tag("getTodoSummary")],
+        Annotated[CompleteTodoFunction, Tag("completeTodo")],
+        Annotated[DeleteTodoFunction, Tag("deleteTodo")],
+        Annotated[ToolCallFunction, Tag("unknown")],
+    ],
+    Discriminator(_tool_function_tag),
+]
 
 
 class ToolCall(BaseModel):
     id: str
-    function: ToolCallFunction
+    function: ToolFunction
 
 
 class Message(BaseModel):
@@ -17,3 +192,78 @@ class Message(BaseModel):
 
 class VapiRequest(BaseModel):
     message: Message
+
+    def find_tool_call(self, name: str) -> ToolCall | None:
+        """Return the first tool call for the given function name."""
+        for tool_call in self.message.toolCalls:
+            if tool_call.function.name == name:
+                return tool_call
+        return None
+
+
+# Server messages sent by Vapi to the webhook (``serverUrl``). Only the
+# fields we persist are declared; everything else is accepted and
+# ignored.
+class ServerMessageCall(BaseModel):
+    id: str
+    type: str | None = None
+    status: str | None = None
+    assistantId: str | None = None
+    createdAt: datetime | None = None
+    updatedAt: datetime | None = None
+    startedAt: datetime | None = None
+    endedAt: datetime | None = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class EndOfCallReport(BaseModel):
+    type: Literal["end-of-call-report"]
+    call: ServerMessageCall
+    transcript: str | None = None
+    analysis: dict[str, Any] | None = None
+    startedAt: datetime | None = None
+    endedAt: datetime | None = None
+    endedReason: str | None = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class StatusUpdate(BaseModel):
+    type: Literal["status-update"]
+    status: str
+    call: ServerMessageCall
+    endedReason: str | None = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class OtherServerMessage(BaseModel):
+    type: str
+
+    model_config = ConfigDict(extra="allow")
+
+
+def _server_message_tag(value: Any) -> str:
+    message_type = (
+        value.get("type")
+        if isinstance(value, dict)
+        else getattr(value, "type", None)
+    )
+    if message_type in ("end-of-call-report", "status-update"):
+        return message_type
+    return "other"
+
+
+ServerMessage = Annotated[
+    Union[
+        Annotated[EndOfCallReport, Tag("end-of-call-report")],
+        Annotated[StatusUpdate, Tag("status-update")],
+        Annotated[OtherServerMessage, Tag("other")],
+    ],
+    Discriminator(_server_message_tag),
+]
+
+
+class VapiServerRequest(BaseModel):
+    message: ServerMessage
@@ -0,0 +1,181 @@
+import math
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+from app.schemas.vapi_schema import ToolCall, VapiRequest
+from app.utils.metrics import TOOL_CALLS_REJECTED
+from app.utils.ratelimit import (
+    ConcurrencyGate,
+    RedisTokenBucketLimiter,
+    TokenBucketLimiter,
+)
+
+# Read out by the assistant, so it must make sense to the caller.
+TRY_AGAIN = "The service is busy right now, please try again shortly."
+
+
+class ToolCallsRejected(Exception):
+    """Tool calls turned away by admission control."""
+
+    def __init__(
+        self, tool_calls: list[ToolCall], reason: str, retry_after: float
+    ):
+        super().__init__(reason)
+        self.tool_calls = tool_calls
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def make_caller_limiter():
+    """Build the per phone number limiter selected by the settings."""
+    if not settings.CALLER_RATE_LIMIT:
+        return None
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        from redis.asyncio import Redis
+
+        return RedisTokenBucketLimiter(
+            Redis.from_url(settings.REDIS_URL),
+            rate=settings.CALLER_RATE_LIMIT,
+            burst=settings.CALLER_RATE_BURST,
+            prefix="ratelimit:caller",
+        )
+    return TokenBucketLimiter(
+        rate=settings.CALLER_RATE_LIMIT, burst=settings.CALLER_RATE_BURST
+    )
+
+
+class AdmissionController:
+    """Decide whether a tool call request is served now.
+
+    Requests are charged one token per tool call (at most a full
+    bucket) against the bucket of each phone number they act for and
+    against the worker's bucket, then take a slot of the concurrency
+    gate for as long as they run.
+    Any of the three can be disabled by passing None.
+    """
+
+    def __init__(
+        self,
+        caller_limiter=None,
+        worker_limiter: TokenBucketLimiter | None = None,
+        gate: ConcurrencyGate | None = None,
+    ):
+        self.caller_limiter = caller_limiter
+        self.worker_limiter = worker_limiter
+        self.gate = gate
+
+    async def check_rates(self, tool_calls: list[ToolCall]) -> list:
+        """Charge the rate limits or raise ``ToolCallsRejected``.
+
+        Returns:
+            list: ``(limiter, key, tokens)`` charges, to ``refund`` if
+            the request is turned away later on. Charges made before a
+            limit rejects the request are refunded here.
+        """
+        charges = []
+        buckets = []
+        if self.caller_limiter is not None:
+            callers = Counter(
+                phone_number
+                for tool_call in tool_calls
+                if (
+                    phone_number := getattr(
+                        tool_call.function.arguments, "phone_number", None
+                    )
+                )
+            )
+            buckets.extend(
+                (self.caller_limiter, phone_number, count, "caller")
+                for phone_number, count in callers.items()
+            )
+        if self.worker_limiter is not None:
+            buckets.append(
+                (self.worker_limiter, "worker", len(tool_calls), "worker")
+            )
+
+        for limiter, key, tokens, reason in buckets:
+            wait = await limiter.acquire(key, tokens)
+            if wait:
+                await self.refund(charges)
+                raise ToolCallsRejected(tool_calls, reason, wait)
+            charges.append((limiter, key, tokens))
+        return charges
+
+    @staticmethod
+    async def refund(charges: list) -> None:
+        for limiter, key, tokens in charges:
+            await limiter.refund(key, tokens)
+
+    @asynccontextmanager
+    async def admit(self, request: VapiRequest) -> AsyncIterator[None]:
+        """Serve a tool call request, or raise ``ToolCallsRejected``.
+
+        Over-limit requests are rejected before they touch the
+        database; the others hold a concurrency slot until the block
+        exits. Requests that time out waiting for a slot get their
+        tokens back, so a retry is not charged twice.
+        """
+        tool_calls = request.message.toolCalls
+        charges = await self.check_rates(tool_calls)
+
+        if self.gate is None:
+            yield
+            return
+        if not await self.gate.acquire():
+            await self.refund(charges)
+            raise ToolCallsRejected(tool_calls, "busy", self.gate.timeout)
+        try:
+            yield
+        finally:
+            self.gate.release()
+
+    def clear(self) -> None:
+        for limiter in (self.caller_limiter, self.worker_limiter):
+            if isinstance(limiter, TokenBucketLimiter):
+                limiter.clear()
+
+
+admission = AdmissionController(
+    caller_limiter=make_caller_limiter(),
+    worker_limiter=(
+        TokenBucketLimiter(
+            rate=settings.WORKER_RATE_LIMIT,
+            burst=settings.WORKER_RATE_BURST,
+        )
+        if settings.WORKER_RATE_LIMIT
+        else None
+    ),
+    gate=(
+        ConcurrencyGate(
+            settings.MAX_CONCURRENT_TOOL_REQUESTS,
+            timeout=settings.ADMISSION_WAIT_TIMEOUT,
+        )
+        if settings.MAX_CONCURRENT_TOOL_REQUESTS
+        else None
+    ),
+)
+
+
+async def tool_calls_rejected_handler(
+    request: Request, exc: ToolCallsRejected
+) -> ORJSONResponse:
+    """Answer rejected tool calls the way Vapi expects results.
+
+    Sent with status 200 so the assistant relays the message to the
+    caller instead of treating the request as failed and retrying it.
+    """
+    TOOL_CALLS_REJECTED.labels(exc.reason).inc()
+    return ORJSONResponse(
+        {
+            "results": [
+                {"toolCallId": tool_call.id, "error": TRY_AGAIN}
+                for tool_call in exc.tool_calls
+            ]
+        },
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
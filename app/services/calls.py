@@ -0,0 +1,156 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.calls import Call
+from app.schemas.vapi_schema import EndOfCallReport, StatusUpdate
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class CallService:
+    """Persist Vapi call reports and serve them back."""
+
+    @staticmethod
+    async def _upsert(db: AsyncSession, call_id: str, **fields) -> Call:
+        call = await db.get(Call, call_id)
+        if call is None:
+            call = Call(id=call_id)
+            db.add(call)
+        for name, value in fields.items():
+            # Later messages only fill in what they know about.
+            if value is not None:
+                setattr(call, name, value)
+        return call
+
+    @classmethod
+    async def record_status_update(
+        cls, db: AsyncSession, message: StatusUpdate
+    ) -> Call:
+        """Store a ``status-update`` server message.
+
+        Args:
+            db: Database session.
+            message: Status update sent by Vapi.
+
+        Returns:
+            Call: The stored call.
+        """
+        call = await cls._upsert(
+            db,
+            message.call.id,
+            type=message.call.type,
+            status=message.status,
+            assistant_id=message.call.assistantId,
+            created_at=message.call.createdAt,
+            updated_at=message.call.updatedAt,
+            started_at=message.call.startedAt,
+            ended_at=message.call.endedAt,
+            ended_reason=message.endedReason,
+        )
+        await db.commit()
+        return call
+
+    @classmethod
+    async def record_end_of_call(
+        cls, db: AsyncSession, message: EndOfCallReport
+    ) -> Call:
+        """Store an ``end-of-call-report`` server message.
+
+        Args:
+            db: Database session.
+            message: End of call report sent by Vapi.
+
+        Returns:
+            Call: The stored call.
+        """
+        call = await cls._upsert(
+            db,
+            message.call.id,
+            type=message.call.type,
+            status="ended",
+            assistant_id=message.call.assistantId,
+            created_at=message.call.createdAt,
+            updated_at=message.call.updatedAt,
+            started_at=message.startedAt or message.call.startedAt,
+            ended_at=message.endedAt or message.call.endedAt,
+            ended_reason=message.endedReason,
+            transcript=message.transcript,
+            analysis=message.analysis,
+            details_at=datetime.now(timezone.utc),
+        )
+        await db.commit()
+        return call
+
+    @classmethod
+    async def record_call_details(
+        cls, db: AsyncSession, data: dict
+    ) -> Call:
+        """Store call details fetched from the Vapi API.
+
+        Args:
+            db: Database session.
+            data: Details as returned by ``VapiHandler.get_call_details``.
+
+        Returns:
+            Call: The stored call.
+        """
+        parse = _parse_datetime
+        call = await cls._upsert(
+            db,
+            data["id"],
+            type=data.get("type"),
+            status=data.get("status"),
+            assistant_id=data.get("assistantId"),
+            created_at=parse(data.get("createdAt")),
+            updated_at=parse(data.get("updatedAt")),
+            started_at=parse(data.get("startedAt")),
+            ended_at=parse(data.get("endedAt")),
+            transcript=data.get("transcript"),
+            analysis=data.get("analysis"),
+            details_at=datetime.now(timezone.utc),
+        )
+        await db.commit()
+        return call
+
+    @classmethod
+    async def get_call_details(
+        cls, db: AsyncSession, call_id: str
+    ) -> dict | None:
+        """Return the stored details of an ended call.
+
+        A status update saying the call ended is not enough: details are
+        only served once the end-of-call report or polled details have
+        been stored.
+
+        Args:
+            db: Database session.
+            call_id: Vapi call id.
+
+        Returns:
+            dict | None: Same shape as ``VapiHandler.get_call_details``
+            data, or None if the call's details have not been stored.
+        """
+        call = await db.get(Call, call_id)
+        if call is None or call.details_at is None:
+            return None
+        return {
+            "id": call.id,
+            "createdAt": _isoformat(call.created_at),
+            "updatedAt": _isoformat(call.updated_at),
+            "type": call.type,
+            "status": call.status,
+            "startedAt": _isoformat(call.started_at),
+            "endedAt": _isoformat(call.ended_at),
+            "analysis": call.analysis,
+            "transcript": call.transcript,
+            "assistantId": call.assistant_id,
+        }
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.utils.exceptions import AppException
+
+logger = logging.getLogger("coalescer")
+
+WriteHandler = Callable[[AsyncSession, Any], Awaitable[Any]]
+CommitHook = Callable[[AsyncSession], Awaitable[None]]
+
+
+class WriteCoalescer:
+    """Group concurrent writes into a single transaction.
+
+    Calls to ``submit`` arriving within ``window`` seconds of the first
+    pending one (or until ``max_batch`` are pending) are applied with
+    ``handler`` on one session and committed once. Each caller gets its
+    own result: validation errors raised by the handler only fail that
+    caller, and if the shared commit fails the batch is retried one
+    write per transaction so a single bad write cannot fail the others.
+    ``after_commit`` runs on the session once each transaction commits.
+    """
+
+    def __init__(
+        self,
+        handler: WriteHandler,
+        session_factory: async_sessionmaker[AsyncSession],
+        window: float,
+        max_batch: int = 100,
+        after_commit: CommitHook | None = None,
+    ):
+        self.handler = handler
+        self.after_commit = after_commit
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, args: Any) -> Any:
+        """Queue a write and wait for the transaction that applies it."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: list[tuple[Any, asyncio.Future]]):
+        outcomes = []
+        committed = False
+        try:
+            async with self.session_factory() as db:
+                for args, _ in batch:
+                    try:
+                        outcomes.append(
+                            (True, await self.handler(db, args))
+                        )
+                    except (HTTPException, AppException) as e:
+                        outcomes.append((False, e))
+                await db.commit()
+                committed = True
+                if self.after_commit is not None:
+                    await self.after_commit(db)
+        except Exception as e:
+            if committed:
+                # The writes are durable; only the hook failed.
+                logger.exception("after_commit hook failed")
+            elif len(batch) == 1:
+                outcomes = [(False, e)]
+            else:
+                logger.warning(
+                    "Coalesced batch of %d failed, retrying one by one",
+                    len(batch),
+                )
+                for item in batch:
+                    await self._flush([item])
+                return
+
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
@@ -0,0 +1,115 @@
+import logging
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.vapi_schema import ToolCall, VapiRequest
+from app.services.idempotency import tool_call_results
+from app.services.schedule import ScheduleService
+from app.services.todo_cache import todo_list_cache
+from app.services.users import UserService
+from app.utils.exceptions import AppException
+from app.utils.metrics import TOOL_CALL_ERRORS, record_tool_call
+
+logger = logging.getLogger("dispatcher")
+
+ToolHandler = Callable[[AsyncSession, BaseModel], Awaitable[Any]]
+
+
+class ToolDispatcher:
+    """Execute every tool call of a Vapi request in one transaction.
+
+    Handlers are looked up by function name and receive the shared
+    session plus the validated argument model. They must only flush; the
+    dispatcher commits once after the whole batch has run. Handlers
+    validate their input before writing, so a failing call reports an
+    error for its own ``toolCallId`` without affecting the others.
+    Handlers registered as ``idempotent`` run once per ``toolCallId``
+    (see ``ToolCallResultStore``).
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, ToolHandler] = {}
+        self._idempotent: set[str] = set()
+
+    def register(
+        self, name: str, handler: ToolHandler, idempotent: bool = False
+    ) -> None:
+        self._handlers[name] = handler
+        if idempotent:
+            self._idempotent.add(name)
+
+    @property
+    def tool_names(self) -> list[str]:
+        return list(self._handlers)
+
+    async def _run(self, db: AsyncSession, tool_call: ToolCall) -> dict:
+        name = tool_call.function.name
+        handler = self._handlers.get(name)
+        if handler is None:
+            return {
+                "toolCallId": tool_call.id,
+                "error": f"Unknown function: {name}",
+            }
+
+        record_tool_call(name)
+        try:
+            if name in self._idempotent:
+                result = await tool_call_results.run(
+                    db, tool_call, handler
+                )
+            else:
+                result = await handler(db, tool_call.function.arguments)
+        except HTTPException as e:
+            TOOL_CALL_ERRORS.labels(name, str(e.status_code)).inc()
+            return {"toolCallId": tool_call.id, "error": e.detail}
+        except AppException as e:
+            TOOL_CALL_ERRORS.labels(name, "400").inc()
+            return {"toolCallId": tool_call.id, "error": str(e)}
+
+        return {"toolCallId": tool_call.id, "result": result}
+
+    async def dispatch(self, db: AsyncSession, data: VapiRequest) -> dict:
+        """Run all tool calls and return one result per ``toolCallId``.
+
+        Args:
+            db: Database session.
+            data: request data.
+
+        Returns:
+            dict.
+        """
+        try:
+            results = [
+                await self._run(db, tool_call)
+                for tool_call in data.message.toolCalls
+            ]
+            await db.commit()
+        except Exception:
+            logger.exception("Tool call batch failed")
+            await db.rollback()
+            raise
+        await todo_list_cache.publish(db)
+
+        return {"results": results}
+
+
+tool_dispatcher = ToolDispatcher()
+tool_dispatcher.register(
+    "createUser", UserService.handle_create_user, idempotent=True
+)
+tool_dispatcher.register(
+    "createTodo", ScheduleService.handle_create_todo, idempotent=True
+)
+tool_dispatcher.register("getTodos", ScheduleService.handle_get_todos)
+tool_dispatcher.register(
+    "getTodoSummary", ScheduleService.handle_get_todo_summary
+)
+tool_dispatcher.register(
+    "completeTodo", ScheduleService.handle_complete_todo, idempotent=True
+)
+tool_dispatcher.register(
+    "deleteTodo", ScheduleService.handle_delete_todo, idempotent=True
+)
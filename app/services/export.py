@@ -0,0 +1,79 @@
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.database.models.schedule import Todo
+from app.database.models.users import User
+
+
+class ExportService:
+    """Stream users and their todos without materializing them."""
+
+    @staticmethod
+    def _line(record: dict) -> bytes:
+        return json.dumps(record).encode() + b"\n"
+
+    @classmethod
+    async def stream_users_ndjson(
+        cls,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield one NDJSON line per user with its todos embedded.
+
+        Rows come from a single server-side cursor over users outer
+        joined to todos in ``(user id, todo id)`` order, fetched
+        ``batch_size`` at a time, so memory stays bounded by one batch
+        plus the todos of the current user.
+
+        Args:
+            session_factory: Factory for the session owned by the stream.
+            batch_size: Rows per fetch; defaults to EXPORT_BATCH_SIZE.
+
+        Yields:
+            bytes: A JSON encoded user followed by a newline.
+        """
+        query = (
+            select(
+                User.id,
+                User.name,
+                User.phone_number,
+                Todo.id.label("todo_id"),
+                Todo.title,
+                Todo.description,
+                Todo.completed,
+            )
+            .outerjoin(Todo, Todo.owner_id == User.id)
+            .order_by(User.id, Todo.id)
+            .execution_options(
+                yield_per=batch_size or settings.EXPORT_BATCH_SIZE
+            )
+        )
+
+        async with session_factory() as db:
+            result = await db.stream(query)
+            user = None
+            async for row in result:
+                if user is None or user["id"] != row.id:
+                    if user is not None:
+                        yield cls._line(user)
+                    user = {
+                        "id": row.id,
+                        "name": row.name,
+                        "phone_number": row.phone_number,
+                        "todos": [],
+                    }
+                if row.todo_id is not None:
+                    user["todos"].append(
+                        {
+                            "id": row.todo_id,
+                            "title": row.title,
+                            "description": row.description,
+                            "completed": row.completed,
+                        }
+                    )
+            if user is not None:
+                yield cls._line(user)
@@ -0,0 +1,106 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.models.tool_calls import ToolCallResult
+from app.schemas.vapi_schema import ToolCall
+from app.utils.metrics import TOOL_CALL_REPLAYS
+
+ToolHandler = Callable[[AsyncSession, BaseModel], Awaitable[Any]]
+
+
+class ToolCallResultStore:
+    """Replay write tool calls that Vapi retries.
+
+    The result of a successful call is stored under its ``toolCallId``
+    in the same transaction as the write it reports, so a retry of a
+    committed call is answered from the store without touching the
+    user/todo tables, and a retry of a call whose transaction failed
+    runs again. A retry racing the original fails on the primary key
+    instead of writing twice. Errors are not stored: the call wrote
+    nothing and may succeed next time.
+
+    Results are replayed for ``retention`` seconds; expired rows are
+    deleted at most every ``purge_interval`` seconds by the next write.
+    """
+
+    def __init__(
+        self, retention: float = 3600, purge_interval: float = 60
+    ):
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(
+            seconds=self.retention
+        )
+
+    async def get(self, db: AsyncSession, tool_call_id: str):
+        """Return the stored row (``result``, ``fresh``) or None."""
+        rows = await db.execute(
+            select(
+                ToolCallResult.result,
+                (ToolCallResult.created_at >= self._cutoff()).label(
+                    "fresh"
+                ),
+            ).where(ToolCallResult.id == tool_call_id)
+        )
+        return rows.first()
+
+    async def purge(self, db: AsyncSession) -> None:
+        """Delete results older than the retention window."""
+        await db.execute(
+            delete(ToolCallResult).where(
+                ToolCallResult.created_at < self._cutoff()
+            )
+        )
+
+    async def run(
+        self, db: AsyncSession, tool_call: ToolCall, handler: ToolHandler
+    ) -> Any:
+        """Run ``handler`` for a tool call once per ``toolCallId``.
+
+        Like the handlers it wraps, this only flushes; the caller
+        commits.
+
+        Args:
+            db: Database session.
+            tool_call: Tool call to run.
+            handler: ``handle_*`` method for the tool call's function.
+
+        Returns:
+            Any: The handler's result, or the stored one for a retry.
+        """
+        name = tool_call.function.name
+        stored = await self.get(db, tool_call.id)
+        if stored is not None and stored.fresh:
+            TOOL_CALL_REPLAYS.labels(name).inc()
+            return stored.result
+
+        result = await handler(db, tool_call.function.arguments)
+
+        if stored is not None or time.monotonic() >= self._next_purge:
+            self._next_purge = time.monotonic() + self.purge_interval
+            await self.purge(db)
+        db.add(
+            ToolCallResult(
+                id=tool_call.id,
+                name=name,
+                result=result,
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        await db.flush()
+        return result
+
+
+tool_call_results = ToolCallResultStore(
+    retention=settings.TOOL_CALL_RETENTION_SECONDS,
+    purge_interval=settings.TOOL_CALL_PURGE_INTERVAL,
+)
@@ -0,0 +1,220 @@
+import csv
+import io
+import json
+import logging
+from typing import Iterable, Iterator
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.models.schedule import Todo
+from app.database.models.users import User
+from app.services.summaries import TodoSummaryService
+from app.services.todo_cache import todo_list_cache
+from app.services.users import UserService
+
+logger = logging.getLogger("imports")
+
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# Reported for every row of a chunk whose transaction failed; the
+# database error itself is logged once per chunk.
+CHUNK_FAILED = "Database error, row not imported"
+
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"", "0", "false", "no", "n"}
+
+
+class ImportRowError(ValueError):
+    """Raised for a row that cannot be imported."""
+
+
+def _parse_rows(body: str, import_format: str) -> Iterator[dict]:
+    if import_format == "csv":
+        yield from csv.DictReader(io.StringIO(body))
+        return
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"__error__": f"Invalid JSON: {e.msg}"}
+            continue
+        if not isinstance(row, dict):
+            yield {"__error__": "Expected a JSON object"}
+            continue
+        yield row
+
+
+def _clean_row(row: dict) -> dict:
+    if "__error__" in row:
+        raise ImportRowError(row["__error__"])
+
+    phone_number = str(row.get("phone_number") or "").strip()
+    title = str(row.get("title") or "").strip()
+    if not phone_number:
+        raise ImportRowError("Missing phone_number")
+    if not title:
+        raise ImportRowError("Missing title")
+
+    completed = row.get("completed")
+    if not isinstance(completed, bool):
+        value = str(completed if completed is not None else "").lower()
+        if value.strip() in TRUE_VALUES:
+            completed = True
+        elif value.strip() in FALSE_VALUES:
+            completed = False
+        else:
+            raise ImportRowError(f"Invalid completed value: {completed}")
+
+    return {
+        "phone_number": phone_number,
+        "name": str(row.get("name") or "").strip(),
+        "title": title,
+        "description": row.get("description") or None,
+        "completed": completed,
+    }
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ImportService:
+    """Bulk import of todos, creating their owners as needed."""
+
+    @staticmethod
+    async def _resolve_users(db: AsyncSession, rows: list[dict]) -> dict:
+        """Map every phone number in ``rows`` to a user id.
+
+        Existing users are fetched with one query; the missing ones are
+        inserted with one batched statement.
+        """
+        names = {}
+        for row in rows:
+            names.setdefault(row["phone_number"], row["name"])
+
+        user_ids = dict(
+            (
+                await db.execute(
+                    select(User.phone_number, User.id).where(
+                        User.phone_number.in_(names)
+                    )
+                )
+            ).all()
+        )
+
+        missing = [
+            {"phone_number": phone_number, "name": name}
+            for phone_number, name in names.items()
+            if phone_number not in user_ids
+        ]
+        if missing:
+            created = await db.execute(
+                insert(User).returning(User.phone_number, User.id), missing
+            )
+            for phone_number, user_id in created.all():
+                user_ids[phone_number] = user_id
+                UserService.remember_user_id(db, phone_number, user_id)
+        return user_ids
+
+    @classmethod
+    async def import_todos(
+        cls,
+        db: AsyncSession,
+        body: str,
+        import_format: str,
+        chunk_size: int | None = None,
+    ) -> dict:
+        """Import todos from CSV or NDJSON.
+
+        Each row carries ``phone_number``, ``name``, ``title``,
+        ``description`` and ``completed``. Valid rows are inserted in
+        chunks of ``chunk_size``, each chunk in its own transaction with
+        one batched insert for users and one for todos, plus one update
+        of the todo counters per user in the chunk. Invalid rows,
+        and every row of a chunk whose transaction fails, are reported
+        by their 1-based row number.
+
+        Args:
+            db: Database session.
+            body: Decoded request body.
+            import_format: ``csv`` or ``ndjson``.
+            chunk_size: Rows per transaction; defaults to
+                IMPORT_CHUNK_SIZE.
+
+        Returns:
+            dict: Counts of imported and failed rows plus the errors.
+        """
+        errors = []
+        imported = 0
+
+        def valid_rows() -> Iterator[tuple[int, dict]]:
+            for number, row in enumerate(
+                _parse_rows(body, import_format), start=1
+            ):
+                try:
+                    yield number, _clean_row(row)
+                except ImportRowError as e:
+                    errors.append({"row": number, "error": str(e)})
+
+        for chunk in _chunks(
+            valid_rows(), chunk_size or settings.IMPORT_CHUNK_SIZE
+        ):
+            rows = [row for _, row in chunk]
+            try:
+                user_ids = await cls._resolve_users(db, rows)
+                created = await db.execute(
+                    insert(Todo).returning(
+                        Todo.id, Todo.owner_id, Todo.title, Todo.completed
+                    ),
+                    [
+                        {
+                            "owner_id": user_ids[row["phone_number"]],
+                            "title": row["title"],
+                            "description": row["description"],
+                            "completed": row["completed"],
+                        }
+                        for row in rows
+                    ],
+                )
+                await db.run_sync(
+                    TodoSummaryService.add_todos, created.all()
+                )
+                todo_list_cache.mark_changed(db, user_ids.values())
+                await db.commit()
+                await todo_list_cache.publish(db)
+            except SQLAlchemyError:
+                await db.rollback()
+                logger.exception(
+                    "Importing rows %d-%d failed",
+                    chunk[0][0],
+                    chunk[-1][0],
+                )
+                errors.extend(
+                    {"row": number, "error": CHUNK_FAILED}
+                    for number, _ in chunk
+                )
+                continue
+            imported += len(rows)
+
+        errors.sort(key=lambda error: error["row"])
+        return {
+            "imported": imported,
+            "failed": len(errors),
+            "errors": errors,
+        }
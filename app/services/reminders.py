@@ -0,0 +1,280 @@
+"""Outbound reminder calls for todos with a ``remind_at`` time.
+
+Each worker runs a ``ReminderScheduler``. Every ``poll_interval`` it
+loads the reminders due within ``horizon`` seconds with a range scan of
+``ix_todos_remind_at`` into an in-memory heap, then sleeps until the
+earliest one is due, so the database is never scanned per tick and
+reminders fire on time between polls.
+
+Due reminders are claimed in batches by a conditional UPDATE that
+clears ``remind_at`` and commits before anything is dialled. Only the
+scheduler whose UPDATE matched a todo calls it, so several workers, or
+a worker restarted mid-batch, never dial the same reminder twice. The
+trade-off is at-most-once delivery: a worker dying between the claim
+and the call drops that reminder. Calls Vapi certainly did not place
+(error responses, connection failures) are rescheduled up to
+``max_attempts`` times; ambiguous failures such as read timeouts are
+not retried.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.database.models.schedule import Todo
+from app.database.models.users import User
+from app.utils.vapi import VapiHandler
+
+logger = logging.getLogger("reminders")
+
+# Failures after which Vapi has certainly not placed the call.
+NOT_PLACED_ERRORS = (httpx.HTTPStatusError, httpx.ConnectError)
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; stored values are always UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ReminderScheduler:
+    """Dial the owners of todos whose reminder is due.
+
+    Args:
+        session_factory: Sessions on the primary database.
+        vapi: Client used to place the calls.
+        poll_interval: Seconds between due-time queries.
+        horizon: Seconds ahead loaded by each query.
+        load_limit: Upcoming reminders kept in the heap.
+        batch_size: Due reminders claimed per transaction.
+        concurrency: Calls being placed at once.
+        max_attempts: Tries for a call Vapi refused to place.
+        retry_delay: Seconds before such a call is retried.
+        clock: Current UTC time.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        vapi: VapiHandler,
+        poll_interval: float = 5,
+        horizon: float = 60,
+        load_limit: int = 10_000,
+        batch_size: int = 100,
+        concurrency: int = 10,
+        max_attempts: int = 3,
+        retry_delay: float = 60,
+        clock: Callable[[], datetime] = utcnow,
+    ):
+        self.session_factory = session_factory
+        self.vapi = vapi
+        self.poll_interval = poll_interval
+        self.horizon = timedelta(seconds=horizon)
+        self.load_limit = load_limit
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = timedelta(seconds=retry_delay)
+        self.clock = clock
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # (remind_at, todo id); ``_scheduled`` holds the live entry per
+        # todo so that entries for rescheduled todos are skipped.
+        self._heap: list[tuple[datetime, int]] = []
+        self._scheduled: dict[int, datetime] = {}
+        self._next_poll = 0.0
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    async def load(self) -> None:
+        """Add the reminders due within the horizon to the heap."""
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(Todo.id, Todo.remind_at)
+                .where(Todo.remind_at <= self.clock() + self.horizon)
+                .order_by(Todo.remind_at)
+                .limit(self.load_limit)
+            )
+            for todo_id, remind_at in rows:
+                remind_at = _utc(remind_at)
+                if self._scheduled.get(todo_id) != remind_at:
+                    self._scheduled[todo_id] = remind_at
+                    heapq.heappush(self._heap, (remind_at, todo_id))
+
+    def _pop_due(self, now: datetime) -> list[int]:
+        due = []
+        while (
+            self._heap
+            and self._heap[0][0] <= now
+            and len(due) < self.batch_size
+        ):
+            remind_at, todo_id = heapq.heappop(self._heap)
+            if self._scheduled.get(todo_id) == remind_at:
+                del self._scheduled[todo_id]
+                due.append(todo_id)
+        return due
+
+    async def claim(self, todo_ids: list[int], now: datetime) -> list:
+        """Take ownership of due reminders and return what to dial.
+
+        Todos completed, rescheduled or claimed by another worker since
+        they were loaded are left out.
+        """
+        async with self.session_factory() as db:
+            claimed = await db.scalars(
+                update(Todo)
+                .where(
+                    Todo.id.in_(todo_ids),
+                    Todo.remind_at <= now,
+                    Todo.completed.is_not(True),
+                )
+                .values(
+                    remind_at=None,
+                    reminded_at=now,
+                    reminder_attempts=Todo.reminder_attempts + 1,
+                )
+                .returning(Todo.id)
+                .execution_options(synchronize_session=False)
+            )
+            claimed_ids = list(claimed)
+            reminders = []
+            if claimed_ids:
+                rows = await db.execute(
+                    select(
+                        Todo.id,
+                        Todo.title,
+                        Todo.due_at,
+                        Todo.reminder_attempts,
+                        User.phone_number,
+                        User.name,
+                    )
+                    .join(User, Todo.owner_id == User.id)
+                    .where(Todo.id.in_(claimed_ids))
+                )
+                reminders = rows.all()
+            await db.commit()
+        return reminders
+
+    async def _dial(self, reminder) -> tuple[int, dict]:
+        """Place one call; return the columns to update afterwards."""
+        variables = {"todo": reminder.title}
+        if reminder.due_at is not None:
+            variables["due_at"] = _utc(reminder.due_at).isoformat()
+        async with self._semaphore:
+            try:
+                call = await self.vapi.create_call(
+                    reminder.phone_number,
+                    customer_name=reminder.name,
+                    variables=variables,
+                )
+            except NOT_PLACED_ERRORS as e:
+                logger.warning(
+                    "Reminder call for todo %s not placed: %s",
+                    reminder.id,
+                    e,
+                )
+                if reminder.reminder_attempts < self.max_attempts:
+                    return reminder.id, {
+                        "remind_at": self.clock() + self.retry_delay
+                    }
+                return reminder.id, {}
+            except httpx.HTTPError as e:
+                logger.error(
+                    "Reminder call for todo %s may not have been placed, "
+                    "not retrying: %s",
+                    reminder.id,
+                    e,
+                )
+                return reminder.id, {}
+        return reminder.id, {"reminder_call_id": call.get("id")}
+
+    async def dispatch(self, todo_ids: list[int], now: datetime) -> int:
+        """Claim and dial a batch of due reminders.
+
+        Returns:
+            int: Number of calls placed.
+        """
+        reminders = await self.claim(todo_ids, now)
+        outcomes = await asyncio.gather(*map(self._dial, reminders))
+
+        async with self.session_factory() as db:
+            for todo_id, values in outcomes:
+                if values:
+                    await db.execute(
+                        update(Todo)
+                        .where(Todo.id == todo_id)
+                        .values(**values)
+                        .execution_options(synchronize_session=False)
+                    )
+            await db.commit()
+        return sum("reminder_call_id" in values for _, values in outcomes)
+
+    async def run_once(self) -> int:
+        """Refresh the heap if a poll is due and dial due reminders."""
+        if time.monotonic() >= self._next_poll:
+            self._next_poll = time.monotonic() + self.poll_interval
+            await self.load()
+
+        placed = 0
+        now = self.clock()
+        while due := self._pop_due(now):
+            placed += await self.dispatch(due, now)
+        return placed
+
+    def _seconds_to_next_event(self) -> float:
+        wait = self._next_poll - time.monotonic()
+        if self._heap:
+            due_in = (self._heap[0][0] - self.clock()).total_seconds()
+            wait = min(wait, due_in)
+        return max(0.0, wait)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Reminder tick failed")
+            await asyncio.sleep(self._seconds_to_next_event())
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def make_scheduler(
+    session_factory: async_sessionmaker[AsyncSession], vapi: VapiHandler
+) -> ReminderScheduler:
+    """Build a scheduler configured by the REMINDER_* settings."""
+    return ReminderScheduler(
+        session_factory,
+        vapi,
+        poll_interval=settings.REMINDER_POLL_INTERVAL,
+        horizon=settings.REMINDER_HORIZON,
+        load_limit=settings.REMINDER_LOAD_LIMIT,
+        batch_size=settings.REMINDER_BATCH_SIZE,
+        concurrency=settings.REMINDER_CONCURRENCY,
+        max_attempts=settings.REMINDER_MAX_ATTEMPTS,
+        retry_delay=settings.REMINDER_RETRY_DELAY,
+    )
@@ -1,217 +1,358 @@
-import json
-
+import orjson
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.config import settings
 from app.database.models.schedule import Todo
 from app.database.models.users import User
-from app.schemas.schedule import TodoResponse
-from app.schemas.vapi_schema import VapiRequest
+from app.schemas.schedule import TODO_LIST_ADAPTER
+from app.schemas.vapi_schema import (
+    CompleteTodoArguments,
+    CreateTodoArguments,
+    DeleteTodoArguments,
+    GetTodosArguments,
+    GetTodoSummaryArguments,
+    ToolCall,
+    VapiRequest,
+)
+from app.services.coalescer import WriteCoalescer
+from app.services.idempotency import tool_call_results
+from app.services.search import TodoSearch
+from app.services.summaries import TodoSummaryService
+from app.services.todo_cache import todo_list_cache
+from app.services.users import UserService
+from app.utils.metrics import record_tool_call
+
+TODO_ORDER_COLUMNS = {"id": Todo.id, "title": Todo.title}
+
+# One createTodo coalescer per session factory (i.e. per database).
+_create_todo_coalescers: dict[async_sessionmaker, WriteCoalescer] = {}
 
 
 class ScheduleService:
-    """Service handling authentication-related operations."""
+    """Service handling todo-related tool calls.
+
+    The ``handle_*`` methods execute a single tool call against an open
+    session without committing, so several of them can share one
+    transaction (see ``app.services.dispatcher``). The remaining methods
+    serve the single-purpose routes and commit on their own.
+    """
+
+    @staticmethod
+    def _get_tool_call(data: VapiRequest, name: str) -> ToolCall:
+        tool_call = data.find_tool_call(name)
+        if tool_call is None:
+            raise HTTPException(status_code=400, detail="Invalid Request")
+        record_tool_call(name)
+        return tool_call
 
     @classmethod
-    async def create_todo(cls, db: Session, data: VapiRequest) -> dict:
-        """Create a new todo.
+    def _get_create_todo_coalescer(
+        cls, session_factory: async_sessionmaker[AsyncSession] | None
+    ) -> WriteCoalescer | None:
+        window = settings.CREATE_TODO_COALESCE_WINDOW_MS / 1000
+        if not window or session_factory is None:
+            return None
+        coalescer = _create_todo_coalescers.get(session_factory)
+        if coalescer is None:
+            coalescer = _create_todo_coalescers[session_factory] = (
+                WriteCoalescer(
+                    cls._run_create_todo,
+                    session_factory,
+                    window=window,
+                    max_batch=settings.CREATE_TODO_COALESCE_MAX_BATCH,
+                    after_commit=todo_list_cache.publish,
+                )
+            )
+        return coalescer
+
+    @classmethod
+    async def _run_create_todo(
+        cls, db: AsyncSession, tool_call: ToolCall
+    ) -> str:
+        return await tool_call_results.run(
+            db, tool_call, cls.handle_create_todo
+        )
+
+    @staticmethod
+    async def _get_user_id(db: AsyncSession, args) -> int | None:
+        return await UserService.get_user_id(db, args.phone_number)
+
+    @staticmethod
+    async def _find_todo(
+        db: AsyncSession, user_id: int, title: str
+    ) -> Todo | None:
+        return await TodoSearch.best_match(db, user_id, title)
+
+    @staticmethod
+    def _todo_list_query(user_id: int, args: GetTodosArguments) -> Select:
+        query = select(
+            Todo.id,
+            Todo.title,
+            func.nullif(Todo.description, "").label("description"),
+            Todo.completed,
+            Todo.due_at,
+        ).where(Todo.owner_id == user_id)
+
+        if args.completed is not None:
+            query = query.where(Todo.completed.is_(args.completed))
+
+        order_by = TODO_ORDER_COLUMNS[args.order_by or "id"]
+        if args.order == "desc":
+            query = query.order_by(order_by.desc(), Todo.id.desc())
+        else:
+            query = query.order_by(order_by, Todo.id)
+
+        # Without a limit the whole list is returned: a silently cut
+        # list would have the assistant tell callers that is all.
+        if args.limit is not None:
+            query = query.limit(
+                min(args.limit, settings.GET_TODOS_MAX_LIMIT)
+            )
+        return query
+
+    @classmethod
+    async def handle_create_todo(
+        cls, db: AsyncSession, args: CreateTodoArguments
+    ) -> str:
+        """Create a todo, registering the caller if needed.
 
         Args:
             db: Database session.
-            data: request data.
+            args: createTodo tool call arguments.
 
         Returns:
-            dict.
+            str: Tool call result.
         """
-        for tool_call in data.message.toolCalls:
-            if tool_call.function.name == "createTodo":
-                args = tool_call.function.arguments
-                break
-        else:
-            raise HTTPException(status_code=400, detail="Invalid Request")
+        user_id = await cls._get_user_id(db, args)
 
-        if isinstance(args, str):
-            args = json.loads(args)
+        if user_id is None:
+            user = User(name=args.name, phone_number=args.phone_number)
+            db.add(user)
+            await db.flush()
+            UserService.remember_user(db, user)
+            user_id = user.id
+
+        todo = Todo(
+            title=args.title,
+            description=args.description,
+            owner_id=user_id,
+            due_at=args.due_at,
+            remind_at=args.remind_at or args.due_at,
+        )
 
-        user = (
-            db.query(User)
-            .filter(
-                User.phone_number == args.get("phone_number", "").strip()
+        db.add(todo)
+        await db.flush()
+
+        return "success"
+
+    @classmethod
+    async def handle_get_todos(
+        cls, db: AsyncSession, args: GetTodosArguments
+    ) -> orjson.Fragment:
+        """List the caller's todos.
+
+        Besides ``phone_number`` the call accepts ``completed`` to filter
+        by status, ``limit`` (capped at ``GET_TODOS_MAX_LIMIT``; all
+        todos are listed without one) and
+        ``order_by`` (``id`` or ``title``) with ``order`` (``asc`` or
+        ``desc``); all of them are applied in SQL. Results are cached
+        per user until one of the user's todos changes; a transaction
+        that already changed them reads its own writes from the database.
+        Lists read from a replica are served but never cached.
+
+        Args:
+            db: Database session.
+            args: getTodos tool call arguments.
+
+        Returns:
+            orjson.Fragment: The todos, already serialized to JSON.
+        """
+        user_id = await cls._get_user_id(db, args)
+
+        if user_id is None:
+            raise HTTPException(status_code=400, detail="User not found")
+
+        version = None
+        if user_id not in db.info.get("changed_todo_owners", ()):
+            version, cached = await todo_list_cache.get(user_id, args)
+            if cached is not None:
+                return orjson.Fragment(cached)
+
+        rows = await db.execute(cls._todo_list_query(user_id, args))
+        todos = TODO_LIST_ADAPTER.dump_json(
+            TODO_LIST_ADAPTER.validate_python(
+                rows.all(), from_attributes=True
             )
-            .first()
         )
 
-        if not user:
-            name = args.get("name", "")
-            phone_number = args.get("phone_number", "")
-            user = User(name=name, phone_number=phone_number)
-            db.add(user)
-            db.commit()
+        if not db.info.get("replica"):
+            await todo_list_cache.set(user_id, version, args, todos)
+        return orjson.Fragment(todos)
 
-        title = args.get("title", "")
-        description = args.get("description", "")
+    @classmethod
+    async def handle_get_todo_summary(
+        cls, db: AsyncSession, args: GetTodoSummaryArguments
+    ) -> dict:
+        """Count the caller's todos without listing them.
 
-        todo = Todo(title=title, description=description, owner_id=user.id)
+        Args:
+            db: Database session.
+            args: getTodoSummary tool call arguments.
 
-        db.add(todo)
-        db.commit()
+        Returns:
+            dict: Total, completed and pending counts and the title of
+            the most recently added todo.
+        """
+        user_id = await cls._get_user_id(db, args)
 
-        return {
-            "results": [{"toolCallId": tool_call.id, "result": "success"}]
-        }
+        if user_id is None:
+            raise HTTPException(status_code=400, detail="User not found")
+
+        return await TodoSummaryService.get(db, user_id)
 
     @classmethod
-    async def get_todos(cls, db: Session, data: VapiRequest) -> dict:
-        for tool_call in data.message.toolCalls:
-            if tool_call.function.name == "getTodos":
-                args = (
-                    json.loads(tool_call.function.arguments)
-                    if isinstance(tool_call.function.arguments, str)
-                    else tool_call.function.arguments
-                )
+    async def handle_complete_todo(
+        cls, db: AsyncSession, args: CompleteTodoArguments
+    ) -> str:
+        """Mark the caller's todo matching the given title as completed.
 
-                user = (
-                    db.query(User)
-                    .filter(
-                        User.phone_number
-                        == args.get("phone_number", "").strip()
-                    )
-                    .first()
-                )
+        Args:
+            db: Database session.
+            args: completeTodo tool call arguments.
+
+        Returns:
+            str: Tool call result.
+        """
+        user_id = await cls._get_user_id(db, args)
+
+        if user_id is None:
+            raise HTTPException(status_code=400, detail="User not found")
 
-                if not user:
-                    raise HTTPException(
-                        status_code=400, detail="User not found"
-                    )
+        todo = await cls._find_todo(db, user_id, args.title)
 
-                todos = (
-                    db.query(Todo).filter(Todo.owner_id == user.id).all()
-                )
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+
+        todo.completed = True
+        todo.remind_at = None
+        await db.flush()
 
-                # Convert to Pydantic models
-                todo_responses = []
-                for todo in todos:
-                    todo_dict = {
-                        "id": todo.id,
-                        "title": todo.title,
-                        "description": (
-                            todo.description if todo.description else None
-                        ),
-                        "completed": todo.completed,
-                    }
-                    todo_responses.append(
-                        TodoResponse(**todo_dict).model_dump()
-                    )
-
-                return {
-                    "results": [
-                        {
-                            "toolCallId": tool_call.id,
-                            "result": todo_responses,
-                        }
-                    ]
-                }
+        return "success"
 
     @classmethod
-    async def complete_todo(cls, db: Session, data: VapiRequest):
-        for tool_call in data.message.toolCalls:
-            if tool_call.function.name == "completeTodo":
-
-                args = (
-                    json.loads(tool_call.function.arguments)
-                    if isinstance(tool_call.function.arguments, str)
-                    else tool_call.function.arguments
-                )
+    async def handle_delete_todo(
+        cls, db: AsyncSession, args: DeleteTodoArguments
+    ) -> str:
+        """Delete the caller's todo matching the given title.
 
-                user = (
-                    db.query(User)
-                    .filter(
-                        User.phone_number
-                        == args.get("phone_number", "").strip()
-                    )
-                    .first()
-                )
+        Args:
+            db: Database session.
+            args: deleteTodo tool call arguments.
 
-                if not user:
-                    raise HTTPException(
-                        status_code=400, detail="User not found"
-                    )
-
-                todo_title = args.get("title")
-                if not todo_title:
-                    raise HTTPException(
-                        status_code=400, detail="Missing To-Do title"
-                    )
-
-                todo = (
-                    db.query(Todo)
-                    .filter(
-                        Todo.title.ilike(f"%{todo_title.strip()}%"),
-                        Todo.owner_id == user.id,
-                    )
-                    .first()
-                )
+        Returns:
+            str: Tool call result.
+        """
+        user_id = await cls._get_user_id(db, args)
 
-                if not todo:
-                    raise HTTPException(
-                        status_code=404, detail="Todo not found"
-                    )
+        if user_id is None:
+            raise HTTPException(status_code=400, detail="User not found")
 
-                # Update and commit
-                todo.completed = True
-                db.commit()
-                db.refresh(todo)
+        todo = await cls._find_todo(db, user_id, args.title)
 
-                return {
-                    "results": [
-                        {"toolCallId": tool_call.id, "result": "success"}
-                    ]
-                }
-        raise HTTPException(status_code=400, detail="Invalid Request")
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+
+        await db.delete(todo)
+        await db.flush()
+
+        return "success"
 
     @classmethod
-    async def delete_todo(cls, db: Session, data: VapiRequest):
-        for tool_call in data.message.toolCalls:
-            if tool_call.function.name == "deleteTodo":
-                args = tool_call.function.arguments
-                break
-        else:
-            raise HTTPException(status_code=400, detail="Invalid Request")
+    async def create_todo(
+        cls,
+        db: AsyncSession,
+        data: VapiRequest,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> dict:
+        """Create a new todo.
 
-        if isinstance(args, str):
-            args = json.loads(args)
+        With CREATE_TODO_COALESCE_WINDOW_MS set and a session factory
+        given, the insert is handed to a ``WriteCoalescer`` so that
+        concurrent createTodo calls share one commit.
 
-        todo_title = args.get("title")
+        Args:
+            db: Database session.
+            data: request data.
+            session_factory: Factory for coalesced transactions.
 
-        user = (
-            db.query(User)
-            .filter(
-                User.phone_number == args.get("phone_number", "").strip()
-            )
-            .first()
+        Returns:
+            dict.
+        """
+        tool_call = cls._get_tool_call(data, "createTodo")
+        coalescer = cls._get_create_todo_coalescer(session_factory)
+        if coalescer is not None:
+            result = await coalescer.submit(tool_call)
+        else:
+            result = await cls._run_create_todo(db, tool_call)
+            await db.commit()
+            await todo_list_cache.publish(db)
+
+        return {
+            "results": [{"toolCallId": tool_call.id, "result": result}]
+        }
+
+    @classmethod
+    async def get_todos(cls, db: AsyncSession, data: VapiRequest) -> dict:
+        tool_call = cls._get_tool_call(data, "getTodos")
+        result = await cls.handle_get_todos(
+            db, tool_call.function.arguments
         )
 
-        if not user:
-            raise HTTPException(status_code=400, detail="User not found")
+        return {
+            "results": [{"toolCallId": tool_call.id, "result": result}]
+        }
 
-        if not todo_title:
-            raise HTTPException(status_code=400, detail="Missing To-Do ID")
+    @classmethod
+    async def get_todo_summary(
+        cls, db: AsyncSession, data: VapiRequest
+    ) -> dict:
+        tool_call = cls._get_tool_call(data, "getTodoSummary")
+        result = await cls.handle_get_todo_summary(
+            db, tool_call.function.arguments
+        )
 
-        todo = (
-            db.query(Todo)
-            .filter(
-                Todo.title.ilike(f"%{todo_title.strip()}%")
-                & (Todo.owner_id == user.id)
-            )
-            .first()
+        return {
+            "results": [{"toolCallId": tool_call.id, "result": result}]
+        }
+
+    @classmethod
+    async def complete_todo(
+        cls, db: AsyncSession, data: VapiRequest
+    ) -> dict:
+        tool_call = cls._get_tool_call(data, "completeTodo")
+        result = await tool_call_results.run(
+            db, tool_call, cls.handle_complete_todo
         )
+        await db.commit()
+        await todo_list_cache.publish(db)
 
-        if not todo:
-            raise HTTPException(status_code=404, detail="Todo not found")
+        return {
+            "results": [{"toolCallId": tool_call.id, "result": result}]
+        }
 
-        db.delete(todo)
-        db.commit()
+    @classmethod
+    async def delete_todo(
+        cls, db: AsyncSession, data: VapiRequest
+    ) -> dict:
+        tool_call = cls._get_tool_call(data, "deleteTodo")
+        result = await tool_call_results.run(
+            db, tool_call, cls.handle_delete_todo
+        )
+        await db.commit()
+        await todo_list_cache.publish(db)
 
         return {
-            "results": [{"toolCallId": tool_call.id, "result": "success"}]
+            "results": [{"toolCallId": tool_call.id, "result": result}]
         }
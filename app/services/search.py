@@ -0,0 +1,155 @@
+import re
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.models.schedule import Todo
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> set[str]:
+    """Return the pg_trgm style trigram set of a string.
+
+    Each alphanumeric word is lower-cased and padded with two leading
+    spaces and one trailing space before being split into trigrams.
+    """
+    result = set()
+    for word in _WORD.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(
+            padded[i : i + 3] for i in range(len(padded) - 2)  # noqa: E203
+        )
+    return result
+
+
+def _scores(
+    query_trigrams: set[str], title_trigrams: set[str]
+) -> tuple[float, float]:
+    """``(word_similarity, similarity)`` of two trigram sets."""
+    if not query_trigrams:
+        return 0.0, 0.0
+    common = len(query_trigrams & title_trigrams)
+    return (
+        common / len(query_trigrams),
+        common / len(query_trigrams | title_trigrams),
+    )
+
+
+def similarity(query: str, title: str) -> float:
+    """Share of trigrams common to both strings (pg_trgm similarity)."""
+    return _scores(trigrams(query), trigrams(title))[1]
+
+
+def word_similarity(query: str, title: str) -> float:
+    """Share of the query trigrams found in the title.
+
+    Mirrors pg_trgm ``word_similarity`` closely enough for ranking: a
+    spoken query that names only part of a longer title still scores
+    high, while unrelated titles score low.
+    """
+    return _scores(trigrams(query), trigrams(title))[0]
+
+
+class TodoSearch:
+    """Ranked best-match lookup of a user's todo by spoken title.
+
+    Postgres ranks with pg_trgm behind a GIN index. SQLite has no index
+    that is both trigram based and scoped by owner (an FTS5 table
+    matches and ranks every user's todos before the owner filter
+    applies), so the user's titles are read through
+    ``ix_todos_owner_id_title`` and ranked in Python: the cost follows
+    the length of one user's list, not the size of the table.
+    """
+
+    @classmethod
+    async def best_match(
+        cls,
+        db: AsyncSession,
+        user_id: int,
+        title: str,
+        threshold: float | None = None,
+    ) -> Todo | None:
+        """Return the user's todo whose title best matches ``title``.
+
+        Args:
+            db: Database session.
+            user_id: Owner of the todos to search.
+            title: Title as transcribed from the caller.
+            threshold: Minimum word similarity in ``[0, 1]``; defaults
+                to ``settings.TODO_TITLE_MATCH_THRESHOLD``.
+
+        Returns:
+            Todo | None: The best ranked todo above the threshold.
+        """
+        title = title.strip()
+        if threshold is None:
+            threshold = settings.TODO_TITLE_MATCH_THRESHOLD
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return await cls._best_match_postgres(
+                db, user_id, title, threshold
+            )
+
+        # Only the covering index is read; the winner is loaded by id.
+        candidates = await db.execute(
+            select(Todo.id, Todo.title).where(Todo.owner_id == user_id)
+        )
+        todo_id = cls._rank(candidates.all(), title, threshold)
+        if todo_id is None:
+            return None
+        return await db.get(Todo, todo_id)
+
+    @staticmethod
+    def _rank(
+        candidates: list[tuple[int, str]], title: str, threshold: float
+    ) -> int | None:
+        """Return the id of the best candidate above the threshold.
+
+        Ordered by ``word_similarity`` then ``similarity``, with the
+        query's trigrams computed once for all candidates.
+        """
+        query_trigrams = trigrams(title)
+        if not query_trigrams:
+            return None
+        scored = []
+        for todo_id, candidate_title in candidates:
+            word_score, score = _scores(
+                query_trigrams, trigrams(candidate_title or "")
+            )
+            if word_score >= threshold:
+                scored.append((word_score, score, -todo_id))
+        if not scored:
+            return None
+        return -max(scored)[2]
+
+    @staticmethod
+    async def _best_match_postgres(
+        db: AsyncSession, user_id: int, title: str, threshold: float
+    ) -> Todo | None:
+        # ``title %> :query`` is served by the gin_trgm_ops index and
+        # honours the transaction-local word similarity threshold.
+        await db.execute(
+            select(
+                func.set_config(
+                    "pg_trgm.word_similarity_threshold",
+                    str(threshold),
+                    True,
+                )
+            )
+        )
+        return await db.scalar(
+            select(Todo)
+            .where(
+                Todo.owner_id == user_id,
+                Todo.title.bool_op("%>")(title),
+            )
+            .order_by(
+                func.word_similarity(title, Todo.title).desc(),
+                func.similarity(title, Todo.title).desc(),
+                Todo.id,
+            )
+            .limit(1)
+        )
@@ -0,0 +1,257 @@
+"""Per-user todo counters answering "how many todos are left?".
+
+Each user has a ``todo_summaries`` row with their number of todos, how
+many of them are completed and the most recently added one, so a
+summary is a primary key lookup however long the list is.
+
+The row is updated in the transaction that writes the todos: by the
+ORM events at the bottom of this module for todos written through the
+session (the tool call handlers, and so the dispatcher and the write
+coalescer too) and by ``add_todos`` for bulk inserts. Every change is a
+single relative UPDATE, so concurrent transactions never lose each
+other's counts. A user without a row, e.g. one inserted in bulk, gets
+one counted from their todos on their first change; until then reads
+count the todos instead.
+"""
+
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import (
+    case,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.models.schedule import Todo
+from app.database.models.summaries import TodoSummary
+from app.database.models.users import User
+
+summaries = TodoSummary.__table__
+
+
+class TodoSummaryService:
+    """Maintain and read the per-user todo counters.
+
+    The maintenance methods take the connection (or session) of the
+    transaction writing the todos, are called after the todo rows were
+    written and never commit.
+    """
+
+    @staticmethod
+    def _latest(connection: Connection | Session, user_id: int) -> dict:
+        latest = connection.execute(
+            select(Todo.id, Todo.title)
+            .where(Todo.owner_id == user_id)
+            .order_by(Todo.id.desc())
+            .limit(1)
+        ).first()
+        return {
+            "latest_todo_id": latest.id if latest else None,
+            "latest_title": latest.title if latest else None,
+        }
+
+    @classmethod
+    def count(cls, connection: Connection | Session, user_id: int) -> dict:
+        """Compute a user's counters from their todos."""
+        total, completed = connection.execute(
+            select(
+                func.count(Todo.id),
+                func.count(case((Todo.completed.is_(True), 1))),
+            ).where(Todo.owner_id == user_id)
+        ).one()
+        return {
+            "total": total,
+            "completed": completed,
+            **cls._latest(connection, user_id),
+        }
+
+    @classmethod
+    def rebuild(cls, connection: Connection | Session, user_id: int):
+        """Recount a user's todos into their summary row."""
+        values = cls.count(connection, user_id)
+        updated = connection.execute(
+            update(summaries)
+            .where(summaries.c.user_id == user_id)
+            .values(**values)
+        )
+        if not updated.rowcount:
+            connection.execute(
+                insert(summaries).values(user_id=user_id, **values)
+            )
+
+    @classmethod
+    def _change(cls, connection: Connection | Session, user_id, **values):
+        """Update a user's row; return its ``latest_todo_id`` row.
+
+        Without a row the user's todos, which already include the
+        change, are counted instead and None is returned.
+        """
+        row = connection.execute(
+            update(summaries)
+            .where(summaries.c.user_id == user_id)
+            .values(**values)
+            .returning(summaries.c.latest_todo_id)
+        ).first()
+        if row is None:
+            cls.rebuild(connection, user_id)
+        return row
+
+    @classmethod
+    def todos_added(
+        cls,
+        connection: Connection | Session,
+        user_id: int,
+        todos: list[tuple[int, str, bool]],
+    ) -> None:
+        """Count new ``(id, title, completed)`` todos of one user."""
+        latest_id, latest_title, _ = max(todos)
+        cls._change(
+            connection,
+            user_id,
+            total=summaries.c.total + len(todos),
+            completed=summaries.c.completed
+            + sum(completed for _, _, completed in todos),
+            latest_todo_id=latest_id,
+            latest_title=latest_title,
+        )
+
+    @classmethod
+    def completed_changed(
+        cls, connection: Connection | Session, user_id: int, delta: int
+    ) -> None:
+        """Count ``delta`` more (or fewer) completed todos."""
+        cls._change(
+            connection, user_id, completed=summaries.c.completed + delta
+        )
+
+    @classmethod
+    def todo_removed(
+        cls,
+        connection: Connection | Session,
+        user_id: int,
+        todo_id: int,
+        completed: bool,
+    ) -> None:
+        """Uncount a deleted todo, finding the next most recent one."""
+        row = cls._change(
+            connection,
+            user_id,
+            total=summaries.c.total - 1,
+            completed=summaries.c.completed - int(completed),
+        )
+        if row is not None and row.latest_todo_id == todo_id:
+            connection.execute(
+                update(summaries)
+                .where(summaries.c.user_id == user_id)
+                .values(**cls._latest(connection, user_id))
+            )
+
+    @classmethod
+    def add_todos(
+        cls,
+        connection: Connection | Session,
+        rows: Iterable[tuple[int, int, str, bool]],
+    ) -> None:
+        """Count bulk inserted ``(id, owner_id, title, completed)`` rows.
+
+        One UPDATE per user, however many of their todos were added.
+        """
+        by_user = defaultdict(list)
+        for todo_id, user_id, title, completed in rows:
+            by_user[user_id].append((todo_id, title, bool(completed)))
+        for user_id, todos in by_user.items():
+            cls.todos_added(connection, user_id, todos)
+
+    @classmethod
+    async def get(cls, db: AsyncSession, user_id: int) -> dict | None:
+        """Return a user's summary, or None if the user does not exist.
+
+        Returns:
+            dict: ``total``, ``completed`` and ``pending`` counts plus
+            the title of the ``most_recent`` todo.
+        """
+        row = (
+            await db.execute(
+                select(
+                    summaries.c.total,
+                    summaries.c.completed,
+                    summaries.c.latest_title,
+                ).where(summaries.c.user_id == user_id)
+            )
+        ).first()
+        if row is None:
+            # Possibly a read-only session: count without storing.
+            if await db.scalar(select(User.id).where(User.id == user_id)):
+                values = await db.run_sync(cls.count, user_id)
+                row = (
+                    values["total"],
+                    values["completed"],
+                    values["latest_title"],
+                )
+            else:
+                return None
+
+        total, completed, latest_title = row
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "most_recent": latest_title,
+        }
+
+
+@event.listens_for(User, "after_insert")
+def _create_summary(mapper, connection: Connection, target: User) -> None:
+    connection.execute(insert(summaries).values(user_id=target.id))
+
+
+@event.listens_for(User, "after_delete")
+def _delete_summary(mapper, connection: Connection, target: User) -> None:
+    connection.execute(
+        delete(summaries).where(summaries.c.user_id == target.id)
+    )
+
+
+@event.listens_for(Todo, "after_insert")
+def _count_added_todo(mapper, connection: Connection, target: Todo):
+    TodoSummaryService.todos_added(
+        connection,
+        target.owner_id,
+        [(target.id, target.title, bool(target.completed))],
+    )
+
+
+@event.listens_for(Todo, "after_update")
+def _count_completed_todo(mapper, connection: Connection, target: Todo):
+    history = inspect(target).attrs.completed.history
+    if not history.has_changes():
+        return
+    if not history.deleted:
+        # The previous value was never loaded.
+        TodoSummaryService.rebuild(connection, target.owner_id)
+        return
+    delta = int(bool(history.added[0])) - int(bool(history.deleted[0]))
+    if delta:
+        TodoSummaryService.completed_changed(
+            connection, target.owner_id, delta
+        )
+
+
+@event.listens_for(Todo, "after_delete")
+def _count_deleted_todo(mapper, connection: Connection, target: Todo):
+    state = inspect(target)
+    if "completed" not in state.dict:
+        TodoSummaryService.rebuild(connection, target.owner_id)
+        return
+    TodoSummaryService.todo_removed(
+        connection, target.owner_id, target.id, bool(target.completed)
+    )
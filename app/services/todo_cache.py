@@ -0,0 +1,114 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.models.schedule import Todo
+from app.schemas.vapi_schema import GetTodosArguments
+from app.utils.cache import MemoryVersionedCache, RedisVersionedCache
+
+# getTodos arguments that change the result besides the caller.
+LIST_ARGUMENTS = {"completed", "order_by", "order", "limit"}
+
+
+def backend_name() -> str:
+    """TODO_CACHE_BACKEND with ``auto`` resolved.
+
+    An in-process cache never sees the writes of other workers, so
+    ``auto`` only uses it when a single worker serves the API. Only
+    WEB_CONCURRENCY tells: ``uvicorn --workers N`` does not set it.
+    """
+    if settings.TODO_CACHE_BACKEND != "auto":
+        return settings.TODO_CACHE_BACKEND
+    return "memory" if settings.WEB_CONCURRENCY == 1 else "none"
+
+
+def make_backend():
+    """Build the backend selected by TODO_CACHE_BACKEND."""
+    backend = backend_name()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        from redis.asyncio import Redis
+
+        return RedisVersionedCache(
+            Redis.from_url(settings.REDIS_URL),
+            ttl=settings.TODO_CACHE_TTL,
+            prefix="todos",
+            encode=bytes,
+            decode=bytes,
+        )
+    return MemoryVersionedCache(
+        maxsize=settings.TODO_CACHE_SIZE, ttl=settings.TODO_CACHE_TTL
+    )
+
+
+class TodoListCache:
+    """getTodos results cached per user behind a version counter.
+
+    Results are stored as the serialized JSON bytes of the todo list.
+
+    Writes to a user's todos are recorded on the session (by the ORM
+    events below, or ``mark_changed`` for bulk inserts) and the user's
+    version is bumped by ``publish`` once the transaction commits, so a
+    result cached from pre-commit data can never be served afterwards.
+    Every commit that may write todos must be followed by ``publish``.
+
+    Results read from a replica are not stored: a lagging replica can
+    return rows older than the version they would be cached under,
+    which would then be served until the TTL instead of for the lag.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    @staticmethod
+    def key(args: GetTodosArguments) -> str:
+        return args.model_dump_json(include=LIST_ARGUMENTS)
+
+    async def get(self, user_id: int, args: GetTodosArguments):
+        """Return ``(version, cached result or None)``."""
+        if self.backend is None:
+            return None, None
+        version = await self.backend.get_version(user_id)
+        return version, await self.backend.get(
+            user_id, version, self.key(args)
+        )
+
+    async def set(
+        self,
+        user_id: int,
+        version: int | None,
+        args: GetTodosArguments,
+        todos: bytes,
+    ) -> None:
+        if self.backend is not None and version is not None:
+            await self.backend.set(user_id, version, self.key(args), todos)
+
+    @staticmethod
+    def mark_changed(db: AsyncSession | Session, user_ids) -> None:
+        """Record users whose todos the current transaction changes."""
+        db.info.setdefault("changed_todo_owners", set()).update(user_ids)
+
+    async def publish(self, db: AsyncSession) -> None:
+        """Invalidate the users written to by the committed transaction."""
+        user_ids = db.info.pop("changed_todo_owners", None)
+        if user_ids and self.backend is not None:
+            await self.backend.bump(user_ids)
+
+
+todo_list_cache = TodoListCache(make_backend())
+
+
+@event.listens_for(Todo, "after_insert")
+@event.listens_for(Todo, "after_update")
+@event.listens_for(Todo, "after_delete")
+def _mark_todo_owner_changed(mapper, connection, target: Todo) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        TodoListCache.mark_changed(session, [target.owner_id])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_todo_owners(session: Session) -> None:
+    session.info.pop("changed_todo_owners", None)
@@ -1,32 +1,91 @@
 from typing import List
 
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.database.models.users import User
+from app.schemas.vapi_schema import CreateUserArguments
+from app.utils.cache import LRUCache
 from app.utils.exceptions import UserAlreadyExistsError
 
+# phone_number -> User.id, shared by every tool call handler.
+user_id_cache = LRUCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL
+)
+
 
 class UserService:
 
     @classmethod
-    async def get_users(cls, db: Session) -> List[User]:
-        """Get all users.
+    async def get_user_id(
+        cls, db: AsyncSession, phone_number: str
+    ) -> int | None:
+        """Resolve a phone number to a user id, using the cache first.
+
+        Args:
+            db: Database session.
+            phone_number: Caller phone number.
+
+        Returns:
+            int | None: The user id, or None if no such user exists.
+        """
+        user_id = user_id_cache.get(phone_number)
+        if user_id is None:
+            user_id = await db.scalar(
+                select(User.id).where(User.phone_number == phone_number)
+            )
+            if user_id is not None:
+                user_id_cache.set(phone_number, user_id)
+        return user_id
+
+    @staticmethod
+    def remember_user_id(
+        db: AsyncSession, phone_number: str, user_id: int
+    ) -> None:
+        """Cache a newly inserted user once its transaction commits."""
+        db.info.setdefault("created_users", {})[phone_number] = user_id
+
+    @classmethod
+    def remember_user(cls, db: AsyncSession, user: User) -> None:
+        cls.remember_user_id(db, user.phone_number, user.id)
+
+    @classmethod
+    async def get_users(
+        cls,
+        db: AsyncSession,
+        limit: int | None = None,
+        after: int | None = None,
+    ) -> List[User]:
+        """Get users ordered by id, one keyset page at a time.
 
         Args:
             db: Database session.
+            limit: Maximum number of users to return.
+            after: Only return users with an id greater than this one.
 
         Returns:
             List[User]: List of users.
         """
-        return db.query(User).all()
+        query = select(User).order_by(User.id)
+        if after is not None:
+            query = query.where(User.id > after)
+        if limit is not None:
+            query = query.limit(limit)
+        return list(await db.scalars(query))
 
     @classmethod
-    def create_user(cls, db: Session, user_data: dict) -> User:
+    async def create_user(
+        cls, db: AsyncSession, user_data: dict, commit: bool = True
+    ) -> User:
         """Create a new user.
 
         Args:
             db: Database session.
             user_data: User creation data.
+            commit: Commit the transaction, or only flush it when the
+                caller owns the transaction.
 
         Returns:
             User: The created user.
@@ -34,17 +93,64 @@ class UserService:
         Raises:
             UserAlreadyExistsError: If user with email already exists.
         """
-        existing_user = (
-            db.query(User)
-            .filter((User.phone_number == user_data["phone_number"]))
-            .first()
+        existing_user_id = await cls.get_user_id(
+            db, user_data["phone_number"]
         )
-        if existing_user:
+        if existing_user_id is not None:
             raise UserAlreadyExistsError(
                 "User with this email already exists"
             )
 
         user = User(**user_data)
         db.add(user)
-        db.commit()
+        await db.flush()
+        cls.remember_user(db, user)
+        if commit:
+            await db.commit()
         return user
+
+    @classmethod
+    async def handle_create_user(
+        cls, db: AsyncSession, args: CreateUserArguments
+    ) -> str:
+        """Register the caller from a createUser tool call.
+
+        Args:
+            db: Database session.
+            args: createUser tool call arguments.
+
+        Returns:
+            str: Tool call result.
+        """
+        user_data = {"name": args.name, "phone_number": args.phone_number}
+        await cls.create_user(db, user_data, commit=False)
+        return "success"
+
+
+# Keep the user id cache consistent with committed state: ids assigned
+# inside a transaction are only published once it commits, and deleted
+# users are evicted immediately and again after the delete commits.
+@event.listens_for(User, "after_delete")
+def _evict_deleted_user(mapper, connection, target: User) -> None:
+    user_id_cache.delete(target.phone_number)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("deleted_users", set()).add(
+            target.phone_number
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _sync_user_id_cache(session: Session) -> None:
+    for phone_number, user_id in session.info.pop(
+        "created_users", {}
+    ).items():
+        user_id_cache.set(phone_number, user_id)
+    for phone_number in session.info.pop("deleted_users", set()):
+        user_id_cache.delete(phone_number)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_user_ids(session: Session) -> None:
+    session.info.pop("created_users", None)
+    session.info.pop("deleted_users", None)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.database.session import build_async_engine
+from app.services.calls import CallService
+from app.utils.vapi import VapiHandler
+
+logger = logging.getLogger("tasks.calls")
+
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+class CallNotEndedError(Exception):
+    """The call is still running (or Vapi could not be reached)."""
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Sessions for task code.
+
+    Every task runs its own event loop, so connections are not pooled
+    across tasks; they are otherwise set up like the API's (SQLite
+    pragmas, BEGIN IMMEDIATE for writes, connect timeouts).
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(
+            build_async_engine(settings.ASYNC_DATABASE_URL, pooled=False),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _session_factory
+
+
+def get_vapi_handler() -> VapiHandler:
+    return VapiHandler()
+
+
+async def _process_call(call_id: str) -> dict:
+    async with get_session_factory()() as db:
+        stored = await CallService.get_call_details(db, call_id)
+        if stored is not None:
+            # Already delivered by the end-of-call webhook.
+            return stored
+
+        async with get_vapi_handler() as vapi:
+            context = await vapi.get_call_details(call_id, attempts=1)
+        if not context["status"]:
+            raise CallNotEndedError(call_id)
+
+        await CallService.record_call_details(db, context["data"])
+        return context["data"]
+
+
+@celery_app.task(
+    name="calls.process_call",
+    autoretry_for=(CallNotEndedError,),
+    max_retries=settings.CALL_PROCESSING_MAX_RETRIES,
+    retry_backoff=settings.CALL_PROCESSING_BACKOFF,
+    retry_backoff_max=settings.CALL_PROCESSING_BACKOFF_MAX,
+    retry_jitter=True,
+)
+def process_call(call_id: str) -> dict:
+    """Fetch an ended call from Vapi and store its transcript/analysis.
+
+    Retried with exponential backoff while the call is still running or
+    Vapi cannot be reached.
+    """
+    logger.info("Processing call %s", call_id)
+    return asyncio.run(_process_call(call_id))
+
+
+async def enqueue_call_processing(call_id: str, countdown: int = 0) -> str:
+    """Queue ``process_call`` without blocking the event loop.
+
+    Publishing talks to the broker synchronously (and eager mode runs
+    the task inline), so it is done on the thread pool.
+
+    Args:
+        call_id: Vapi call id.
+        countdown: Seconds before the task runs, e.g. to give the
+            end-of-call report time to arrive so no fetch is needed.
+
+    Returns:
+        str: The Celery task id.
+    """
+    result = await run_in_threadpool(
+        partial(process_call.apply_async, (call_id,), countdown=countdown)
+    )
+    return result.id
@@ -0,0 +1,12 @@
+import os
+
+# Settings are validated at import time; provide dummy values so the
+# test suite does not depend on a local .env file.
+for key in (
+    "VAPI_API_PUBLIC_KEY",
+    "VAPI_API_PRIVATE_KEY",
+    "DEFAULT_ASSISTANT_ID",
+    "MODEL",
+    "PhoneNumberID",
+):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.load import benchmark, compare, percentile
+from benchmarks.payloads import WorkloadGenerator
+from benchmarks.startup import compare as compare_startup
+from benchmarks.startup import summarize as summarize_startup
+
+
+def test_generator_targets_existing_todos():
+    generator = WorkloadGenerator(users=3, todos_per_user=2, seed=1)
+    users, todos = generator.setup()
+
+    assert [name for name, _ in users] == ["createUser"] * 3
+    assert len(todos) == 6
+
+    titles = {
+        call["message"]["toolCalls"][0]["function"]["arguments"]["title"]
+        for _, call in todos
+    }
+    for name, call in generator.mixed(200):
+        args = call["message"]["toolCalls"][0]["function"]["arguments"]
+        if name in ("completeTodo", "deleteTodo"):
+            assert args["title"] in {title.lower() for title in titles}
+        if name == "createTodo":
+            titles.add(args["title"])
+        if name != "createUser":
+            assert args["phone_number"] in generator.phone_numbers
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = {"getTodos": {"p95_ms": 10.0, "throughput": 100.0}}
+
+    assert (
+        compare(
+            {"getTodos": {"p95_ms": 12.0, "throughput": 90.0}}, baseline
+        )
+        == []
+    )
+    regressions = compare(
+        {"getTodos": {"p95_ms": 20.0, "throughput": 50.0}}, baseline
+    )
+    assert len(regressions) == 2
+    assert compare({"new": {"p95_ms": 1, "throughput": 1}}, baseline) == []
+
+
+def test_startup_report_compares_medians():
+    runs = [
+        {
+            "import_ms": value,
+            "startup_ms": 1.0,
+            "first_request_ms": 1.0,
+            "second_request_ms": 1.0,
+        }
+        for value in (300.0, 100.0, 200.0)
+    ]
+    report = summarize_startup(runs)
+
+    assert report["import_ms"] == {"median": 200.0, "max": 300.0}
+    assert compare_startup(report, {"import_ms": {"median": 180.0}}) == []
+    assert compare_startup(report, {"import_ms": {"median": 100.0}}) == [
+        "import_ms: 200.0ms vs 100.0ms baseline"
+    ]
+
+
+def test_benchmark_reports_per_tool():
+    app = FastAPI()
+
+    @app.post("/{path:path}")
+    async def tool(path: str):
+        if path == "schedules/delete_todo/":
+            return {"results": [{"toolCallId": "x", "error": "boom"}]}
+        return {"results": [{"toolCallId": "x", "result": "success"}]}
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            return await benchmark(
+                client,
+                WorkloadGenerator(users=2, todos_per_user=2),
+                requests=50,
+                concurrency=4,
+            )
+
+    report = asyncio.run(run())
+
+    assert report["setup"]["count"] == 6
+    assert report["mixed"]["total"]["count"] == 50
+    assert report["mixed"]["total"]["errors"] == (
+        report["mixed"].get("deleteTodo", {}).get("count", 0)
+    )
+    assert report["mixed"]["getTodos"]["p99_ms"] >= (
+        report["mixed"]["getTodos"]["p50_ms"]
+    )
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache import (
+    LRUCache,
+    MemoryVersionedCache,
+    RedisVersionedCache,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache(maxsize=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+class FakeRedis:
+    """The subset of ``redis.asyncio.Redis`` used by the cache."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = (
+            value.encode() if isinstance(value, str) else value
+        )
+        self.expiry[key] = ex
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def expire(self, key, seconds):
+        if key in self.data:
+            self.expiry[key] = seconds
+
+
+@pytest.mark.parametrize(
+    "make_cache",
+    [
+        lambda: MemoryVersionedCache(maxsize=10),
+        lambda: RedisVersionedCache(FakeRedis(), ttl=60),
+    ],
+)
+def test_versioned_cache_bump_hides_old_entries(make_cache):
+    cache = make_cache()
+
+    async def run():
+        version = await cache.get_version(1)
+        await cache.set(1, version, "all", [{"id": 1}])
+        await cache.set(2, await cache.get_version(2), "all", [])
+        cached = await cache.get(1, await cache.get_version(1), "all")
+
+        await cache.bump([1])
+        new_version = await cache.get_version(1)
+        return (
+            cached,
+            new_version != version,
+            await cache.get(1, new_version, "all"),
+            await cache.get(2, await cache.get_version(2), "all"),
+        )
+
+    assert asyncio.run(run()) == ([{"id": 1}], True, None, [])
+
+
+def test_memory_versions_are_not_reused_after_eviction():
+    cache = MemoryVersionedCache(maxsize=1)
+
+    async def run():
+        old = await cache.get_version(1)
+        await cache.get_version(2)
+        return old, await cache.get_version(1)
+
+    old, new = asyncio.run(run())
+    assert new != old
+
+
+def test_redis_version_outlives_entries():
+    client = FakeRedis()
+    cache = RedisVersionedCache(client, ttl=60, prefix="todos")
+
+    async def run():
+        await cache.bump([1])
+        await cache.set(1, await cache.get_version(1), "all", [])
+
+    asyncio.run(run())
+    assert client.expiry["todos:1:1:all"] == 60
+    assert client.expiry["todos:version:1"] == 120
@@ -1,33 +1,88 @@
+import asyncio
 import json
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
 
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-
-from app.database import Base, get_db
+from sqlalchemy.pool import NullPool
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.database import (
+    Base,
+    get_async_db,
+    get_async_read_db,
+    get_async_read_sessionmaker,
+    get_async_sessionmaker,
+    get_db,
+)
+from app.database.models.calls import Call
 from app.database.models.schedule import Todo
+from app.database.models.summaries import TodoSummary
+from app.database.models.tool_calls import ToolCallResult
 from app.database.models.users import User
-from app.main import app
+from app.main import app, get_application
+from app.routes import vapi as vapi_routes
 from app.schemas.vapi_schema import (
+    CreateTodoArguments,
+    CreateUserArguments,
+    GetTodosArguments,
     Message,
     ToolCall,
     ToolCallFunction,
     VapiRequest,
 )
-
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+from app.services.admission import TRY_AGAIN, admission
+from app.services.coalescer import WriteCoalescer
+from app.services.export import ExportService
+from app.services.idempotency import tool_call_results
+from app.services.imports import CHUNK_FAILED, ImportService
+from app.services.reminders import ReminderScheduler
+from app.services.schedule import ScheduleService
+from app.services.summaries import TodoSummaryService
+from app.services.todo_cache import (
+    backend_name,
+    make_backend,
+    todo_list_cache,
+)
+from app.services.users import user_id_cache
+from app.tasks import calls as call_tasks_module
+from app.tests.test_vapi import CALL, FakeVapi
+from app.utils.profiler import sql_profiler
+from app.utils.ratelimit import ConcurrencyGate, TokenBucketLimiter
+
+# The app runs on the async engine while fixtures seed data through a
+# sync session, so both need to point at the same database file.
+SQLITE_FILE = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLITE_FILE}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{SQLITE_FILE}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    poolclass=NullPool,
 )
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
 
+# TestClient may run each request on a fresh event loop, so connections
+# must not be pooled across requests.
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 # Dependency override
 def override_get_db():
@@ -38,16 +93,32 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(autouse=True)
 def setup_db():
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    user_id_cache.clear()
+    todo_list_cache.backend.clear()
+    admission.clear()
     yield
     # Drop all tables after tests
     Base.metadata.drop_all(bind=engine)
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+app.dependency_overrides[get_async_read_db] = override_get_async_db
+app.dependency_overrides[get_async_sessionmaker] = (
+    lambda: TestingAsyncSessionLocal
+)
+app.dependency_overrides[get_async_read_sessionmaker] = (
+    lambda: TestingAsyncSessionLocal
+)
 
 client = TestClient(app)
 
@@ -83,12 +154,14 @@ def test_todo(db_session, test_user):
     return todo
 
 
-def create_vapi_request(function_name: str, args: dict):
+def create_vapi_request(
+    function_name: str, args: dict, tool_call_id: str | None = None
+):
     return VapiRequest(
         message=Message(
             toolCalls=[
                 ToolCall(
-                    id="test123",
+                    id=tool_call_id or f"call_{uuid.uuid4().hex}",
                     function=ToolCallFunction(
                         name=function_name, arguments=json.dumps(args)
                     ),
@@ -298,3 +371,1583 @@ def test_invalid_tool_call():
     )
     assert response.status_code == 400
     assert "Invalid Request" in response.json()["detail"]
+
+
+# Dispatcher Tests
+def test_dispatch_runs_every_tool_call(db_session, test_user):
+    request_data = VapiRequest(
+        message=Message(
+            toolCalls=[
+                ToolCall(
+                    id="call-1",
+                    function=ToolCallFunction(
+                        name="createTodo",
+                        arguments=json.dumps(
+                            {"phone_number": "1234567890", "title": "A"}
+                        ),
+                    ),
+                ),
+                ToolCall(
+                    id="call-2",
+                    function=ToolCallFunction(
+                        name="createTodo",
+                        arguments={
+                            "phone_number": "1234567890",
+                            "title": "B",
+                        },
+                    ),
+                ),
+                ToolCall(
+                    id="call-3",
+                    function=ToolCallFunction(
+                        name="getTodos",
+                        arguments={"phone_number": "1234567890"},
+                    ),
+                ),
+            ]
+        )
+    )
+
+    response = client.post("/tools/", json=request_data.model_dump())
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [r["toolCallId"] for r in results] == [
+        "call-1",
+        "call-2",
+        "call-3",
+    ]
+    assert results[0]["result"] == "success"
+    assert results[1]["result"] == "success"
+    assert [t["title"] for t in results[2]["result"]] == ["A", "B"]
+
+
+def test_dispatch_reports_errors_per_tool_call(db_session, test_user):
+    request_data = VapiRequest(
+        message=Message(
+            toolCalls=[
+                ToolCall(
+                    id="call-1",
+                    function=ToolCallFunction(
+                        name="deleteTodo",
+                        arguments={
+                            "phone_number": "1234567890",
+                            "title": "Missing",
+                        },
+                    ),
+                ),
+                ToolCall(
+                    id="call-2",
+                    function=ToolCallFunction(
+                        name="unknownFunction", arguments={}
+                    ),
+                ),
+                ToolCall(
+                    id="call-3",
+                    function=ToolCallFunction(
+                        name="createTodo",
+                        arguments={
+                            "phone_number": "1234567890",
+                            "title": "C",
+                        },
+                    ),
+                ),
+            ]
+        )
+    )
+
+    response = client.post("/tools/", json=request_data.model_dump())
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert results[0] == {
+        "toolCallId": "call-1",
+        "error": "Todo not found",
+    }
+    assert "unknownFunction" in results[1]["error"]
+    assert results[2]["result"] == "success"
+    assert db_session.query(Todo).count() == 1
+
+
+# Idempotency Tests
+def test_retried_create_todo_is_replayed(db_session, queries):
+    request_data = create_vapi_request(
+        "createTodo",
+        {"phone_number": "5550003", "name": "Caller", "title": "Once"},
+        tool_call_id="retried-call",
+    ).model_dump()
+
+    first = client.post("/schedules/create_todo/", json=request_data)
+    queries.clear()
+    retry = client.post("/schedules/create_todo/", json=request_data)
+
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert db_session.query(Todo).count() == 1
+    assert db_session.query(User).count() == 1
+    assert not any("todos" in q or "users" in q for q in queries)
+
+
+def test_retried_delete_todo_is_replayed(db_session, test_todo):
+    request_data = create_vapi_request(
+        "deleteTodo",
+        {"phone_number": "1234567890", "title": "Test Todo"},
+        tool_call_id="retried-delete",
+    ).model_dump()
+
+    assert (
+        client.post("/schedules/delete_todo/", json=request_data).json()
+        == client.post("/schedules/delete_todo/", json=request_data).json()
+    )
+
+
+def test_retried_tool_calls_are_replayed_by_dispatcher(
+    db_session, test_user
+):
+    request_data = create_vapi_request(
+        "createTodo",
+        {"phone_number": "1234567890", "title": "Once"},
+        tool_call_id="retried-batch",
+    ).model_dump()
+
+    for _ in range(2):
+        response = client.post("/tools/", json=request_data)
+        assert response.json()["results"] == [
+            {"toolCallId": "retried-batch", "result": "success"}
+        ]
+    assert db_session.query(Todo).count() == 1
+
+
+def test_retried_create_user_is_replayed(db_session):
+    request_data = create_vapi_request(
+        "createUser",
+        {"phone_number": "5550004", "name": "Caller"},
+        tool_call_id="retried-user",
+    ).model_dump()
+
+    assert client.post("/users/", json=request_data).status_code == 201
+    assert client.post("/users/", json=request_data).status_code == 201
+    assert db_session.query(User).count() == 1
+
+
+def test_failed_tool_calls_are_not_stored(db_session, test_user):
+    request_data = create_vapi_request(
+        "completeTodo",
+        {"phone_number": "1234567890", "title": "Later"},
+        tool_call_id="retried-failure",
+    ).model_dump()
+
+    response = client.post("/schedules/complete_todo/", json=request_data)
+    assert response.status_code == 404
+
+    db_session.add(Todo(title="Later", owner_id=test_user.id))
+    db_session.commit()
+    response = client.post("/schedules/complete_todo/", json=request_data)
+    assert response.status_code == 200
+    assert db_session.query(Todo).one().completed is True
+
+
+def test_tool_call_results_expire(db_session, test_user, monkeypatch):
+    request_data = create_vapi_request(
+        "createTodo",
+        {"phone_number": "1234567890", "title": "Again"},
+        tool_call_id="expired-call",
+    ).model_dump()
+    client.post("/schedules/create_todo/", json=request_data)
+
+    monkeypatch.setattr(tool_call_results, "retention", -1)
+    client.post("/schedules/create_todo/", json=request_data)
+
+    assert db_session.query(Todo).count() == 2
+    assert db_session.query(ToolCallResult).count() == 1
+
+
+# Admission control Tests
+def test_caller_over_rate_limit_gets_try_again(db_session, monkeypatch):
+    monkeypatch.setattr(
+        admission, "caller_limiter", TokenBucketLimiter(rate=1, burst=2)
+    )
+
+    def create(title):
+        return client.post(
+            "/schedules/create_todo/",
+            json=create_vapi_request(
+                "createTodo", {"phone_number": "5550005", "title": title}
+            ).model_dump(),
+        )
+
+    assert create("A").json()["results"][0]["result"] == "success"
+    assert create("B").json()["results"][0]["result"] == "success"
+
+    response = create("C")
+    assert response.status_code == 200
+    assert response.headers["Retry-After"] == "1"
+    (result,) = response.json()["results"]
+    assert result["error"] == TRY_AGAIN
+    assert [t.title for t in db_session.query(Todo)] == ["A", "B"]
+
+    # Other callers are not affected.
+    response = client.post(
+        "/schedules/create_todo/",
+        json=create_vapi_request(
+            "createTodo", {"phone_number": "5550006", "title": "D"}
+        ).model_dump(),
+    )
+    assert response.json()["results"][0]["result"] == "success"
+
+
+def test_busy_worker_sheds_tool_calls(db_session, test_user, monkeypatch):
+    gate = ConcurrencyGate(limit=1)
+    monkeypatch.setattr(admission, "gate", gate)
+    # A single token that does not refill: shed requests get it back.
+    monkeypatch.setattr(
+        admission,
+        "caller_limiter",
+        TokenBucketLimiter(rate=0.001, burst=1),
+    )
+    asyncio.run(gate.acquire())
+
+    request_data = create_vapi_request(
+        "getTodos", {"phone_number": "1234567890"}
+    )
+    response = client.post("/tools/", json=request_data.model_dump())
+    assert response.json() == {
+        "results": [
+            {
+                "toolCallId": request_data.message.toolCalls[0].id,
+                "error": TRY_AGAIN,
+            }
+        ]
+    }
+
+    gate.release()
+    response = client.post("/tools/", json=request_data.model_dump())
+    assert response.json()["results"][0]["result"] == []
+    assert gate.active == 0
+
+
+# User id cache Tests
+def test_user_id_cache_skips_repeated_lookups(db_session, test_user):
+    request_data = create_vapi_request(
+        "getTodos", {"phone_number": "1234567890"}
+    )
+
+    for _ in range(3):
+        response = client.post(
+            "/schedules/get_todos/", json=request_data.model_dump()
+        )
+        assert response.status_code == 200
+
+    stats = client.get("/users/cache/").json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+
+def test_user_id_cache_populated_on_create():
+    request_data = create_vapi_request(
+        "createUser", {"name": "New User", "phone_number": "9876543210"}
+    )
+    client.post("/users/", json=request_data.model_dump())
+
+    assert user_id_cache.get("9876543210") is not None
+
+
+def test_user_id_cache_invalidated_on_delete(db_session, test_user):
+    user_id_cache.set(test_user.phone_number, test_user.id)
+
+    db_session.delete(test_user)
+    db_session.commit()
+
+    assert user_id_cache.get("1234567890") is None
+
+
+# Title matching Tests
+def test_complete_todo_matches_spoken_title(db_session, test_user):
+    for title in ["Buy milk and eggs", "Call the plumber", "Pay rent"]:
+        db_session.add(Todo(title=title, owner_id=test_user.id))
+    db_session.commit()
+
+    request_data = create_vapi_request(
+        "completeTodo",
+        {"phone_number": "1234567890", "title": "call plumber"},
+    )
+    response = client.post(
+        "/schedules/complete_todo/", json=request_data.model_dump()
+    )
+    assert response.status_code == 200
+
+    completed = db_session.query(Todo).filter(Todo.completed).all()
+    assert [todo.title for todo in completed] == ["Call the plumber"]
+
+
+def test_delete_todo_picks_best_ranked_match(db_session, test_user):
+    for title in ["Milk", "Buy milk", "Buy oat milk for the office"]:
+        db_session.add(Todo(title=title, owner_id=test_user.id))
+    db_session.commit()
+
+    request_data = create_vapi_request(
+        "deleteTodo", {"phone_number": "1234567890", "title": "buy milk"}
+    )
+    response = client.post(
+        "/schedules/delete_todo/", json=request_data.model_dump()
+    )
+    assert response.status_code == 200
+
+    remaining = {todo.title for todo in db_session.query(Todo).all()}
+    assert remaining == {"Milk", "Buy oat milk for the office"}
+
+
+def test_title_match_ignores_other_users(db_session, test_user):
+    other = User(name="Other", phone_number="5555555555")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(Todo(title="Walk the dog", owner_id=other.id))
+    db_session.commit()
+
+    request_data = create_vapi_request(
+        "deleteTodo",
+        {"phone_number": "1234567890", "title": "walk the dog"},
+    )
+    response = client.post(
+        "/schedules/delete_todo/", json=request_data.model_dump()
+    )
+    assert response.status_code == 404
+
+
+def test_title_match_scans_only_the_callers_todos(
+    db_session, test_user, queries
+):
+    others = [
+        User(name="Other", phone_number=f"555{i:07d}") for i in range(50)
+    ]
+    db_session.add_all(others)
+    db_session.flush()
+    # Other users' titles match the spoken one better than ours.
+    db_session.add_all(
+        Todo(title=title, owner_id=other.id)
+        for other in others
+        for title in ("Buy milk", "buy milk", "Buy milk today")
+    )
+    db_session.add_all(
+        Todo(title=title, owner_id=test_user.id)
+        for title in ("Buy oat milk", "Call mum")
+    )
+    db_session.commit()
+
+    request_data = create_vapi_request(
+        "completeTodo", {"phone_number": "1234567890", "title": "buy milk"}
+    )
+    response = client.post(
+        "/schedules/complete_todo/", json=request_data.model_dump()
+    )
+    assert response.status_code == 200
+
+    completed = db_session.query(Todo).filter(Todo.completed).all()
+    assert [(t.title, t.owner_id) for t in completed] == [
+        ("Buy oat milk", test_user.id)
+    ]
+    assert not any("fts" in statement for statement in queries)
+
+
+# Webhook Tests
+def end_of_call_report(call_id: str) -> dict:
+    return {
+        "message": {
+            "type": "end-of-call-report",
+            "endedReason": "customer-ended-call",
+            "transcript": "AI: Hi there\nUser: Add milk",
+            "analysis": {"summary": "Added milk"},
+            "startedAt": "2025-01-01T10:00:00Z",
+            "endedAt": "2025-01-01T10:02:00Z",
+            "call": {
+                "id": call_id,
+                "type": "inboundPhoneCall",
+                "assistantId": "assistant-1",
+                "createdAt": "2025-01-01T09:59:58Z",
+            },
+            "artifact": {"messages": []},
+        }
+    }
+
+
+def test_webhook_stores_end_of_call_report(db_session):
+    status_update = {
+        "message": {
+            "type": "status-update",
+            "status": "in-progress",
+            "call": {"id": "call-1", "assistantId": "assistant-1"},
+        }
+    }
+    assert (
+        client.post("/vapi/webhook/", json=status_update).status_code
+        == 200
+    )
+
+    call = db_session.get(Call, "call-1")
+    assert call.status == "in-progress"
+
+    response = client.post(
+        "/vapi/webhook/", json=end_of_call_report("call-1")
+    )
+    assert response.status_code == 200
+
+    db_session.refresh(call)
+    assert call.status == "ended"
+    assert call.transcript.startswith("AI: Hi there")
+    assert call.analysis == {"summary": "Added milk"}
+    assert call.assistant_id == "assistant-1"
+
+
+def test_webhook_ignores_other_messages(db_session):
+    response = client.post(
+        "/vapi/webhook/",
+        json={"message": {"type": "speech-update", "status": "started"}},
+    )
+    assert response.status_code == 200
+    assert db_session.query(Call).count() == 0
+
+
+def test_get_call_details_served_from_webhook_store():
+    client.post("/vapi/webhook/", json=end_of_call_report("call-2"))
+    fake = FakeVapi({})
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            async with fake.handler() as handler:
+                return await handler.get_call_details("call-2", db=db)
+
+    context = asyncio.run(run())
+    assert context["status"] is True
+    assert context["data"]["transcript"].startswith("AI: Hi there")
+    assert context["data"]["assistantId"] == "assistant-1"
+    assert fake.requests == []
+
+
+@pytest.fixture
+def call_tasks(monkeypatch):
+    """Run call tasks inline against the test database and a fake Vapi."""
+    fake = FakeVapi({"call-4": CALL}, end_after=2)
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(
+        call_tasks_module,
+        "get_session_factory",
+        lambda: TestingAsyncSessionLocal,
+    )
+    monkeypatch.setattr(
+        call_tasks_module, "get_vapi_handler", fake.handler
+    )
+    return fake
+
+
+def status_update(call_id: str, status: str) -> dict:
+    return {
+        "message": {
+            "type": "status-update",
+            "status": status,
+            "call": {"id": call_id, "assistantId": "assistant-1"},
+        }
+    }
+
+
+def test_ended_status_update_processes_call(db_session, call_tasks):
+    response = client.post(
+        "/vapi/webhook/", json=status_update("call-4", "ended")
+    )
+    assert response.status_code == 200
+
+    # The first poll finds the call still running; the retry stores it.
+    assert call_tasks.requests == ["call-4", "call-4"]
+    call = db_session.get(Call, "call-4")
+    assert call.transcript == "hello"
+    assert call.analysis == {"summary": "ok"}
+
+    response = client.get("/vapi/calls/call-4/")
+    assert response.status_code == 200
+    assert response.json()["transcript"] == "hello"
+
+
+def test_ended_status_update_alone_is_not_served(db_session, monkeypatch):
+    queued = []
+
+    async def enqueue(call_id, countdown=0):
+        queued.append(call_id)
+        return "task-1"
+
+    monkeypatch.setattr(vapi_routes, "enqueue_call_processing", enqueue)
+    client.post("/vapi/webhook/", json=status_update("call-5", "ended"))
+    assert queued == ["call-5"]
+    assert db_session.get(Call, "call-5").status == "ended"
+
+    # No transcript yet: not served from the store, Vapi is polled.
+    assert client.get("/vapi/calls/call-5/").status_code == 404
+    fake = FakeVapi({"call-5": CALL})
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            async with fake.handler() as handler:
+                return await handler.get_call_details("call-5", db=db)
+
+    context = asyncio.run(run())
+    assert fake.requests == ["call-5"]
+    assert context["data"]["transcript"] == "hello"
+    assert client.get("/vapi/calls/call-5/").json()["transcript"] == (
+        "hello"
+    )
+
+
+def test_webhook_succeeds_when_queueing_fails(
+    db_session, monkeypatch, caplog
+):
+    async def enqueue(call_id, countdown=0):
+        raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(vapi_routes, "enqueue_call_processing", enqueue)
+    response = client.post(
+        "/vapi/webhook/", json=status_update("call-6", "ended")
+    )
+
+    assert response.status_code == 200
+    assert db_session.get(Call, "call-6").status == "ended"
+    assert "call-6" in caplog.text
+
+
+def test_ended_status_update_waits_for_end_of_call_report(
+    db_session, monkeypatch, call_tasks
+):
+    queued = []
+    monkeypatch.setattr(
+        call_tasks_module.process_call,
+        "apply_async",
+        lambda args, countdown: queued.append((args, countdown))
+        or celery_app.AsyncResult("task-1"),
+    )
+
+    client.post("/vapi/webhook/", json=status_update("call-4", "ended"))
+    assert queued == [(("call-4",), settings.CALL_PROCESSING_DELAY)]
+    client.post("/vapi/webhook/", json=end_of_call_report("call-4"))
+
+    # The delayed task finds the report stored and skips Vapi.
+    details = asyncio.run(call_tasks_module._process_call("call-4"))
+    assert details["transcript"].startswith("AI: Hi there")
+    assert call_tasks.requests == []
+
+
+def test_process_call_skips_reported_calls(call_tasks):
+    client.post("/vapi/webhook/", json=end_of_call_report("call-4"))
+
+    response = client.post("/vapi/calls/call-4/process/")
+    assert response.status_code == 202
+    assert response.json()["task_id"]
+    assert call_tasks.requests == []
+
+
+def test_in_progress_status_update_is_not_processed(call_tasks):
+    client.post("/vapi/webhook/", json=status_update("call-4", "queued"))
+    assert call_tasks.requests == []
+    assert client.get("/vapi/calls/call-4/").status_code == 404
+
+
+def test_get_call_details_stores_polled_calls():
+    fake = FakeVapi({"call-3": CALL})
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            async with fake.handler() as handler:
+                await handler.get_call_details("call-3", db=db)
+                return await handler.get_call_details("call-3", db=db)
+
+    context = asyncio.run(run())
+    assert context["data"]["transcript"] == "hello"
+    assert fake.requests == ["call-3"]
+
+
+# Reminder Tests
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class Clock:
+    def __init__(self, now: datetime = NOW):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def make_scheduler(fake: FakeVapi, clock: Clock, **options):
+    return ReminderScheduler(
+        TestingAsyncSessionLocal,
+        fake.handler(),
+        poll_interval=options.pop("poll_interval", 3600),
+        clock=clock,
+        **options,
+    )
+
+
+def add_reminder(db_session, phone_number: str, remind_at, **fields):
+    user = db_session.query(User).filter_by(phone_number=phone_number)
+    user = user.one_or_none() or User(
+        name=f"Caller {phone_number}", phone_number=phone_number
+    )
+    todo = Todo(
+        title=f"Call back {phone_number}",
+        owner=user,
+        remind_at=remind_at,
+        **fields,
+    )
+    db_session.add(todo)
+    db_session.commit()
+    return todo.id
+
+
+def test_reminders_dial_due_todos_once(db_session):
+    due = add_reminder(
+        db_session,
+        "5550101",
+        NOW - timedelta(minutes=1),
+        due_at=NOW + timedelta(hours=1),
+    )
+    add_reminder(db_session, "5550102", NOW + timedelta(minutes=10))
+    add_reminder(db_session, "5550103", NOW, completed=True)
+    add_reminder(db_session, "5550104", None)
+    fake = FakeVapi({})
+
+    assert asyncio.run(make_scheduler(fake, Clock()).run_once()) == 1
+    (payload,) = fake.placed
+    assert payload["customer"] == {
+        "number": "5550101",
+        "name": "Caller 5550101",
+    }
+    assert payload["assistantOverrides"]["variableValues"] == {
+        "todo": "Call back 5550101",
+        "due_at": "2025-01-01T13:00:00+00:00",
+    }
+
+    todo = db_session.get(Todo, due)
+    assert todo.remind_at is None
+    assert todo.reminder_call_id == "outbound-1"
+
+    # A restarted worker does not dial it again.
+    assert asyncio.run(make_scheduler(fake, Clock()).run_once()) == 0
+    assert len(fake.placed) == 1
+
+
+def test_reminders_fire_between_polls(db_session):
+    add_reminder(db_session, "5550101", NOW + timedelta(seconds=30))
+    fake = FakeVapi({})
+    clock = Clock()
+    scheduler = make_scheduler(fake, clock, horizon=60)
+
+    async def run():
+        assert await scheduler.run_once() == 0
+        assert len(scheduler) == 1
+        clock.now = NOW + timedelta(seconds=30)
+        return await scheduler.run_once()
+
+    assert asyncio.run(run()) == 1
+
+
+def test_reminders_dial_with_bounded_concurrency(db_session):
+    for n in range(10):
+        add_reminder(db_session, f"555020{n}", NOW)
+    fake = FakeVapi({})
+    schedulers = [
+        make_scheduler(fake, Clock(), concurrency=3, batch_size=4)
+        for _ in range(2)
+    ]
+
+    async def run():
+        return await asyncio.gather(*(s.run_once() for s in schedulers))
+
+    assert sum(asyncio.run(run())) == 10
+    assert len({p["customer"]["number"] for p in fake.placed}) == 10
+    assert fake.max_in_flight <= 6
+
+
+def test_refused_reminder_calls_are_retried(db_session):
+    todo_id = add_reminder(db_session, "5550101", NOW)
+    fake = FakeVapi({}, refuse_numbers=frozenset({"5550101"}))
+    clock = Clock()
+
+    async def attempt():
+        return await make_scheduler(
+            fake, clock, max_attempts=2, retry_delay=60
+        ).run_once()
+
+    assert asyncio.run(attempt()) == 0
+    todo = db_session.get(Todo, todo_id)
+    assert todo.reminder_attempts == 1
+    assert todo.remind_at == (NOW + timedelta(seconds=60)).replace(
+        tzinfo=None
+    )
+
+    clock.now = NOW + timedelta(seconds=60)
+    assert asyncio.run(attempt()) == 0
+    db_session.refresh(todo)
+    assert todo.reminder_attempts == 2
+    assert todo.remind_at is None
+
+
+def test_reminder_scheduler_runs_in_background(db_session):
+    add_reminder(db_session, "5550101", NOW)
+    fake = FakeVapi({})
+    scheduler = make_scheduler(fake, Clock())
+
+    async def run():
+        scheduler.start()
+        for _ in range(100):
+            if fake.placed:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert len(fake.placed) == 1
+
+
+def test_create_todo_with_due_time(db_session, test_user):
+    response = client.post(
+        "/schedules/create_todo/",
+        json=create_vapi_request(
+            "createTodo",
+            {
+                "phone_number": "1234567890",
+                "title": "Dentist",
+                "due_at": "2025-01-01T14:00:00+02:00",
+            },
+        ).model_dump(mode="json"),
+    )
+    assert response.status_code == 200
+
+    todo = db_session.query(Todo).one()
+    assert todo.remind_at == todo.due_at == datetime(2025, 1, 1, 12, 0)
+    assert get_todos()[0]["due_at"] == "2025-01-01T12:00:00Z"
+
+    client.post(
+        "/schedules/complete_todo/",
+        json=create_vapi_request(
+            "completeTodo",
+            {"phone_number": "1234567890", "title": "Dentist"},
+        ).model_dump(),
+    )
+    db_session.refresh(todo)
+    assert todo.remind_at is None
+
+
+# Pagination Tests
+def test_get_users_keyset_pagination(db_session):
+    for i in range(5):
+        db_session.add(User(name=f"User {i}", phone_number=f"55500{i}"))
+    db_session.commit()
+
+    response = client.get("/users/", params={"limit": 2})
+    assert [u["name"] for u in response.json()] == ["User 0", "User 1"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/users/", params={"limit": 2, "after": cursor})
+    assert [u["name"] for u in response.json()] == ["User 2", "User 3"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/users/", params={"limit": 2, "after": cursor})
+    assert [u["name"] for u in response.json()] == ["User 4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_todos_filters_orders_and_limits(db_session, test_user):
+    for title, completed in [("B", False), ("A", True), ("C", False)]:
+        db_session.add(
+            Todo(title=title, completed=completed, owner_id=test_user.id)
+        )
+    db_session.commit()
+
+    def titles(**args):
+        request_data = create_vapi_request(
+            "getTodos", {"phone_number": "1234567890", **args}
+        )
+        response = client.post(
+            "/schedules/get_todos/", json=request_data.model_dump()
+        )
+        assert response.status_code == 200
+        return [
+            t["title"] for t in response.json()["results"][0]["result"]
+        ]
+
+    assert titles() == ["B", "A", "C"]
+    assert titles(completed=False) == ["B", "C"]
+    assert titles(completed="true") == ["A"]
+    assert titles(order_by="title", order="desc") == ["C", "B", "A"]
+    assert titles(order_by="title", limit=2) == ["A", "B"]
+
+
+def test_get_todos_lists_everything_without_a_limit(
+    db_session, test_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "GET_TODOS_MAX_LIMIT", 2)
+    for title in ("A", "B", "C"):
+        db_session.add(Todo(title=title, owner_id=test_user.id))
+    db_session.commit()
+
+    assert len(get_todos()) == 3
+    assert len(get_todos(limit=5)) == 2
+
+
+# Export Tests
+def test_export_streams_users_with_todos(db_session, test_user, test_todo):
+    db_session.add(User(name="No Todos", phone_number="5550000"))
+    db_session.add(Todo(title="Second", owner_id=test_user.id))
+    db_session.commit()
+
+    response = client.get("/users/export/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in records] == ["Test User", "No Todos"]
+    assert [t["title"] for t in records[0]["todos"]] == [
+        "Test Todo",
+        "Second",
+    ]
+    assert records[1]["todos"] == []
+
+
+def test_export_batches_do_not_split_users(db_session, test_user):
+    for i in range(5):
+        db_session.add(Todo(title=f"Todo {i}", owner_id=test_user.id))
+    db_session.add(User(name="Other", phone_number="5550000"))
+    db_session.commit()
+
+    async def run():
+        return [
+            json.loads(line)
+            async for line in ExportService.stream_users_ndjson(
+                TestingAsyncSessionLocal, batch_size=2
+            )
+        ]
+
+    records = asyncio.run(run())
+    assert len(records) == 2
+    assert len(records[0]["todos"]) == 5
+
+
+# Bulk import Tests
+def test_import_csv_creates_users_and_todos(db_session, test_user):
+    body = (
+        "phone_number,name,title,description,completed\n"
+        "1234567890,Test User,Existing user todo,,false\n"
+        "5551112222,New User,First,Desc,true\n"
+        "5551112222,New User,Second,,\n"
+        ",Nobody,No phone,,\n"
+        "5551112222,New User,Bad flag,,maybe\n"
+    )
+    response = client.post(
+        "/schedules/import/",
+        content=body,
+        headers={"content-type": "text/csv"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 3
+    assert [e["row"] for e in report["errors"]] == [4, 5]
+    assert "Missing phone_number" in report["errors"][0]["error"]
+
+    new_user = (
+        db_session.query(User)
+        .filter(User.phone_number == "5551112222")
+        .one()
+    )
+    assert new_user.name == "New User"
+    titles = {
+        (todo.title, todo.completed)
+        for todo in db_session.query(Todo).filter(
+            Todo.owner_id == new_user.id
+        )
+    }
+    assert titles == {("First", True), ("Second", False)}
+    assert (
+        db_session.query(Todo)
+        .filter(Todo.owner_id == test_user.id)
+        .count()
+        == 1
+    )
+
+
+def test_import_ndjson_in_chunks(db_session):
+    lines = [
+        json.dumps({"phone_number": f"555000{i % 3}", "title": f"T{i}"})
+        for i in range(7)
+    ]
+    lines.insert(3, "{not json")
+    body = "\n".join(lines)
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await ImportService.import_todos(
+                db, body, "ndjson", chunk_size=2
+            )
+
+    report = asyncio.run(run())
+    assert report["imported"] == 7
+    assert report["errors"][0]["row"] == 4
+    assert db_session.query(User).count() == 3
+    assert db_session.query(Todo).count() == 7
+
+
+def test_import_reports_failed_chunk_briefly(
+    db_session, monkeypatch, caplog
+):
+    def fail(connection, rows):
+        raise OperationalError("UPDATE todo_summaries", {}, Exception())
+
+    monkeypatch.setattr(TodoSummaryService, "add_todos", fail)
+    body = "phone_number,title\n5550001,A\n5550002,B\n"
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await ImportService.import_todos(db, body, "csv")
+
+    report = asyncio.run(run())
+    assert report["imported"] == 0
+    assert report["errors"] == [
+        {"row": 1, "error": CHUNK_FAILED},
+        {"row": 2, "error": CHUNK_FAILED},
+    ]
+    assert caplog.text.count("Importing rows 1-2 failed") == 1
+    assert db_session.query(Todo).count() == 0
+
+
+def test_import_rejects_unknown_content_type():
+    response = client.post(
+        "/schedules/import/",
+        content="{}",
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 415
+
+
+# Write coalescing Tests
+@pytest.fixture
+def commits():
+    committed = []
+
+    def on_commit(conn):
+        committed.append(conn)
+
+    event.listen(async_engine.sync_engine, "commit", on_commit)
+    yield committed
+    event.remove(async_engine.sync_engine, "commit", on_commit)
+
+
+def test_coalescer_groups_concurrent_creates(
+    db_session, test_user, commits
+):
+    coalescer = WriteCoalescer(
+        ScheduleService.handle_create_todo,
+        TestingAsyncSessionLocal,
+        window=0.05,
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                coalescer.submit(
+                    CreateTodoArguments(
+                        phone_number=phone_number,
+                        name="Caller",
+                        title=f"Todo {i}",
+                    )
+                )
+                for i, phone_number in enumerate(
+                    ["1234567890", "5550001", "5550001", "1234567890"]
+                )
+            )
+        )
+
+    assert asyncio.run(run()) == ["success"] * 4
+    assert len(commits) == 1
+    assert db_session.query(Todo).count() == 4
+    assert db_session.query(User).count() == 2
+
+
+def test_coalescer_isolates_failing_writes(db_session, test_user):
+    async def handler(db, args):
+        if args.title == "boom":
+            raise RuntimeError("boom")
+        return await ScheduleService.handle_create_todo(db, args)
+
+    coalescer = WriteCoalescer(
+        handler, TestingAsyncSessionLocal, window=0.05
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                coalescer.submit(
+                    CreateTodoArguments(
+                        phone_number="1234567890", title=title
+                    )
+                )
+                for title in ["ok 1", "boom", "ok 2"]
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert results[0] == results[2] == "success"
+    assert isinstance(results[1], RuntimeError)
+    titles = {todo.title for todo in db_session.query(Todo).all()}
+    assert titles == {"ok 1", "ok 2"}
+
+
+def test_create_todo_route_with_coalescing(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "CREATE_TODO_COALESCE_WINDOW_MS", 5)
+    request_data = create_vapi_request(
+        "createTodo",
+        {"phone_number": "5550002", "name": "Caller", "title": "Batched"},
+    )
+
+    response = client.post(
+        "/schedules/create_todo/", json=request_data.model_dump()
+    )
+    assert response.status_code == 200
+    assert response.json()["results"][0]["result"] == "success"
+    assert db_session.query(Todo).one().title == "Batched"
+
+
+# Metrics Tests
+def test_metrics_label_requests_by_route_and_tool(db_session, test_user):
+    client.post(
+        "/schedules/get_todos/",
+        json=create_vapi_request(
+            "getTodos", {"phone_number": "1234567890"}
+        ).model_dump(),
+    )
+    client.post(
+        "/schedules/delete_todo/",
+        json=create_vapi_request(
+            "deleteTodo", {"phone_number": "1234567890", "title": "Nope"}
+        ).model_dump(),
+    )
+    client.post(
+        "/tools/",
+        json=create_vapi_request(
+            "completeTodo", {"phone_number": "1234567890", "title": "Nope"}
+        ).model_dump(),
+    )
+
+    client.post(
+        "/tools/",
+        json={
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": f"call-{name}",
+                        "function": {
+                            "name": name,
+                            "arguments": {"phone_number": "1234567890"},
+                        },
+                    }
+                    for name in ("getTodos", "getTodoSummary", "getTodos")
+                ]
+            }
+        },
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="POST",'
+        'route="/schedules/get_todos/",tool="getTodos"}'
+    ) in text
+    assert (
+        'http_request_errors_total{route="/schedules/delete_todo/",'
+        'tool="deleteTodo",status="404"}'
+    ) in text
+    assert (
+        'tool_call_errors_total{tool="completeTodo",status="404"}' in text
+    )
+    # Batches are labelled by their distinct tools, in name order.
+    assert 'route="/tools/",tool="getTodoSummary+getTodos"}' in text
+    assert "http_requests_in_progress 1" in text
+    assert "db_pool_checkout_wait_seconds_count" in text
+
+
+# SQL profiler Tests
+def test_sql_profiler_reports_repeated_statements(
+    db_session, test_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "SQL_PROFILING_ENABLED", True)
+    profiled_app = get_application()
+    profiled_app.dependency_overrides = app.dependency_overrides
+    sql_profiler.instrument(async_engine.sync_engine)
+
+    response = TestClient(profiled_app).post(
+        "/tools/",
+        json={
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": f"call-{i}",
+                        "function": {
+                            "name": "getTodos",
+                            "arguments": {
+                                "phone_number": "1234567890",
+                                "limit": i + 1,
+                            },
+                        },
+                    }
+                    for i in range(3)
+                ]
+            }
+        },
+    )
+    assert response.status_code == 200
+    header = response.headers["X-SQL-Profile"]
+    assert "repeated=1" in header
+
+    debug = TestClient(profiled_app).get("/debug/sql/").json()
+    profile = debug["requests"][0]
+    assert profile["path"] == "/tools/"
+    assert profile["repeated"][0]["count"] == 3
+    assert profile["repeated"][0]["distinct_parameters"] == 3
+
+
+# getTodos cache Tests
+@pytest.fixture
+def queries():
+    statements = []
+
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", on_execute
+    )
+    yield statements
+    event.remove(
+        async_engine.sync_engine, "before_cursor_execute", on_execute
+    )
+
+
+def get_todos(**args):
+    response = client.post(
+        "/schedules/get_todos/",
+        json=create_vapi_request(
+            "getTodos", {"phone_number": "1234567890", **args}
+        ).model_dump(),
+    )
+    assert response.status_code == 200
+    return response.json()["results"][0]["result"]
+
+
+def test_repeated_get_todos_served_from_cache(
+    db_session, test_user, test_todo, queries
+):
+    first = get_todos()
+    queries.clear()
+
+    assert get_todos() == first
+    assert queries == []
+
+    assert get_todos(completed=True) == []
+    assert queries != []
+
+
+def test_todo_writes_invalidate_cached_list(
+    db_session, test_user, test_todo
+):
+    assert get_todos()[0]["completed"] is False
+
+    client.post(
+        "/schedules/complete_todo/",
+        json=create_vapi_request(
+            "completeTodo", {"phone_number": "1234567890", "title": "test"}
+        ).model_dump(),
+    )
+    assert get_todos()[0]["completed"] is True
+
+    client.post(
+        "/schedules/create_todo/",
+        json=create_vapi_request(
+            "createTodo", {"phone_number": "1234567890", "title": "Second"}
+        ).model_dump(),
+    )
+    assert [todo["title"] for todo in get_todos()] == [
+        "Test Todo",
+        "Second",
+    ]
+
+    client.post(
+        "/schedules/import/",
+        content="phone_number,title\n1234567890,Imported\n",
+        headers={"Content-Type": "text/csv"},
+    )
+    assert len(get_todos()) == 3
+
+
+def test_get_todos_from_a_replica_not_cached(
+    db_session, test_user, test_todo
+):
+    args = GetTodosArguments(phone_number="1234567890")
+
+    async def run(replica):
+        async with TestingAsyncSessionLocal() as db:
+            db.info["replica"] = replica
+            await ScheduleService.handle_get_todos(db, args)
+        return await todo_list_cache.get(test_user.id, args)
+
+    assert asyncio.run(run(replica=True))[1] is None
+    assert asyncio.run(run(replica=False))[1] is not None
+
+
+@pytest.mark.parametrize(
+    "backend,workers,expected",
+    [
+        ("auto", 1, "memory"),
+        ("auto", 4, "none"),
+        ("memory", 4, "memory"),
+        ("redis", 1, "redis"),
+    ],
+)
+def test_todo_cache_backend_follows_worker_count(
+    monkeypatch, backend, workers, expected
+):
+    monkeypatch.setattr(settings, "TODO_CACHE_BACKEND", backend)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", workers)
+
+    assert backend_name() == expected
+    if expected == "none":
+        assert make_backend() is None
+
+
+def test_get_todos_reads_own_writes_in_a_batch(db_session, test_user):
+    assert get_todos() == []
+
+    response = client.post(
+        "/tools/",
+        json={
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": "call-1",
+                        "function": {
+                            "name": "createTodo",
+                            "arguments": {
+                                "phone_number": "1234567890",
+                                "title": "Fresh",
+                            },
+                        },
+                    },
+                    {
+                        "id": "call-2",
+                        "function": {
+                            "name": "getTodos",
+                            "arguments": {"phone_number": "1234567890"},
+                        },
+                    },
+                ]
+            }
+        },
+    )
+    results = response.json()["results"]
+    assert [todo["title"] for todo in results[1]["result"]] == ["Fresh"]
+    assert [todo["title"] for todo in get_todos()] == ["Fresh"]
+
+
+def test_get_todos_returns_preserialized_rows(db_session, test_user):
+    db_session.add_all(
+        [
+            Todo(title="Blank", description="", owner_id=test_user.id),
+            Todo(
+                title="Full", description="Details", owner_id=test_user.id
+            ),
+        ]
+    )
+    db_session.commit()
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            return await ScheduleService.handle_get_todos(
+                db, GetTodosArguments(phone_number="1234567890")
+            )
+
+    result = asyncio.run(run())
+    assert isinstance(result, orjson.Fragment)
+    assert get_todos() == [
+        {
+            "id": 1,
+            "title": "Blank",
+            "description": None,
+            "completed": False,
+            "due_at": None,
+        },
+        {
+            "id": 2,
+            "title": "Full",
+            "description": "Details",
+            "completed": False,
+            "due_at": None,
+        },
+    ]
+
+
+# Tool argument validation Tests
+def test_tool_arguments_validated_before_handlers_run(db_session):
+    response = client.post(
+        "/schedules/create_todo/",
+        json={
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": "call-1",
+                        "function": {
+                            "name": "createTodo",
+                            "arguments": '{"phone_number": "5550003"}',
+                        },
+                    }
+                ]
+            }
+        },
+    )
+
+    assert response.status_code == 422
+    (error,) = response.json()["detail"]
+    assert error["loc"][-3:] == ["createTodo", "arguments", "title"]
+    assert error["type"] == "missing"
+    assert db_session.query(User).count() == 0
+
+
+@pytest.mark.parametrize(
+    "arguments, field",
+    [
+        ("not json", "arguments"),
+        ({"phone_number": "  "}, "phone_number"),
+        ({"phone_number": "1", "order": "sideways"}, "order"),
+        ({"phone_number": "1", "limit": 0}, "limit"),
+        ({"phone_number": "1", "completed": "maybe"}, "completed"),
+    ],
+)
+def test_get_todos_rejects_invalid_arguments(arguments, field):
+    response = client.post(
+        "/tools/",
+        json={
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": "call-1",
+                        "function": {
+                            "name": "getTodos",
+                            "arguments": arguments,
+                        },
+                    }
+                ]
+            }
+        },
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == field
+
+
+def test_null_optional_text_arguments_accepted(db_session):
+    response = client.post(
+        "/schedules/create_todo/",
+        json=create_vapi_request(
+            "createTodo",
+            {
+                "phone_number": "5550007",
+                "title": "Buy milk",
+                "description": None,
+                "name": None,
+            },
+        ).model_dump(),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["result"] == "success"
+    user = db_session.query(User).filter_by(phone_number="5550007").one()
+    assert user.name == ""
+    assert db_session.query(Todo).one().description == ""
+
+    assert CreateUserArguments(
+        phone_number="5550008", name=None
+    ) == CreateUserArguments(phone_number="5550008")
+
+
+def test_string_arguments_decoded_into_typed_models():
+    request = VapiRequest.model_validate(
+        {
+            "message": {
+                "toolCalls": [
+                    {
+                        "id": "call-1",
+                        "function": {
+                            "name": "getTodos",
+                            "arguments": json.dumps(
+                                {
+                                    "phone_number": " 1234567890 ",
+                                    "order": "DESC",
+                                    "completed": "yes",
+                                    "limit": "5",
+                                }
+                            ),
+                        },
+                    },
+                    {
+                        "id": "call-2",
+                        "function": {"name": "unknown", "arguments": "?"},
+                    },
+                ]
+            }
+        }
+    )
+
+    known, unknown = request.message.toolCalls
+    assert known.function.arguments == GetTodosArguments(
+        phone_number="1234567890", order="desc", completed=True, limit=5
+    )
+    assert isinstance(unknown.function, ToolCallFunction)
+
+
+# Todo summary Tests
+def todo_summary(phone_number: str = "1234567890") -> dict:
+    request_data = create_vapi_request(
+        "getTodoSummary", {"phone_number": phone_number}
+    )
+    response = client.post(
+        "/schedules/get_todo_summary/", json=request_data.model_dump()
+    )
+    assert response.status_code == 200
+    return response.json()["results"][0]["result"]
+
+
+def call_tool(route: str, function_name: str, **args) -> None:
+    request_data = create_vapi_request(
+        function_name, {"phone_number": "1234567890", **args}
+    )
+    response = client.post(route, json=request_data.model_dump())
+    assert response.json()["results"][0]["result"] == "success"
+
+
+def test_todo_summary_follows_writes(db_session, test_user, test_todo):
+    assert todo_summary() == {
+        "total": 1,
+        "completed": 0,
+        "pending": 1,
+        "most_recent": "Test Todo",
+    }
+
+    for title in ("Buy milk", "Call mum"):
+        call_tool("/schedules/create_todo/", "createTodo", title=title)
+    call_tool("/schedules/complete_todo/", "completeTodo", title="milk")
+    call_tool("/schedules/complete_todo/", "completeTodo", title="milk")
+    assert todo_summary() == {
+        "total": 3,
+        "completed": 1,
+        "pending": 2,
+        "most_recent": "Call mum",
+    }
+
+    call_tool("/schedules/delete_todo/", "deleteTodo", title="call mum")
+    call_tool("/schedules/delete_todo/", "deleteTodo", title="buy milk")
+    assert todo_summary() == {
+        "total": 1,
+        "completed": 0,
+        "pending": 1,
+        "most_recent": "Test Todo",
+    }
+
+    response = client.get(f"/users/{test_user.id}/todo_summary/")
+    assert response.status_code == 200
+    assert response.json()["pending"] == 1
+    assert client.get("/users/999/todo_summary/").status_code == 404
+
+
+def test_todo_summary_reads_own_writes_in_a_batch(db_session, test_user):
+    request_data = VapiRequest(
+        message=Message(
+            toolCalls=[
+                ToolCall(
+                    id=f"call-{i}",
+                    function=ToolCallFunction(
+                        name=name,
+                        arguments={"phone_number": "1234567890", **args},
+                    ),
+                )
+                for i, (name, args) in enumerate(
+                    [
+                        ("createTodo", {"title": "A"}),
+                        ("createTodo", {"title": "B"}),
+                        ("completeTodo", {"title": "A"}),
+                        ("getTodoSummary", {}),
+                    ]
+                )
+            ]
+        )
+    )
+
+    response = client.post("/tools/", json=request_data.model_dump())
+    assert response.json()["results"][-1]["result"] == {
+        "total": 2,
+        "completed": 1,
+        "pending": 1,
+        "most_recent": "B",
+    }
+
+
+def test_todo_summary_counts_bulk_imports(db_session, test_user):
+    body = (
+        "phone_number,name,title,description,completed\n"
+        "1234567890,Test User,Imported,,true\n"
+        "5551112222,New User,First,,true\n"
+        "5551112222,New User,Second,,\n"
+    )
+    response = client.post(
+        "/schedules/import/",
+        content=body,
+        headers={"content-type": "text/csv"},
+    )
+    assert response.json()["imported"] == 3
+
+    assert todo_summary() == {
+        "total": 1,
+        "completed": 1,
+        "pending": 0,
+        "most_recent": "Imported",
+    }
+    assert todo_summary("5551112222") == {
+        "total": 2,
+        "completed": 1,
+        "pending": 1,
+        "most_recent": "Second",
+    }
+
+
+def test_todo_summary_counts_coalesced_creates(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "CREATE_TODO_COALESCE_WINDOW_MS", 5)
+    for title in ("First", "Second"):
+        call_tool(
+            "/schedules/create_todo/",
+            "createTodo",
+            name="Caller",
+            title=title,
+        )
+
+    assert todo_summary()["total"] == 2
+    assert todo_summary()["most_recent"] == "Second"
+
+
+def test_todo_summary_rebuilt_when_missing(db_session, test_user):
+    for title in ("A", "B"):
+        db_session.add(Todo(title=title, owner_id=test_user.id))
+    db_session.commit()
+    db_session.query(TodoSummary).delete()
+    db_session.commit()
+
+    # Counted on read, stored again by the next write.
+    assert todo_summary()["total"] == 2
+    call_tool("/schedules/complete_todo/", "completeTodo", title="A")
+    summary = db_session.get(TodoSummary, test_user.id)
+    assert (summary.total, summary.completed) == (2, 1)
+    assert summary.latest_title == "B"
@@ -0,0 +1,57 @@
+import pytest
+
+from app.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram(
+        "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1)
+    )
+    child = histogram.labels("/todos/")
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/todos/",le="0.1"} 2',
+        'latency_seconds_bucket{route="/todos/",le="1"} 3',
+        'latency_seconds_bucket{route="/todos/",le="+Inf"} 4',
+        'latency_seconds_sum{route="/todos/"} 3.65',
+        'latency_seconds_count{route="/todos/"} 4',
+    ]
+
+
+def test_registry_renders_counters_and_gauges():
+    registry = MetricsRegistry()
+    errors = registry.register(
+        Counter("errors_total", "Errors.", ("status",))
+    )
+    in_flight = registry.register(Gauge("in_flight", "In flight."))
+
+    errors.labels("404").inc()
+    errors.labels("404").inc()
+    errors.labels('say "hi"').inc()
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    text = registry.render()
+    assert 'errors_total{status="404"} 2\n' in text
+    assert 'errors_total{status="say \\"hi\\""} 1\n' in text
+    assert "# TYPE in_flight gauge\nin_flight 1\n" in text
+
+
+def test_labels_must_match_label_names():
+    counter = Counter("errors_total", "Errors.", ("route", "status"))
+
+    with pytest.raises(ValueError):
+        counter.labels("/todos/")
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    registry.register(Counter("errors_total", "Errors."))
+
+    with pytest.raises(ValueError):
+        registry.register(Counter("errors_total", "Errors."))
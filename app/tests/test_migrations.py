@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.main import app  # noqa: F401  (registers every model)
+from app.migrations import current_version, head_version, run_migrations
+from app.migrations.versions import v0001_initial
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {
+        table: (
+            {column["name"] for column in inspector.get_columns(table)},
+            {index["name"] for index in inspector.get_indexes(table)},
+        )
+        for table in inspector.get_table_names()
+        if table != "schema_migrations"
+    }
+
+
+def test_migrations_apply_once(engine):
+    with engine.begin() as connection:
+        applied = run_migrations(connection)
+    assert applied == list(range(1, head_version() + 1))
+
+    with engine.begin() as connection:
+        assert run_migrations(connection) == []
+        assert current_version(connection) == head_version()
+
+
+def test_migrated_schema_matches_models(engine, tmp_path):
+    with engine.begin() as connection:
+        run_migrations(connection)
+
+    reference = create_engine(f"sqlite:///{tmp_path / 'reference.db'}")
+    Base.metadata.create_all(reference)
+    assert schema(engine) == schema(reference)
+    reference.dispose()
+
+
+def test_migrations_adopt_database_from_create_all(engine):
+    # Schema as created by create_all before migrations existed.
+    v0001_initial.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (id, name, phone_number) "
+                "VALUES (1, 'a', '1')"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO todos (title, owner_id) "
+                "VALUES ('Buy milk', 1)"
+            )
+        )
+
+    with engine.begin() as connection:
+        run_migrations(connection)
+
+    columns, indexes = schema(engine)["todos"]
+    assert {"due_at", "remind_at", "reminder_attempts"} <= columns
+    assert {
+        "ix_todos_owner_id_completed",
+        "ix_todos_owner_id_title",
+        "ix_todos_remind_at",
+    } <= indexes
+
+    assert "details_at" in schema(engine)["calls"][0]
+
+    # The unscoped FTS5 title index is dropped (see v0006).
+    assert "todos_title_fts" not in inspect(engine).get_table_names()
+
+    with engine.connect() as connection:
+        summary = connection.execute(
+            text(
+                "SELECT total, completed, latest_title "
+                "FROM todo_summaries WHERE user_id = 1"
+            )
+        ).one()
+    assert tuple(summary) == (1, 0, "Buy milk")
@@ -0,0 +1,48 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app.utils.profiler import QueryProfile, SQLProfiler, _current_profile
+
+
+def test_profile_counts_queries_and_flags_repeats(caplog):
+    engine = create_engine("sqlite://")
+    profiler = SQLProfiler(slow_query_ms=0, repeat_threshold=2)
+    profiler.instrument(engine)
+    profiler.instrument(engine)
+
+    profile = QueryProfile("POST", "/tools/")
+    token = _current_profile.set(profile)
+    try:
+        with caplog.at_level(logging.WARNING, "sql_profiler"):
+            with engine.connect() as conn:
+                for value in (1, 2, 2):
+                    conn.execute(text("SELECT :value"), {"value": value})
+                conn.execute(text("SELECT 'once'"))
+    finally:
+        _current_profile.reset(token)
+
+    summary = profiler.finish(profile)
+    assert summary["queries"] == 4
+    assert summary["repeated"] == [
+        {
+            "statement": "SELECT ?",
+            "count": 3,
+            "distinct_parameters": 2,
+            "db_time_ms": summary["repeated"][0]["db_time_ms"],
+        }
+    ]
+    assert profiler.recent[0] is summary
+    assert "Slow query" in caplog.text
+    assert "(2,)" in caplog.text
+
+
+def test_statements_outside_requests_are_not_attributed():
+    engine = create_engine("sqlite://")
+    profiler = SQLProfiler(slow_query_ms=1000)
+    profiler.instrument(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert len(profiler.recent) == 0
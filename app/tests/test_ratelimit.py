@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.tests.test_cache import FakeClock
+from app.utils.ratelimit import (
+    ConcurrencyGate,
+    RedisTokenBucketLimiter,
+    TokenBucketLimiter,
+)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=2, burst=3, clock=clock)
+
+    async def run():
+        waits = [await limiter.acquire("a") for _ in range(4)]
+        other = await limiter.acquire("b")
+        clock.now = 0.5
+        refilled = await limiter.acquire("a")
+        return waits, other, refilled
+
+    waits, other, refilled = asyncio.run(run())
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.5)
+    assert other == 0
+    assert refilled == 0
+
+
+def test_token_bucket_rejects_without_taking_tokens():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=2, clock=clock)
+
+    async def run():
+        assert await limiter.acquire("a") == 0
+        assert await limiter.acquire("a", 2) == pytest.approx(1)
+        return await limiter.acquire("a")
+
+    assert asyncio.run(run()) == 0
+
+
+def test_token_bucket_charges_at_most_a_full_bucket():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=2, clock=clock)
+
+    async def run():
+        passed = await limiter.acquire("a", 5)
+        # Rejected while the bucket refills, then admitted again.
+        rejected = await limiter.acquire("a", 5)
+        clock.now = 2
+        return passed, rejected, await limiter.acquire("a", 5)
+
+    passed, rejected, retried = asyncio.run(run())
+    assert passed == 0
+    assert rejected == pytest.approx(2)
+    assert retried == 0
+
+
+def test_token_bucket_refund_returns_tokens():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=2, clock=clock)
+
+    async def run():
+        await limiter.acquire("a", 2)
+        await limiter.refund("a", 5)
+        return await limiter.acquire("a", 2)
+
+    assert asyncio.run(run()) == 0
+
+
+def test_redis_token_bucket_runs_script_per_key():
+    calls = []
+
+    class FakeRedis:
+        def register_script(self, script):
+            async def run(keys, args):
+                calls.append((keys, args))
+                return b"0.25"
+
+            return run
+
+    limiter = RedisTokenBucketLimiter(FakeRedis(), rate=4, burst=8)
+    assert asyncio.run(limiter.acquire("555", 2)) == 0.25
+    asyncio.run(limiter.refund("555", 2))
+    assert calls == [(["ratelimit:555"], [4, 8, 2])] * 2
+
+
+def test_gate_rejects_when_full():
+    gate = ConcurrencyGate(limit=1)
+
+    async def run():
+        assert await gate.acquire() is True
+        assert await gate.acquire() is False
+        gate.release()
+        return await gate.acquire()
+
+    assert asyncio.run(run()) is True
+    assert gate.active == 1
+
+
+def test_gate_hands_released_slot_to_waiter():
+    gate = ConcurrencyGate(limit=1, timeout=1)
+
+    async def run():
+        await gate.acquire()
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()
+        return await waiter
+
+    assert asyncio.run(run()) is True
+    assert gate.stats() == {"limit": 1, "active": 1, "waiting": 0}
+
+
+def test_gate_waits_at_most_timeout():
+    gate = ConcurrencyGate(limit=1, timeout=0.01)
+
+    async def run():
+        await gate.acquire()
+        admitted = await gate.acquire()
+        gate.release()
+        return admitted
+
+    assert asyncio.run(run()) is False
+    assert gate.stats() == {"limit": 1, "active": 0, "waiting": 0}
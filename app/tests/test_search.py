@@ -0,0 +1,16 @@
+from app.services.search import similarity, trigrams, word_similarity
+
+
+def test_trigrams_match_pg_trgm():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+    assert trigrams("Cat, cat!") == trigrams("cat")
+
+
+def test_similarity_of_identical_titles():
+    assert similarity("Buy milk", "buy MILK") == 1.0
+    assert similarity("", "buy milk") == 0.0
+
+
+def test_word_similarity_favours_partial_titles():
+    assert word_similarity("milk", "Buy milk and eggs") == 1.0
+    assert word_similarity("Non-existent Todo", "Test Todo") < 0.5
@@ -0,0 +1,117 @@
+import asyncio
+
+import httpx
+from fastapi import Body, FastAPI, HTTPException
+
+from app.utils.vapi import VapiHandler
+
+
+class FakeVapi:
+    """In-process stand-in for the Vapi call API."""
+
+    def __init__(
+        self,
+        calls: dict,
+        end_after: int = 1,
+        refuse_numbers: frozenset = frozenset(),
+    ):
+        self.calls = calls
+        self.end_after = end_after
+        self.refuse_numbers = refuse_numbers
+        self.requests: list[str] = []
+        self.placed: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = FastAPI()
+        self.app.get("/call/{call_id}")(self.get_call)
+        self.app.post("/call", status_code=201)(self.create_call)
+
+    async def create_call(self, payload: dict = Body()):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if payload["customer"]["number"] in self.refuse_numbers:
+                raise HTTPException(status_code=400)
+            self.placed.append(payload)
+            return {
+                "id": f"outbound-{len(self.placed)}",
+                "status": "queued",
+            }
+        finally:
+            self.in_flight -= 1
+
+    async def get_call(self, call_id: str):
+        self.requests.append(call_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if call_id not in self.calls:
+                raise HTTPException(status_code=404)
+            seen = self.requests.count(call_id)
+            status = "ended" if seen >= self.end_after else "in-progress"
+            return {**self.calls[call_id], "id": call_id, "status": status}
+        finally:
+            self.in_flight -= 1
+
+    def handler(self) -> VapiHandler:
+        return VapiHandler(
+            base_url="http://vapi.test",
+            transport=httpx.ASGITransport(app=self.app),
+        )
+
+
+CALL = {
+    "createdAt": "2025-01-01T00:00:00Z",
+    "updatedAt": "2025-01-01T00:01:00Z",
+    "type": "outboundPhoneCall",
+    "startedAt": "2025-01-01T00:00:05Z",
+    "endedAt": "2025-01-01T00:01:00Z",
+    "analysis": {"summary": "ok"},
+    "transcript": "hello",
+    "assistantId": "assistant-1",
+}
+
+
+def test_get_call_details_polls_until_ended():
+    fake = FakeVapi({"c1": CALL}, end_after=2)
+
+    async def run():
+        async with fake.handler() as handler:
+            return await handler.get_call_details("c1", backoff=0)
+
+    context = asyncio.run(run())
+    assert context["status"] is True
+    assert context["data"]["transcript"] == "hello"
+    assert context["data"]["status"] == "ended"
+    assert fake.requests == ["c1", "c1"]
+
+
+def test_get_call_details_gives_up_after_attempts():
+    fake = FakeVapi({}, end_after=1)
+
+    async def run():
+        async with fake.handler() as handler:
+            return await handler.get_call_details(
+                "missing", attempts=3, backoff=0
+            )
+
+    assert asyncio.run(run()) == {"status": False}
+    assert len(fake.requests) == 3
+
+
+def test_get_many_call_details_caps_concurrency():
+    call_ids = [f"c{i}" for i in range(8)]
+    fake = FakeVapi({call_id: CALL for call_id in call_ids})
+
+    async def run():
+        async with fake.handler() as handler:
+            return await handler.get_many_call_details(
+                call_ids, concurrency=3, backoff=0
+            )
+
+    results = asyncio.run(run())
+    assert set(results) == set(call_ids)
+    assert all(result["status"] for result in results.values())
+    assert fake.max_in_flight <= 3
@@ -0,0 +1,169 @@
+import itertools
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+
+class LRUCache:
+    """Bounded in-process LRU cache with per-entry expiry.
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped
+    lazily; once ``maxsize`` entries are stored the least recently used
+    one is evicted. Not thread-safe: it is meant to be used from the
+    event loop only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryVersionedCache:
+    """Versioned cache kept in process, for a single worker.
+
+    Values are stored under ``(namespace, version, key)``; bumping a
+    namespace's version makes all of its entries unreachable, and the
+    LRU drops them eventually. Versions come from one process-wide
+    counter, so a namespace whose version was evicted never gets a
+    number that older entries were stored under.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.versions = LRUCache(maxsize=maxsize)
+        self._next_version = itertools.count(1)
+
+    async def get_version(self, namespace: Hashable) -> int:
+        version = self.versions.get(namespace)
+        if version is None:
+            version = next(self._next_version)
+            self.versions.set(namespace, version)
+        return version
+
+    async def bump(self, namespaces: Iterable[Hashable]) -> None:
+        for namespace in namespaces:
+            self.versions.set(namespace, next(self._next_version))
+
+    async def get(self, namespace: Hashable, version: int, key: str):
+        return self.entries.get((namespace, version, key))
+
+    async def set(
+        self, namespace: Hashable, version: int, key: str, value: Any
+    ) -> None:
+        self.entries.set((namespace, version, key), value)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.versions.clear()
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+
+class RedisVersionedCache:
+    """Versioned cache shared by every worker through Redis.
+
+    Versions are counters incremented by ``bump``; values are stored
+    with ``encode`` (JSON by default) and expire after ``ttl`` seconds.
+    A version key outlives every entry stored under it, so once it
+    expires (restarting the counter) no entry that could be confused
+    with the new versions is left.
+    """
+
+    def __init__(
+        self,
+        client,
+        ttl: float = 300,
+        prefix: str = "cache",
+        encode: Callable[[Any], bytes | str] = json.dumps,
+        decode: Callable[[bytes], Any] = json.loads,
+    ):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self.encode = encode
+        self.decode = decode
+
+    def _version_key(self, namespace: Hashable) -> str:
+        return f"{self.prefix}:version:{namespace}"
+
+    async def get_version(self, namespace: Hashable) -> int:
+        version = await self.client.get(self._version_key(namespace))
+        return int(version) if version is not None else 0
+
+    async def bump(self, namespaces: Iterable[Hashable]) -> None:
+        for namespace in namespaces:
+            key = self._version_key(namespace)
+            await self.client.incr(key)
+            await self.client.expire(key, 2 * self.ttl)
+
+    async def get(self, namespace: Hashable, version: int, key: str):
+        value = await self.client.get(
+            f"{self.prefix}:{namespace}:{version}:{key}"
+        )
+        return self.decode(value) if value is not None else None
+
+    async def set(
+        self, namespace: Hashable, version: int, key: str, value: Any
+    ) -> None:
+        await self.client.set(
+            f"{self.prefix}:{namespace}:{version}:{key}",
+            self.encode(value),
+            ex=self.ttl,
+        )
+        if version:
+            await self.client.expire(
+                self._version_key(namespace), 2 * self.ttl
+            )
@@ -0,0 +1,321 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Metrics are plain counters kept in dicts keyed by label values, so
+recording one costs a dict lookup and an addition. Label values must
+come from a bounded set (route templates, registered tool names, status
+codes); never label with raw request data.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from math import inf
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+POOL_WAIT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    5.0,
+    30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _format_labels(names, values, extra: tuple = ()) -> str:
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        + "}"
+    )
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: tuple):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * len(upper_bounds)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """A named metric with one child value per combination of labels."""
+
+    type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: tuple = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _samples(self, values: tuple, child):
+        yield "", _format_labels(self.labelnames, values), child.value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for values, child in list(self._children.items()):
+            for suffix, labels, value in self._samples(values, child):
+                lines.append(
+                    f"{self.name}{suffix}{labels} {_format_value(value)}"
+                )
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        self.upper_bounds = tuple(sorted(buckets)) + (inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _samples(self, values: tuple, child):
+        cumulative = 0
+        for upper_bound, count in zip(self.upper_bounds, child.counts):
+            cumulative += count
+            le = (("le", _format_value(upper_bound)),)
+            yield "_bucket", _format_labels(
+                self.labelnames, values, le
+            ), cumulative
+        labels = _format_labels(self.labelnames, values)
+        yield "_sum", labels, child.sum
+        yield "_count", labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route and tool call function name.",
+        ("method", "route", "tool"),
+    )
+)
+REQUESTS_IN_PROGRESS = registry.register(
+    Gauge("http_requests_in_progress", "Requests currently being served.")
+)
+REQUEST_ERRORS = registry.register(
+    Counter(
+        "http_request_errors_total",
+        "Responses with an error status, by route and tool.",
+        ("route", "tool", "status"),
+    )
+)
+TOOL_CALL_ERRORS = registry.register(
+    Counter(
+        "tool_call_errors_total",
+        "Tool calls answered with an error inside a dispatched batch.",
+        ("tool", "status"),
+    )
+)
+TOOL_CALL_REPLAYS = registry.register(
+    Counter(
+        "tool_call_replays_total",
+        "Retried tool calls answered from their stored result.",
+        ("tool",),
+    )
+)
+TOOL_CALLS_REJECTED = registry.register(
+    Counter(
+        "tool_call_requests_rejected_total",
+        "Tool call requests shed by admission control, by reason.",
+        ("reason",),
+    )
+)
+POOL_CHECKOUT_WAIT = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a database connection from the pool.",
+        buckets=POOL_WAIT_BUCKETS,
+    )
+)
+
+_request_tool_calls: ContextVar[list[str] | None] = ContextVar(
+    "request_tool_calls", default=None
+)
+
+
+def record_tool_call(name: str) -> None:
+    """Label the current request with a (registered) tool name."""
+    tool_calls = _request_tool_calls.get()
+    if tool_calls is not None and name not in tool_calls:
+        tool_calls.append(name)
+
+
+class MetricsMiddleware:
+    """Time every HTTP request and count error responses.
+
+    A pure ASGI middleware: it does not read the body or wrap the
+    response, it only watches the ``http.response.start`` message.
+    Requests are labelled with the route template matched by the router
+    (``unmatched`` for 404s) and the tool names recorded by the handler
+    through ``record_tool_call``, sorted so that a batch gets the same
+    label whatever order its calls came in.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        tool_calls: list[str] = []
+        token = _request_tool_calls.set(tool_calls)
+        REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.dec()
+            _request_tool_calls.reset(token)
+
+            route = getattr(scope.get("route"), "path", "unmatched")
+            tool = "+".join(sorted(tool_calls))
+            REQUEST_DURATION.labels(scope["method"], route, tool).observe(
+                elapsed
+            )
+            if status_code >= 400:
+                REQUEST_ERRORS.labels(route, tool, str(status_code)).inc()
@@ -0,0 +1,209 @@
+"""Opt-in per-request SQL profiling built on SQLAlchemy engine events.
+
+Enabled with ``SQL_PROFILING_ENABLED``. Every statement executed while a
+request is being served is attributed to that request, which then
+reports its query count, DB time and any statement run repeatedly (the
+usual sign of an N+1 pattern). Slow statements are logged with their
+parameters, so only enable this where logging caller data is fine.
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("sql_profiler")
+
+PROFILE_HEADER = "X-SQL-Profile"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryProfile:
+    """Statements executed on behalf of one request."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.status: int | None = None
+        self.queries = 0
+        self.db_time = 0.0
+        # statement -> [executions, seconds, distinct parameter sets]
+        self.statements: dict[str, list] = {}
+
+    def record(self, statement: str, parameters, elapsed: float) -> None:
+        self.queries += 1
+        self.db_time += elapsed
+        entry = self.statements.get(statement)
+        if entry is None:
+            entry = self.statements[statement] = [0, 0.0, set()]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2].add(repr(parameters))
+
+    def repeated(self, threshold: int) -> list[dict]:
+        """Statements executed at least ``threshold`` times."""
+        return [
+            {
+                "statement": statement,
+                "count": count,
+                "distinct_parameters": len(parameters),
+                "db_time_ms": round(seconds * 1000, 3),
+            }
+            for statement, (count, seconds, parameters) in sorted(
+                self.statements.items(), key=lambda item: -item[1][0]
+            )
+            if count >= threshold
+        ]
+
+    def header(self, threshold: int) -> str:
+        return (
+            f"queries={self.queries}; "
+            f"db_time_ms={self.db_time * 1000:.2f}; "
+            f"repeated={len(self.repeated(threshold))}"
+        )
+
+    def summary(self, threshold: int) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "queries": self.queries,
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "repeated": self.repeated(threshold),
+        }
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "sql_profile", default=None
+)
+
+
+class SQLProfiler:
+    """Attribute engine activity to the request being served.
+
+    Args:
+        slow_query_ms: Statements taking at least this long are logged
+            with their parameters.
+        repeat_threshold: Executions of one statement within a request
+            at which it is reported as repeated.
+        history: Number of request summaries kept for the debug
+            endpoint.
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 100,
+        repeat_threshold: int = 2,
+        history: int = 100,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.repeat_threshold = repeat_threshold
+        self.recent: deque[dict] = deque(maxlen=history)
+
+    def instrument(self, engine: Engine) -> None:
+        """Listen to an engine (``AsyncEngine.sync_engine`` for async)."""
+        if event.contains(engine, "before_cursor_execute", self._before):
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def _before(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("sql_profiler_started", []).append(
+            time.perf_counter()
+        )
+
+    def _after(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        elapsed = (
+            time.perf_counter() - conn.info["sql_profiler_started"].pop()
+        )
+        statement = _WHITESPACE.sub(" ", statement).strip()
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, parameters, elapsed)
+
+        if elapsed * 1000 >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms) during %s: %s parameters=%r",
+                elapsed * 1000,
+                f"{profile.method} {profile.path}" if profile else "-",
+                statement,
+                parameters,
+            )
+
+    def _error(self, exception_context):
+        connection = exception_context.connection
+        if connection is not None:
+            started = connection.info.get("sql_profiler_started")
+            if started:
+                started.pop()
+
+    def finish(self, profile: QueryProfile) -> dict:
+        summary = profile.summary(self.repeat_threshold)
+        self.recent.appendleft(summary)
+        if summary["repeated"]:
+            logger.warning(
+                "%s %s ran %d repeated statements (%d queries)",
+                profile.method,
+                profile.path,
+                len(summary["repeated"]),
+                profile.queries,
+            )
+        return summary
+
+
+sql_profiler = SQLProfiler(
+    slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+    repeat_threshold=settings.SQL_REPEATED_STATEMENT_THRESHOLD,
+    history=settings.SQL_PROFILE_HISTORY,
+)
+
+
+class SQLProfilerMiddleware:
+    """Profile each HTTP request and report it in ``X-SQL-Profile``.
+
+    The header is written when the response starts, so statements run
+    while a streaming body is produced only show up in the debug
+    endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: SQLProfiler = sql_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(scope["method"], scope["path"])
+        token = _current_profile.set(profile)
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message).append(
+                    PROFILE_HEADER,
+                    profile.header(self.profiler.repeat_threshold),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            self.profiler.finish(profile)
@@ -0,0 +1,195 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Hashable
+
+from app.utils.cache import LRUCache
+
+
+class TokenBucketLimiter:
+    """Token buckets kept in process, one per key.
+
+    Each bucket holds up to ``burst`` tokens and refills at ``rate``
+    tokens per second. Buckets live in an LRU so the number of keys
+    tracked is bounded; an evicted bucket simply starts full again.
+    Not thread-safe: it is meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        maxsize: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._buckets = LRUCache(maxsize=maxsize)
+
+    def _available(self, key: Hashable, now: float) -> float:
+        available, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, available + (now - updated) * self.rate)
+
+    async def acquire(self, key: Hashable, tokens: int = 1) -> float:
+        """Take ``tokens`` from the bucket of ``key``.
+
+        At most ``burst`` tokens are charged, so a request larger than
+        the bucket still passes once the bucket is full.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds
+            until the bucket holds enough of them.
+        """
+        tokens = min(tokens, self.burst)
+        now = self._clock()
+        available = self._available(key, now)
+        wait = 0.0
+        if available >= tokens:
+            available -= tokens
+        else:
+            wait = (tokens - available) / self.rate
+        self._buckets.set(key, (available, now))
+        return wait
+
+    async def refund(self, key: Hashable, tokens: int = 1) -> None:
+        """Give back tokens taken for a request that was not served."""
+        tokens = min(tokens, self.burst)
+        now = self._clock()
+        self._buckets.set(
+            key, (min(self.burst, self._available(key, now) + tokens), now)
+        )
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+# KEYS[1]: bucket, ARGV: rate, burst, tokens. Uses the Redis clock so
+# that workers with skewed clocks share one view of the bucket.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = math.min(tonumber(ARGV[3]), burst)
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+# Same arguments; puts ``tokens`` back, up to ``burst``.
+TOKEN_REFUND_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local refunded = math.min(tonumber(ARGV[3]), burst)
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(
+    burst, tokens + math.max(0, now - updated) * rate + refunded
+)
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return 1
+"""
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets shared by every worker through Redis.
+
+    Same behaviour as ``TokenBucketLimiter``; each ``acquire`` is one
+    atomic script call. Buckets expire once they would be full again.
+    """
+
+    def __init__(
+        self, client, rate: float, burst: int, prefix: str = "ratelimit"
+    ):
+        self.client = client
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._refund_script = client.register_script(TOKEN_REFUND_SCRIPT)
+
+    async def acquire(self, key: Hashable, tokens: int = 1) -> float:
+        wait = await self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[self.rate, self.burst, tokens],
+        )
+        return float(wait)
+
+    async def refund(self, key: Hashable, tokens: int = 1) -> None:
+        await self._refund_script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[self.rate, self.burst, tokens],
+        )
+
+
+class ConcurrencyGate:
+    """Admit at most ``limit`` holders at a time.
+
+    Unlike a semaphore, callers never queue indefinitely: when the gate
+    is full ``acquire`` waits at most ``timeout`` seconds for a slot
+    (in arrival order) and then gives up, so overload is answered
+    quickly instead of piling up requests.
+    """
+
+    def __init__(self, limit: int, timeout: float = 0.0):
+        self.limit = limit
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        """Take a slot; return False if none freed up in time."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if self.timeout <= 0:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            async with asyncio.timeout(self.timeout):
+                await future
+        except TimeoutError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over as the timeout fired.
+                return True
+            if future in self._waiters:
+                self._waiters.remove(future)
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, if any.
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(True)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": len(self._waiters),
+        }
@@ -1,22 +1,55 @@
+import asyncio
 import logging
-import time
+from typing import Iterable
 
-import requests
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.services.calls import CallService
 
 logger = logging.getLogger("vapi")
 
+CALL_DETAIL_FIELDS = (
+    "id",
+    "createdAt",
+    "updatedAt",
+    "type",
+    "status",
+    "startedAt",
+    "endedAt",
+    "analysis",
+    "transcript",
+    "assistantId",
+)
+
 
 class VapiHandler:
     """
-    this method handle communicating with various payment gateways
+    this method handle communicating with the Vapi REST API
+
+    A single ``httpx.AsyncClient`` is shared by every request so
+    connections are kept alive and pooled; it is created on first use
+    and released with ``aclose``.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        max_connections: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.public_key = settings.VAPI_API_PUBLIC_KEY
         self.secret_key = settings.VAPI_API_PRIVATE_KEY
+        self.base_url = base_url or settings.VAPI_BASE_URL
+        self.timeout = timeout or settings.VAPI_TIMEOUT
+        self.max_connections = (
+            max_connections or settings.VAPI_MAX_CONNECTIONS
+        )
+        self.transport = transport
         self.context = {}
+        self._client: httpx.AsyncClient | None = None
 
     def get_header(self):
         return {
@@ -24,35 +57,160 @@ class VapiHandler:
             "Authorization": f"Bearer {self.secret_key}",
         }
 
-    async def get_call_details(self, call_id: str) -> dict:
-        url = f"https://api.vapi.ai.call/{call_id}"
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.get_header(),
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "VapiHandler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def get_call(self, call_id: str) -> dict:
+        """Fetch the raw call resource.
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses.
+        """
+        response = await self.client.get(f"/call/{call_id}")
+        response.raise_for_status()
+        return response.json()
+
+    async def create_call(
+        self,
+        phone_number: str,
+        customer_name: str | None = None,
+        variables: dict | None = None,
+    ) -> dict:
+        """Place an outbound call with the default assistant.
+
+        Args:
+            phone_number: Number to call.
+            customer_name: Name of the person called, if known.
+            variables: Values for the assistant's ``{{variables}}``.
+
+        Returns:
+            dict: The created call resource.
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses.
+        """
+        customer = {"number": phone_number}
+        if customer_name:
+            customer["name"] = customer_name
+        response = await self.client.post(
+            "/call",
+            json={
+                "assistantId": settings.DEFAULT_ASSISTANT_ID,
+                "phoneNumberId": settings.PhoneNumberID,
+                "customer": customer,
+                "assistantOverrides": {"variableValues": variables or {}},
+            },
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_call_details(
+        self,
+        call_id: str,
+        attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 8.0,
+        db: AsyncSession | None = None,
+    ) -> dict:
+        """Poll a call until it has ended and extract its details.
+
+        When a session is given, calls already stored from the
+        end-of-call webhook are served without contacting Vapi, and
+        details fetched by polling are stored for next time.
+
+        Otherwise waits ``backoff``, ``2 * backoff``, ... (capped at
+        ``max_backoff``) between attempts without blocking the event
+        loop. Transport errors and error responses count as a failed
+        attempt.
+
+        Returns:
+            dict: ``{"status": True, "data": {...}}`` once the call has
+            ended, ``{"status": False}`` if it did not end in time.
+        """
+        if db is not None:
+            data = await CallService.get_call_details(db, call_id)
+            if data is not None:
+                return {"data": data, "status": True}
 
-        counter = 1
-        status = True
         context = {"status": False}
-        while status:
-            response = requests.get(url, headers=self.get_header())
-            result = response.json()
-            if result["status"] in ["ended"]:
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(
+                    min(backoff * 2 ** (attempt - 1), max_backoff)
+                )
+            try:
+                result = await self.get_call(call_id)
+            except httpx.HTTPError as e:
+                logger.warning("Fetching call %s failed: %s", call_id, e)
+                continue
+
+            if result.get("status") in ["ended"]:
                 data = {
-                    "id": result["id"],
-                    "createdAt": result["createdAt"],
-                    "updatedAt": result["updatedAt"],
-                    "type": result["type"],
-                    "status": result["status"],
-                    "startedAt": result["startedAt"],
-                    "endedAt": result["endedAt"],
-                    "analysis": result["analysis"],
-                    "transcript": result["transcript"],
-                    "assistantId": result["assistantId"],
+                    field: result.get(field)
+                    for field in CALL_DETAIL_FIELDS
                 }
                 context.update({"data": data, "status": True})
+                if db is not None:
+                    await CallService.record_call_details(db, data)
                 break
-            if counter == 3:
-                break
-            counter = counter + 1
-            time.sleep(3)
         return context
 
+    async def get_many_call_details(
+        self,
+        call_ids: Iterable[str],
+        concurrency: int = 10,
+        **kwargs,
+    ) -> dict[str, dict]:
+        """Fetch details of several calls concurrently.
+
+        Args:
+            call_ids: Calls to fetch.
+            concurrency: Maximum number of calls polled at once.
+            **kwargs: Forwarded to ``get_call_details``.
+
+        Returns:
+            dict[str, dict]: ``get_call_details`` result per call id.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(call_id: str) -> dict:
+            async with semaphore:
+                return await self.get_call_details(call_id, **kwargs)
+
+        call_ids = list(dict.fromkeys(call_ids))
+        results = await asyncio.gather(*(fetch(c) for c in call_ids))
+        return dict(zip(call_ids, results))
+
+
+_vapi_handler: VapiHandler | None = None
+
 
-vapi_handler = VapiHandler()
+def get_vapi_handler() -> VapiHandler:
+    """Shared client for the API process, created on first use."""
+    global _vapi_handler
+    if _vapi_handler is None:
+        _vapi_handler = VapiHandler()
+    return _vapi_handler
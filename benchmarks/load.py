@@ -0,0 +1,271 @@
+"""Replay Vapi tool-call traffic against the API and report latencies.
+
+Runs in-process through ``httpx.ASGITransport`` (against a throwaway
+SQLite database) or over HTTP against a running server::
+
+    python -m benchmarks.load --requests 2000 --concurrency 16
+    python -m benchmarks.load --url http://localhost:8000 --dispatcher
+    python -m benchmarks.load --baseline benchmarks/baseline.json
+
+Throughput and p50/p95/p99 latency are reported per tool name. With
+``--baseline`` the run is compared against a stored report and exits
+non-zero on regressions; ``--save-baseline`` writes the current report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import httpx
+
+from benchmarks.payloads import WorkloadGenerator
+
+ROUTES = {
+    "createUser": "/users/",
+    "createTodo": "/schedules/create_todo/",
+    "getTodos": "/schedules/get_todos/",
+    "completeTodo": "/schedules/complete_todo/",
+    "deleteTodo": "/schedules/delete_todo/",
+}
+DISPATCHER_ROUTE = "/tools/"
+
+
+@dataclass
+class Sample:
+    tool: str
+    latency: float
+    ok: bool
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _stats(samples: list[Sample], elapsed: float) -> dict:
+    latencies = [sample.latency * 1000 for sample in samples]
+    return {
+        "count": len(samples),
+        "errors": sum(not sample.ok for sample in samples),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    """Aggregate samples per tool name plus an overall ``total``."""
+    by_tool = defaultdict(list)
+    for sample in samples:
+        by_tool[sample.tool].append(sample)
+    report = {
+        tool: _stats(tool_samples, elapsed)
+        for tool, tool_samples in sorted(by_tool.items())
+    }
+    report["total"] = _stats(samples, elapsed)
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25):
+    """List regressions of ``report`` against ``baseline``.
+
+    A tool regresses when its p95 latency grows, or its throughput
+    drops, by more than ``tolerance`` (a fraction of the baseline).
+    """
+    regressions = []
+    for tool, stats in report.items():
+        reference = baseline.get(tool)
+        if reference is None:
+            continue
+        if stats["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{tool}: p95 {stats['p95_ms']:.1f}ms vs "
+                f"{reference['p95_ms']:.1f}ms baseline"
+            )
+        if stats["throughput"] < reference["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{tool}: throughput {stats['throughput']:.1f}/s vs "
+                f"{reference['throughput']:.1f}/s baseline"
+            )
+    return regressions
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    calls: list[tuple[str, dict]],
+    concurrency: int,
+    dispatcher: bool = False,
+) -> tuple[list[Sample], float]:
+    """Send ``calls`` with up to ``concurrency`` requests in flight."""
+    samples = []
+    pending = iter(calls)
+
+    async def worker():
+        for tool, payload in pending:
+            route = DISPATCHER_ROUTE if dispatcher else ROUTES[tool]
+            started = time.perf_counter()
+            try:
+                response = await client.post(route, json=payload)
+                ok = response.status_code < 400 and not any(
+                    "error" in result
+                    for result in response.json().get("results", [])
+                )
+            except (httpx.HTTPError, ValueError):
+                ok = False
+            samples.append(Sample(tool, time.perf_counter() - started, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+async def benchmark(
+    client: httpx.AsyncClient,
+    generator: WorkloadGenerator,
+    requests: int,
+    concurrency: int,
+    dispatcher: bool = False,
+) -> dict:
+    """Seed users and todos, then measure a mixed workload."""
+    setup_samples, setup_elapsed = [], 0.0
+    for phase in generator.setup():
+        samples, elapsed = await replay(
+            client, phase, concurrency, dispatcher
+        )
+        setup_samples.extend(samples)
+        setup_elapsed += elapsed
+    samples, elapsed = await replay(
+        client, generator.mixed(requests), concurrency, dispatcher
+    )
+    return {
+        "setup": summarize(setup_samples, setup_elapsed)["total"],
+        "mixed": summarize(samples, elapsed),
+    }
+
+
+def configure_environment() -> None:
+    """Point the app at a throwaway database before it is imported."""
+    os.environ["SQLITE_FILE_NAME"] = os.path.join(
+        tempfile.mkdtemp(), "bench.db"
+    )
+    for key in (
+        "VAPI_API_PUBLIC_KEY",
+        "VAPI_API_PRIVATE_KEY",
+        "DEFAULT_ASSISTANT_ID",
+        "MODEL",
+        "PhoneNumberID",
+    ):
+        os.environ.setdefault(key, "bench")
+    # A few simulated callers generate far more traffic than real ones;
+    # the per-caller limit would only measure how fast calls are shed.
+    os.environ.setdefault("CALLER_RATE_LIMIT", "0")
+
+
+async def run_in_process(args) -> dict:
+    configure_environment()
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(
+                app=app, raise_app_exceptions=False
+            ),
+            base_url="http://bench",
+        ) as client:
+            return await run(client, args)
+
+
+async def run_over_http(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=30
+    ) as client:
+        return await run(client, args)
+
+
+async def run(client: httpx.AsyncClient, args) -> dict:
+    generator = WorkloadGenerator(
+        users=args.users,
+        todos_per_user=args.todos_per_user,
+        seed=args.seed,
+    )
+    return await benchmark(
+        client, generator, args.requests, args.concurrency, args.dispatcher
+    )
+
+
+def print_report(report: dict) -> None:
+    setup = report["setup"]
+    print(
+        f"setup: {setup['count']} calls, "
+        f"{setup['throughput']:.1f}/s, {setup['errors']} errors"
+    )
+    print(
+        f"{'tool':<14}{'count':>7}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for tool, stats in report["mixed"].items():
+        print(
+            f"{tool:<14}{stats['count']:>7}{stats['errors']:>8}"
+            f"{stats['throughput']:>9.1f}{stats['p50_ms']:>9.2f}"
+            f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", help="Target server; in-process if unset")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos-per-user", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--dispatcher",
+        action="store_true",
+        help="Send every call through POST /tools/",
+    )
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--save-baseline", help="Write the report here")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    runner = run_over_http if args.url else run_in_process
+    report = asyncio.run(runner(args))
+    print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            report["mixed"], baseline["mixed"], args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
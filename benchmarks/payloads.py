@@ -0,0 +1,169 @@
+"""Realistic Vapi tool-call payloads for load testing.
+
+``WorkloadGenerator`` produces ``(tool name, payload)`` pairs: a setup
+phase registering users and seeding their todos, followed by a weighted
+mix of the tool calls a voice assistant makes during conversations.
+Titles are tracked per user so that completeTodo/deleteTodo refer to
+existing todos (using the lower-cased, partially spoken form a
+transcriber would produce).
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+
+DEFAULT_MIX = {
+    "getTodos": 0.40,
+    "createTodo": 0.30,
+    "completeTodo": 0.15,
+    "deleteTodo": 0.10,
+    "createUser": 0.05,
+}
+
+VERBS = ["Buy", "Call", "Email", "Pay", "Book", "Pick up", "Fix", "Clean"]
+OBJECTS = [
+    "milk",
+    "the plumber",
+    "mum",
+    "rent",
+    "dentist appointment",
+    "dry cleaning",
+    "the car",
+    "garage",
+    "birthday present",
+    "flight tickets",
+]
+
+
+def tool_call_payload(name: str, arguments: dict) -> dict:
+    """Wrap one tool call in a VapiRequest body."""
+    return {
+        "message": {
+            "toolCalls": [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "function": {"name": name, "arguments": arguments},
+                }
+            ]
+        }
+    }
+
+
+@dataclass
+class WorkloadGenerator:
+    users: int = 50
+    todos_per_user: int = 20
+    mix: dict = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 0
+
+    def __post_init__(self):
+        self.random = random.Random(self.seed)
+        self.phone_numbers: list[str] = []
+        self.titles: dict[str, list[str]] = {}
+
+    def _phone_number(self, targetable: bool) -> str:
+        number = f"+1555{len(self.titles):07d}"
+        self.titles[number] = []
+        if targetable:
+            self.phone_numbers.append(number)
+        return number
+
+    def _title(self) -> str:
+        return (
+            f"{self.random.choice(VERBS)} {self.random.choice(OBJECTS)} "
+            f"#{self.random.randint(1, 9999)}"
+        )
+
+    def create_user(self, targetable: bool = True) -> tuple[str, dict]:
+        phone_number = self._phone_number(targetable)
+        return "createUser", tool_call_payload(
+            "createUser",
+            {
+                "name": f"Caller {phone_number[-4:]}",
+                "phone_number": phone_number,
+            },
+        )
+
+    def create_todo(self, phone_number: str) -> tuple[str, dict]:
+        title = self._title()
+        self.titles[phone_number].append(title)
+        return "createTodo", tool_call_payload(
+            "createTodo",
+            {
+                "phone_number": phone_number,
+                "title": title,
+                "description": "Added during load test",
+            },
+        )
+
+    def get_todos(self, phone_number: str) -> tuple[str, dict]:
+        return "getTodos", tool_call_payload(
+            "getTodos", {"phone_number": phone_number}
+        )
+
+    def _spoken_title(self, phone_number: str, remove: bool) -> str:
+        titles = self.titles[phone_number]
+        index = self.random.randrange(len(titles))
+        title = titles.pop(index) if remove else titles[index]
+        return title.lower()
+
+    def complete_todo(self, phone_number: str) -> tuple[str, dict]:
+        return "completeTodo", tool_call_payload(
+            "completeTodo",
+            {
+                "phone_number": phone_number,
+                "title": self._spoken_title(phone_number, remove=False),
+            },
+        )
+
+    def delete_todo(self, phone_number: str) -> tuple[str, dict]:
+        return "deleteTodo", tool_call_payload(
+            "deleteTodo",
+            {
+                "phone_number": phone_number,
+                "title": self._spoken_title(phone_number, remove=True),
+            },
+        )
+
+    def setup(self) -> list[list[tuple[str, dict]]]:
+        """Phases registering every user, then seeding their todos.
+
+        Each phase must finish before the next starts, otherwise a
+        createTodo could race the createUser of the same caller.
+        """
+        users = [self.create_user() for _ in range(self.users)]
+        todos = [
+            self.create_todo(phone_number)
+            for phone_number in self.phone_numbers
+            for _ in range(self.todos_per_user)
+        ]
+        return [users, todos]
+
+    def mixed(self, count: int) -> list[tuple[str, dict]]:
+        """Draw ``count`` tool calls according to the mix weights.
+
+        Callers registered here are not targeted by later calls, since
+        their createUser may still be in flight when those are sent.
+        """
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        calls = []
+        for name in self.random.choices(names, weights, k=count):
+            if name == "createUser" or not self.phone_numbers:
+                calls.append(self.create_user(targetable=False))
+                continue
+            phone_number = self.random.choice(self.phone_numbers)
+            if (
+                name in ("completeTodo", "deleteTodo")
+                and not self.titles[phone_number]
+            ):
+                name = "createTodo"
+            calls.append(
+                {
+                    "getTodos": self.get_todos,
+                    "createTodo": self.create_todo,
+                    "completeTodo": self.complete_todo,
+                    "deleteTodo": self.delete_todo,
+                }[name](phone_number)
+            )
+        return calls
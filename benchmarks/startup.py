@@ -0,0 +1,170 @@
+"""Measure how long a fresh worker takes to serve its first tool calls.
+
+Each run starts a new interpreter against a throwaway SQLite database,
+as an autoscaled worker would, and times:
+
+- ``import_ms``: importing ``app.main``;
+- ``startup_ms``: the lifespan startup (migrations, pool prewarming);
+- ``first_request_ms``: the first call (createUser), which opens the
+  database connections unless they were prewarmed;
+- ``second_request_ms``: the next one (getTodos), on a warm worker.
+
+::
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --baseline benchmarks/startup.json
+
+The median of each metric over the runs is reported. With
+``--baseline`` the run is compared against a stored report and exits
+non-zero on regressions; ``--save-baseline`` writes the current report.
+"""
+
+# Only the standard library is imported at module level: the child
+# process times the import of the app, which must not find its
+# dependencies already loaded.
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+METRICS = (
+    "import_ms",
+    "startup_ms",
+    "first_request_ms",
+    "second_request_ms",
+)
+PHONE_NUMBER = "+15550000001"
+# (metric, tool, route) of the calls a new caller's conversation opens
+# with.
+REQUESTS = [
+    ("first_request_ms", "createUser", "/users/"),
+    ("second_request_ms", "getTodos", "/schedules/get_todos/"),
+]
+
+
+async def measure() -> dict:
+    """Time one cold start in the current (fresh) interpreter."""
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+
+    import httpx
+
+    from benchmarks.payloads import tool_call_payload
+
+    timings = {"import_ms": (imported - started) * 1000}
+    responses = []
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = (time.perf_counter() - started) * 1000
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+        ) as client:
+            for metric, tool, route in REQUESTS:
+                payload = tool_call_payload(
+                    tool,
+                    (
+                        {"phone_number": PHONE_NUMBER, "name": "Caller"}
+                        if tool == "createUser"
+                        else {"phone_number": PHONE_NUMBER}
+                    ),
+                )
+                started = time.perf_counter()
+                responses.append(await client.post(route, json=payload))
+                timings[metric] = (time.perf_counter() - started) * 1000
+    # Checked once the app has shut down, which an error would skip.
+    for response in responses:
+        response.raise_for_status()
+    return timings
+
+
+def run_once() -> dict:
+    """Measure a cold start in a child interpreter."""
+    from benchmarks.load import configure_environment
+
+    configure_environment()
+    child = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(child.stdout.splitlines()[-1])
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Median and worst value of each metric over the runs."""
+    return {
+        metric: {
+            "median": statistics.median(run[metric] for run in runs),
+            "max": max(run[metric] for run in runs),
+        }
+        for metric in METRICS
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25):
+    """List metrics whose median grew by more than ``tolerance``."""
+    regressions = []
+    for metric, stats in report.items():
+        reference = baseline.get(metric)
+        if reference is None:
+            continue
+        if stats["median"] > reference["median"] * (1 + tolerance):
+            regressions.append(
+                f"{metric}: {stats['median']:.1f}ms vs "
+                f"{reference['median']:.1f}ms baseline"
+            )
+    return regressions
+
+
+def print_report(report: dict, runs: int) -> None:
+    print(f"{runs} cold starts")
+    print(f"{'metric':<20}{'median':>9}{'max':>9}")
+    for metric, stats in report.items():
+        print(f"{metric:<20}{stats['median']:>9.1f}{stats['max']:>9.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--child", action="store_true", help=argparse.SUPPRESS
+    )
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--save-baseline", help="Write the report here")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(asyncio.run(measure())))
+        return 0
+
+    report = summarize([run_once() for _ in range(args.runs)])
+    print_report(report, args.runs)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())